@@ -0,0 +1,509 @@
+"""
+benchmark.py
+
+Microbenchmarks for the client library.
+Nothing here talks to the real API.
+
+$ python3 benchmark.py overhead json models lazy http2 metrics
+"""
+
+import gc
+import sys
+import json
+import time
+import timeit
+import asyncio
+import threading
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+import requests
+from requests.adapters import BaseAdapter
+from clubhouse import jsonlib, models
+from clubhouse.clubhouse import Clubhouse
+from clubhouse.aio import AsyncClubhouse
+from clubhouse.lazy import LazyObject
+from clubhouse.metrics import Metrics
+from clubhouse.tracing import Tracer
+
+try:
+    import httpx
+    import h2.config
+    import h2.connection
+    import h2.events
+    import h2.exceptions
+except ImportError:
+    httpx = h2 = None
+
+class CannedAdapter(BaseAdapter):
+    """
+    Transport adapter answering every request with the same body.
+    """
+
+    def __init__(self, body=b'{"success": true}'):
+        super().__init__()
+        self.body = body
+
+    def send(self, request, **kwargs):
+        response = requests.Response()
+        response.status_code = 200
+        response.headers["Content-Type"] = "application/json"
+        response._content = self.body
+        response.request = request
+        response.url = request.url
+        return response
+
+    def close(self):
+        pass
+
+def _canned_client(body=b'{"success": true}'):
+    """ (bytes) -> Clubhouse
+    Authenticated client whose requests never leave the process.
+    """
+    client = Clubhouse(user_id="1", user_token="token", user_device="device")
+    client.session.mount("https://", CannedAdapter(body))
+    return client
+
+def _sample_user(i):
+    """ (int) -> dict
+    User of a room, shaped like the `join_channel` example in openapi.yaml.
+    """
+    return {
+        "first_name": f"User{i}",
+        "is_followed_by_speaker": i % 3 == 0,
+        "is_invited_as_speaker": False,
+        "is_moderator": i < 5,
+        "is_new": i % 7 == 0,
+        "is_speaker": i < 20,
+        "name": f"User Example {i}",
+        "photo_url": f"https://clubhouseprod.s3.amazonaws.com:443/{i}_6f2d1e9a-0b7c-4d3e-9f1a-2b3c4d5e6f70_thumbnail_250x250",
+        "skintone": i % 5 + 1,
+        "time_joined_as_speaker": "2021-01-31T00:00:00.000000+00:00" if i < 20 else None,
+        "user_id": 100000 + i,
+        "username": f"user_example_{i}",
+    }
+
+def _sample_channel(users=5000):
+    """ (int) -> dict
+    `join_channel` / `get_channel` response of a large room.
+    """
+    return {
+        "agora_native_mute": True,
+        "channel": "abcdefgh",
+        "channel_id": 123456,
+        "club": None,
+        "club_id": None,
+        "creator_user_profile_id": 1234,
+        "handraise_permission": 1,
+        "is_empty": False,
+        "is_handraise_enabled": True,
+        "is_private": False,
+        "is_social_mode": False,
+        "pubnub_enable": True,
+        "pubnub_heartbeat_interval": 29,
+        "success": True,
+        "token": "0061234567890abcdef",
+        "topic": "A very large room",
+        "url": "https://www.joinclubhouse.com/room/abcdefgh",
+        "users": [_sample_user(i) for i in range(users)],
+    }
+
+def _sample_channels(channels=200):
+    """ (int) -> dict
+    `get_channels` response, with a few speakers per room.
+    """
+    rooms = []
+    for i in range(channels):
+        room = _sample_channel(users=8)
+        room["channel"] = f"room{i:04d}"
+        room["num_all"] = 1000 + i
+        rooms.append(room)
+    return {"channels": rooms, "events": [], "success": True}
+
+def _report(name, seconds, number):
+    """ (str, float, int) -> NoneType
+    Print the time per call.
+    """
+    print(f"{name:<40} {seconds / number * 1e6:8.2f} us/call")
+
+def bench_overhead(number=200000):
+    """ (int) -> NoneType
+
+    Client-side cost of building a request, with the network stubbed out.
+    Compares the generated endpoint methods, as configured by default and
+    bare (without coalescing and metrics), against the hand-written style
+    they replaced (dict literal, f-string URL and str.format query).
+    """
+    client = Clubhouse(user_id="1", user_token="token", user_device="device")
+    response = CannedAdapter().send(requests.Request("GET", client.API_URL).prepare())
+    client._request = lambda method, url, body=None, **kwargs: response
+    # Without coalescing and metrics, which are on by default
+    bare = Clubhouse(user_id="1", user_token="token", user_device="device", coalesce=False, metrics=False)
+    bare._request = client._request
+
+    def legacy_get_club(self, club_id, source_topic_id=None):
+        data = {
+            "club_id": int(club_id),
+            "source_topic_id": source_topic_id,
+            "query_id": None,
+            "query_result_position": None,
+            "slug": None,
+        }
+        if not (self.HEADERS.get("CH-UserID") and
+                self.HEADERS.get("CH-DeviceId") and
+                self.HEADERS.get("Authorization")):
+            raise Exception('Not Authenticated')
+        # requests used to encode the body with the standard json module
+        body = json.dumps(data).encode()
+        return self._request("POST", f"{self.API_URL}/get_club", body, headers=self.HEADERS).json()
+
+    def legacy_get_events(self, is_filtered=True, page_size=25, page=1):
+        if not (self.HEADERS.get("CH-UserID") and
+                self.HEADERS.get("CH-DeviceId") and
+                self.HEADERS.get("Authorization")):
+            raise Exception('Not Authenticated')
+        query = "is_filtered={}&page_size={}&page={}".format(
+            "true" if is_filtered else "false",
+            page_size,
+            page
+        )
+        return self._request("GET", f"{self.API_URL}/get_events?{query}", headers=self.HEADERS).json()
+
+    cases = (
+        ("get_club (legacy)", lambda: legacy_get_club(client, 1)),
+        ("get_club (endpoint table)", lambda: client.get_club(1)),
+        ("get_club (endpoint table, bare)", lambda: bare.get_club(1)),
+        ("get_events (legacy)", lambda: legacy_get_events(client, False, 25, 2)),
+        ("get_events (endpoint table)", lambda: client.get_events(False, 25, 2)),
+        ("get_events (endpoint table, bare)", lambda: bare.get_events(False, 25, 2)),
+    )
+    for name, func in cases:
+        _report(name, min(timeit.repeat(func, number=number, repeat=3)), number)
+
+    # The same calls through requests, where the headers used to be
+    # merged into the session's on every call.
+    client = _canned_client()
+    session = client.session
+    headers = dict(client.HEADERS)
+    url = f"{client.API_URL}/get_club"
+    data = {"club_id": 1, "source_topic_id": None, "query_id": None, "query_result_position": None, "slug": None}
+    number //= 20
+    cases = (
+        ("get_club over requests (legacy)", lambda: session.post(url, headers=headers, json=data).json()),
+        ("get_club over requests (endpoint table)", lambda: client.get_club(1)),
+    )
+    for name, func in cases:
+        _report(name, min(timeit.repeat(func, number=number, repeat=3)), number)
+
+def bench_json(number=20):
+    """ (int) -> NoneType
+
+    Decoding time of large responses and encoding time of request bodies,
+    with `response.json()` of requests and every installed jsonlib backend.
+    """
+    samples = (
+        ("join_channel, 5000 users", jsonlib.BACKENDS["json"][1](_sample_channel())),
+        ("get_channels, 200 rooms", jsonlib.BACKENDS["json"][1](_sample_channels())),
+    )
+    for name, body in samples:
+        print(f"{name} ({len(body) / 1024:.0f} KiB)")
+        response = CannedAdapter(body).send(requests.Request("GET", Clubhouse.API_URL).prepare())
+        _report("  response.json()", min(timeit.repeat(response.json, number=number, repeat=3)), number)
+        for backend, (loads, _) in jsonlib.BACKENDS.items():
+            _report(f"  {backend}.loads", min(timeit.repeat(lambda: loads(body), number=number, repeat=3)), number)
+
+    data = {"channel": "abcdefgh", "user_ids": list(range(1000)), "topic": "Example topic"}
+    number *= 100
+    print("request body, 1000 user_ids")
+    _report("  json.dumps().encode()", min(timeit.repeat(lambda: json.dumps(data).encode(), number=number, repeat=3)), number)
+    for backend, (_, dumps) in jsonlib.BACKENDS.items():
+        _report(f"  {backend}.dumps", min(timeit.repeat(lambda: dumps(data), number=number, repeat=3)), number)
+
+def _retained(func):
+    """ (function) -> (object, int)
+    Call the function, and measure the memory still held by its result.
+    """
+    gc.collect()
+    tracemalloc.start()
+    ret = func()
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return ret, size
+
+def bench_models(users=20000):
+    """ (int) -> NoneType
+
+    Memory per user of a decoded `join_channel` response,
+    as dicts and as `clubhouse.models.User`.
+    """
+    body = jsonlib.dumps(_sample_channel(users))
+    as_dicts, dict_size = _retained(lambda: jsonlib.loads(body)["users"])
+    as_models, model_size = _retained(lambda: models.convert(jsonlib.loads(body))["users"])
+    assert all(getattr(as_models[0], key) == value for key, value in as_dicts[0].items())
+    print(f"{'dict':<40} {dict_size / users:8.0f} bytes/user")
+    print(f"{'models.User':<40} {model_size / users:8.0f} bytes/user")
+    del as_dicts, as_models
+
+    number = 10
+    decode = lambda: jsonlib.loads(body)
+    convert = lambda: models.convert(jsonlib.loads(body))
+    _report(f"decode {users} users", min(timeit.repeat(decode, number=number, repeat=3)), number)
+    _report(f"decode {users} users, typed", min(timeit.repeat(convert, number=number, repeat=3)), number)
+
+def _peak(func):
+    """ (function) -> int
+    Call the function, and measure the peak memory allocated meanwhile.
+    """
+    gc.collect()
+    tracemalloc.start()
+    func()
+    size = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return size
+
+def bench_lazy(users=5000, number=20):
+    """ (int, int) -> NoneType
+
+    Time and peak memory of reading a `join_channel` response,
+    decoded up front and as a `clubhouse.lazy.LazyObject`, and of reading
+    a key after the room nested in another response.
+    """
+    body = jsonlib.dumps(_sample_channel(users))
+    nested = jsonlib.dumps({"channel": _sample_channel(users), "success": True})
+    reads = (
+        ("channel_id", body, lambda response: response["channel_id"]),
+        (f"iterate {users} users", body, lambda response: sum(1 for _ in response["users"])),
+        ("first 10 users", body, lambda response: response["users"][:10]),
+        ("success, after a nested room", nested, lambda response: response["success"]),
+    )
+    for name, content, read in reads:
+        print(name)
+        for mode, decode in (("loads", jsonlib.loads), ("lazy", LazyObject)):
+            func = lambda: read(decode(content))
+            seconds = min(timeit.repeat(func, number=number, repeat=3))
+            _report(f"  {mode}", seconds, number)
+            print(f"{'':<40} {_peak(func) / 1024:8.0f} KiB peak")
+
+class _HTTP1Handler(BaseHTTPRequestHandler):
+    """
+    Stand-in API server over HTTP/1.1, answering every request with
+    the same body after `delay` seconds.
+    """
+
+    protocol_version = "HTTP/1.1"
+    # Headers and body are written separately; don't hold the body back.
+    disable_nagle_algorithm = True
+    body = b'{"success": true}'
+    delay = 0.0
+
+    def log_message(self, *args): # pylint: disable=arguments-differ
+        pass
+
+    def setup(self):
+        super().setup()
+        self.server.connections += 1
+
+    def do_POST(self): # pylint: disable=invalid-name
+        self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        time.sleep(self.delay)
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(self.body)))
+        self.end_headers()
+        self.wfile.write(self.body)
+
+    do_GET = do_POST
+
+class _HTTP2Protocol(asyncio.Protocol):
+    """
+    Stand-in API server over cleartext HTTP/2, answering every request
+    with the same body after `delay` seconds.
+    """
+
+    def __init__(self, server):
+        self.server = server
+        self.conn = h2.connection.H2Connection(h2.config.H2Configuration(client_side=False))
+        self.transport = None
+
+    def connection_made(self, transport):
+        self.server.connections += 1
+        self.transport = transport
+        self.conn.initiate_connection()
+        transport.write(self.conn.data_to_send())
+
+    def data_received(self, data):
+        loop = asyncio.get_running_loop()
+        for event in self.conn.receive_data(data):
+            if isinstance(event, h2.events.DataReceived):
+                self.conn.acknowledge_received_data(event.flow_controlled_length, event.stream_id)
+            elif isinstance(event, h2.events.StreamEnded):
+                loop.call_later(self.server.delay, self._respond, event.stream_id)
+        self.transport.write(self.conn.data_to_send())
+
+    def _respond(self, stream_id):
+        body = self.server.body
+        try:
+            self.conn.send_headers(stream_id, [
+                (":status", "200"),
+                ("content-type", "application/json"),
+                ("content-length", str(len(body))),
+            ])
+            # The client opens wide flow control windows, so only the frame size matters.
+            size = self.conn.max_outbound_frame_size
+            for start in range(0, len(body), size):
+                self.conn.send_data(stream_id, body[start:start + size],
+                                    end_stream=start + size >= len(body))
+        except h2.exceptions.StreamClosedError:
+            return
+        self.transport.write(self.conn.data_to_send())
+
+class _HTTP2Server:
+    """
+    Runs _HTTP2Protocol on its own event loop thread.
+    """
+
+    def __init__(self, body, delay):
+        self.body = body
+        self.delay = delay
+        self.connections = 0
+        self.loop = asyncio.new_event_loop()
+        self.server = self.loop.run_until_complete(
+            self.loop.create_server(lambda: _HTTP2Protocol(self), "127.0.0.1", 0)
+        )
+        self.server_address = self.server.sockets[0].getsockname()
+        threading.Thread(target=self.loop.run_forever, daemon=True).start()
+
+    def shutdown(self):
+        self.loop.call_soon_threadsafe(self.loop.stop)
+
+def _stand_in(http2, body, delay):
+    """ (bool, bytes, float) -> (object, str)
+    Start a local stand-in server, and get it with its API URL.
+    """
+    if http2:
+        server = _HTTP2Server(body, delay)
+    else:
+        handler = type("Handler", (_HTTP1Handler,), {"body": body, "delay": delay})
+        server_class = type("Server", (ThreadingHTTPServer,), {"request_queue_size": 1024, "daemon_threads": True})
+        server = server_class(("127.0.0.1", 0), handler)
+        server.connections = 0
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, "http://127.0.0.1:%d/api" % server.server_address[1]
+
+def _stand_in_client(cls, url, http2, concurrency):
+    """ (type, str, bool, int) -> Clubhouse
+    Client of a stand-in server, with room for `concurrency` connections.
+    """
+    client = cls(user_id="1", user_token="token", user_device="device",
+                 pool_maxsize=concurrency, http2=http2, retry=False)
+    client._urls = {name: url + path[len(client.API_URL):] for name, path in client._urls.items()}
+    if http2:
+        # The stand-in speaks cleartext HTTP/2, so skip the TLS negotiation.
+        limits = httpx.Limits(max_connections=concurrency)
+        if cls is Clubhouse:
+            client.session.close()
+            client.session = httpx.Client(http1=False, http2=True, limits=limits)
+        else:
+            client.session = httpx.AsyncClient(http1=False, http2=True, limits=limits)
+    return client
+
+def bench_http2(calls=500, concurrency=50, delay=0.02):
+    """ (int, int, float) -> NoneType
+
+    Fan-out of `calls` concurrent `get_channel` calls, `concurrency` at a time,
+    to a local stand-in server answering after `delay` seconds, over pooled
+    HTTP/1.1 and over HTTP/2. Reports the time taken and the connections opened.
+    Requires httpx and h2. (pip install httpx[http2])
+    """
+    if httpx is None:
+        print("[-] httpx and h2 are not installed (pip install httpx[http2])")
+        return
+    body = jsonlib.dumps(_sample_channel(50))
+
+    for http2 in (False, True):
+        name = "HTTP/2" if http2 else "HTTP/1.1"
+        server, url = _stand_in(http2, body, delay)
+
+        client = _stand_in_client(Clubhouse, url, http2, concurrency)
+        with ThreadPoolExecutor(concurrency) as executor:
+            started = time.perf_counter()
+            list(executor.map(lambda i: client.get_channel(f"room{i}"), range(calls)))
+            seconds = time.perf_counter() - started
+        client.close()
+        print(f"{'Clubhouse, ' + name:<40} {seconds * 1000:8.0f} ms {server.connections:8d} connections")
+
+        server.connections = 0
+        async def fan_out():
+            client = _stand_in_client(AsyncClubhouse, url, http2, concurrency)
+            semaphore = asyncio.Semaphore(concurrency)
+            async def call(i):
+                async with semaphore:
+                    return await client.get_channel(f"room{i}")
+            started = time.perf_counter()
+            await asyncio.gather(*(call(i) for i in range(calls)))
+            seconds = time.perf_counter() - started
+            await client.close()
+            return seconds
+        seconds = asyncio.run(fan_out())
+        print(f"{'AsyncClubhouse, ' + name:<40} {seconds * 1000:8.0f} ms {server.connections:8d} connections")
+        server.shutdown()
+
+def bench_metrics(number=100000, calls=2000, concurrency=16):
+    """ (int, int, int) -> NoneType
+
+    Cost of the per-endpoint metrics of `Clubhouse.stats()`: a `get_club`
+    call with the network stubbed out, with metrics off, on, with an
+    observer, and traced with no exporter; then `calls` calls, `concurrency` threads at a time, to a
+    local stand-in server, where the threads share the metrics' lock.
+    """
+    response = CannedAdapter().send(requests.Request("GET", Clubhouse.API_URL).prepare())
+    clients = []
+    for name, metrics in (("metrics off", False), ("metrics on", True), ("metrics on, observer", True),
+                          ("metrics on, traced", True)):
+        client = Clubhouse(user_id="1", user_token="token", user_device="device", metrics=metrics,
+                           tracer=Tracer() if name.endswith("traced") else None)
+        client._request = lambda method, url, body=None, **kwargs: response
+        if name.endswith("observer"):
+            client.metrics.observers.append(lambda event: None)
+        clients.append((name, client))
+    for name, client in clients:
+        _report(f"get_club, {name}", min(timeit.repeat(lambda: client.get_club(1), number=number, repeat=3)), number)
+
+    server, url = _stand_in(False, b'{"success": true}', 0.0)
+    for name, metrics in (("metrics off", False), ("metrics on", True)):
+        client = _stand_in_client(Clubhouse, url, False, concurrency)
+        client.metrics = Metrics() if metrics else None
+        with ThreadPoolExecutor(concurrency) as executor:
+            # Connect first, so both runs reuse the same number of connections.
+            list(executor.map(lambda i: client.get_club(i), range(concurrency)))
+            started = time.perf_counter()
+            list(executor.map(lambda i: client.get_club(i), range(calls)))
+            seconds = time.perf_counter() - started
+        client.close()
+        _report(f"stand-in, {concurrency} threads, {name}", seconds, calls)
+    server.shutdown()
+
+BENCHMARKS = {
+    "overhead": bench_overhead,
+    "json": bench_json,
+    "models": bench_models,
+    "lazy": bench_lazy,
+    "http2": bench_http2,
+    "metrics": bench_metrics,
+}
+
+def main():
+    """
+    Run the benchmarks given on the command line, or all of them.
+    """
+    names = sys.argv[1:] or list(BENCHMARKS)
+    for name in names:
+        if name not in BENCHMARKS:
+            print(f"[-] Unknown benchmark: {name} (choose from {', '.join(BENCHMARKS)})")
+            continue
+        print(f"[*] {name}")
+        BENCHMARKS[name]()
+
+if __name__ == "__main__":
+    main()
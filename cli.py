@@ -8,12 +8,16 @@ RTC: For voice communication
 
 import os
 import sys
+import itertools
 import threading
 import configparser
 import keyboard
 from rich.table import Table
 from rich.console import Console
 from clubhouse.clubhouse import Clubhouse
+from clubhouse.deadline import Deadline
+from clubhouse.exposition import OpenMetricsExporter, THREADS
+from clubhouse.exceptions import DeadlineExceeded
 
 # Set some global variables
 try:
@@ -32,26 +36,70 @@ try:
 except ImportError:
     RTC = None
 
+# Numbers the loops, so that several loops of the same function,
+# like one per channel, have a health entry each.
+_LOOPS = itertools.count(1)
+
 def set_interval(interval):
     """ (int) -> decorator
 
     set_interval decorator
+    The loop reports its runs to clubhouse.exposition.THREADS,
+    as the function name and the number of the loop.
     """
     def decorator(func):
         def wrap(*args, **kwargs):
             stopped = threading.Event()
+            name = f"{func.__name__}-{next(_LOOPS)}"
             def loop():
+                THREADS.register(name)
                 while not stopped.wait(interval):
-                    ret = func(*args, **kwargs)
+                    try:
+                        ret = func(*args, **kwargs)
+                    except Exception:
+                        # Stays registered, so the exporter shows it died.
+                        THREADS.ran(name, ok=False)
+                        raise
+                    THREADS.ran(name)
                     if not ret:
                         break
-            thread = threading.Thread(target=loop)
+                THREADS.unregister(name)
+            thread = threading.Thread(target=loop, name=name)
             thread.daemon = True
             thread.start()
             return stopped
         return wrap
     return decorator
 
+@set_interval(15)
+def _write_metrics(exporter, filename):
+    """ (OpenMetricsExporter, str) -> bool
+
+    Rewrite the metrics file every 15 seconds.
+    """
+    exporter.write(filename)
+    return True
+
+def export_metrics(client):
+    """ (Clubhouse) -> OpenMetricsExporter
+
+    Export the client's metrics when the environment asks for it:
+    CLUBHOUSE_METRICS_PORT serves them on http://127.0.0.1:<port>/metrics,
+    and CLUBHOUSE_METRICS_FILE keeps them in a file for node_exporter.
+    """
+    port = os.environ.get("CLUBHOUSE_METRICS_PORT")
+    filename = os.environ.get("CLUBHOUSE_METRICS_FILE")
+    if not port and not filename:
+        return None
+    exporter = OpenMetricsExporter(client)
+    if port:
+        host, port = exporter.serve(int(port))
+        print(f"[*] Serving metrics on http://{host}:{port}/metrics")
+    if filename:
+        exporter.write(filename)
+        _write_metrics(exporter, filename)
+    return exporter
+
 def write_config(user_id, user_token, user_device, filename='setting.ini'):
     """ (str, str, str, str) -> bool
 
@@ -215,13 +263,19 @@ def chat_main(client):
         user_id = client.HEADERS.get("CH-UserID")
         print_channel_list(client, max_limit)
         channel_name = input("[.] Enter channel_name: ")
-        channel_info = client.join_channel(channel_name)
-        if not channel_info['success']:
-            # Check if this channel_name was taken from the link
-            channel_info = client.join_channel(channel_name, "link", "e30=")
+        # Both attempts share the same time budget.
+        deadline = Deadline(15)
+        try:
+            channel_info = client.join_channel(channel_name, deadline=deadline)
             if not channel_info['success']:
-                print(f"[-] Error while joining the channel ({channel_info['error_message']})")
-                continue
+                # Check if this channel_name was taken from the link
+                channel_info = client.join_channel(channel_name, "link", "e30=", deadline=deadline)
+        except DeadlineExceeded:
+            print("[-] Timed out while joining the channel")
+            continue
+        if not channel_info['success']:
+            print(f"[-] Error while joining the channel ({channel_info['error_message']})")
+            continue
 
         # List currently available users (TOP 20 only.)
         # Also, check for the current user's speaker permission.
@@ -354,8 +408,10 @@ def main():
         client = Clubhouse(
             user_id=user_id,
             user_token=user_token,
-            user_device=user_device
+            user_device=user_device,
+            warmup=True
         )
+        export_metrics(client)
 
         # Check if user is still on the waitlist
         _check = client.check_waitlist_status()
@@ -370,7 +426,8 @@ def main():
 
         chat_main(client)
     else:
-        client = Clubhouse()
+        # Connect while the user types their phone number.
+        client = Clubhouse(warmup=True)
         user_authentication(client)
         main()
 
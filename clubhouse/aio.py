@@ -0,0 +1,356 @@
+#!/usr/bin/python -u
+#-*- coding: utf-8 -*-
+# pylint: disable=line-too-long,invalid-overridden-method
+
+"""
+aio.py
+
+asyncio version of the Clubhouse client.
+Requires httpx (pip install httpx).
+"""
+
+import time
+import socket
+import asyncio
+import inspect
+import functools
+from urllib.parse import urlsplit
+from clubhouse import jsonlib, models
+from clubhouse.clubhouse import Clubhouse
+from clubhouse.endpoints import ENDPOINTS
+from clubhouse.singleflight import AsyncSingleFlight
+from clubhouse.stream import ArrayParser
+from clubhouse.projection import compile_fields, project
+from clubhouse.upload import MultipartFile, photo_source
+from clubhouse.tracing import call_attributes
+from clubhouse.deadline import Deadline
+from clubhouse.exceptions import DeadlineExceeded
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+def _make_async(func):
+    """ (function) -> coroutine function
+
+    Turn a Clubhouse endpoint into a coroutine function.
+    The endpoint itself is shared with Clubhouse; only `_request` differs,
+    so authentication checks and request fields stay the same.
+    """
+    @functools.wraps(func)
+    async def wrap(self, *args, **kwargs):
+        ret = func(self, *args, **kwargs)
+        if inspect.isawaitable(ret):
+            ret = await ret
+        return ret
+    return wrap
+
+class AsyncClubhouse(Clubhouse):
+    """
+    AsyncClubhouse Class
+
+    Same methods as Clubhouse, but every endpoint is a coroutine,
+    and the `iter_*` methods are async generators.
+
+    >>> async with AsyncClubhouse(user_id, user_token, user_device) as clubhouse:
+    ...     feed, channels = await asyncio.gather(clubhouse.get_feed(), clubhouse.get_channels())
+    """
+
+    def __init__(self, user_id='', user_token='', user_device='', headers=None,
+                 pool_connections=10, pool_maxsize=100, **kwargs):
+        """ (AsyncClubhouse, str, str, str, dict, int, int, ...) -> NoneType
+        Set authenticated information
+
+        `pool_maxsize` is the maximum number of concurrent connections.
+        Other options are the same as Clubhouse.
+        """
+        if httpx is None:
+            raise ImportError("AsyncClubhouse requires httpx. (pip install httpx)")
+        if kwargs.get("trails"):
+            raise TypeError("trails isn't supported by AsyncClubhouse; the queue sends from a thread")
+        if kwargs.get("warmup"):
+            raise TypeError("Use 'await clubhouse.warmup()' with AsyncClubhouse")
+        super().__init__(user_id, user_token, user_device, headers,
+                         pool_connections, pool_maxsize, **kwargs)
+        if self.single_flight is not None:
+            self.single_flight = AsyncSingleFlight()
+        self._tasks = set()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    def __enter__(self):
+        raise TypeError("Use 'async with' for AsyncClubhouse")
+
+    def __exit__(self, *exc_info):
+        pass
+
+    async def close(self):
+        """ (AsyncClubhouse) -> NoneType
+
+        Close all pooled connections. The client should not be used afterwards.
+        """
+        for task in list(self._tasks):
+            task.cancel()
+        if self._processes is not None:
+            self._processes.shutdown(wait=False)
+        if self.dns_cache is not None:
+            self.dns_cache.uninstall()
+        await self.session.aclose()
+
+    def _spawn(self, coro):
+        """ (AsyncClubhouse, coroutine) -> asyncio.Task
+        Run the coroutine in the background, keeping a reference until it's done.
+        """
+        task = asyncio.ensure_future(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    async def warmup(self, connections=1): # pylint: disable=unused-argument
+        """ (AsyncClubhouse, int) -> int
+
+        Resolve the API host ahead of the first call.
+        httpx connects on the first call, so no connection is opened.
+        """
+        parts = urlsplit(self.API_URL)
+        await asyncio.get_running_loop().getaddrinfo(parts.hostname, parts.port or 443,
+                                                     type=socket.SOCK_STREAM)
+        return 0
+
+    RETRY_ERRORS = (httpx.TransportError,) if httpx is not None else ()
+
+    def _create_session(self, pool_connections, pool_maxsize):
+        """ (AsyncClubhouse, int, int) -> httpx.AsyncClient
+        Create the HTTP session shared by every endpoint.
+        """
+        limits = httpx.Limits(
+            max_connections=pool_maxsize,
+            max_keepalive_connections=pool_maxsize
+        )
+        return httpx.AsyncClient(http2=self.http2, limits=limits)
+
+    async def _call(self, endpoint, data, query="", headers=None, deadline=None, fields=None):
+        """ (AsyncClubhouse, Endpoint, dict, str, dict, object, iterable) -> dict
+        Call the given endpoint. Same as Clubhouse._call.
+        """
+        self._check_authentication(endpoint)
+        url = self._urls[endpoint.name] + query
+        if isinstance(data, MultipartFile):
+            body = data
+        else:
+            body = jsonlib.dumps(data) if endpoint.body and data is not None else None
+
+        started = time.perf_counter()
+        span = self.tracer.start_span(endpoint.name, call_attributes(endpoint, data, query)) if self.tracer is not None else None
+        response = None
+        hit = False
+        error = None
+        try:
+            key = self._request_key(endpoint, body, query)
+            cached = self._is_cached(endpoint)
+            if cached:
+                content, fresh = self.cache.get(key)
+                if content is not None:
+                    hit = True
+                    if not fresh and self.cache.begin_refresh(key):
+                        self._spawn(self._refresh(endpoint, key, url, body))
+                    return self._decode(content, fields)
+                generation = self.cache.generation(endpoint.name)
+
+            sending = time.perf_counter()
+            try:
+                response = await self._send(endpoint, key, url, body, headers, Deadline.of(deadline), span)
+            finally:
+                # Even a failed write may have reached the server.
+                if self.cache is not None:
+                    self.cache.invalidate(*endpoint.invalidates)
+                if span is not None:
+                    self._queued(span, time.perf_counter() - sending)
+            ret = self._parse(response, fields)
+            if cached:
+                self._store(endpoint, key, response, generation)
+            return ret
+        except BaseException as exc:
+            error = exc
+            raise
+        finally:
+            if self.metrics is not None:
+                self.metrics.call(endpoint.name, time.perf_counter() - started, hit, error)
+            if span is not None:
+                self._end_span(span, response, hit, error)
+
+    async def _refresh(self, endpoint, key, url, body):
+        """ (AsyncClubhouse, Endpoint, tuple, str, bytes) -> NoneType
+        Refresh a stale cache entry in the background.
+        """
+        try:
+            generation = self.cache.generation(endpoint.name)
+            self._store(endpoint, key, await self._send(endpoint, key, url, body), generation)
+        except Exception: # pylint: disable=broad-except
+            # Keep serving the stale body; the next reader will try again.
+            pass
+        finally:
+            self.cache.end_refresh(key)
+
+    async def _send(self, endpoint, key, url, body=None, headers=None, deadline=None, span=None):
+        """ (AsyncClubhouse, Endpoint, tuple, str, bytes, dict, Deadline, Span) -> httpx.Response
+        Send the request, joining an identical one in flight if there is one.
+        """
+        if key is not None and self.single_flight is not None:
+            timeout = deadline.remaining() if deadline is not None else None
+            return await self.single_flight.do(key, self._fetch, endpoint, url, body, headers,
+                                               deadline, False, span, timeout=timeout)
+        return await self._fetch(endpoint, url, body, headers, deadline, span=span)
+
+    async def _fetch(self, endpoint, url, body=None, headers=None, deadline=None, stream=False, span=None):
+        """ (AsyncClubhouse, Endpoint, str, bytes, dict, Deadline, bool, Span) -> httpx.Response
+        Same as Clubhouse._fetch.
+        """
+        started = time.monotonic()
+        attempt = 0
+        while True:
+            attempt += 1
+            if deadline is not None:
+                deadline.check(endpoint.name)
+            if self.breaker is not None:
+                self.breaker.allow(endpoint.name)
+            if self.rate_limit is not None:
+                delay = reserved = self.rate_limit.reserve(endpoint.rate_class)
+                try:
+                    while delay > 0:
+                        if deadline is not None and delay > deadline.remaining():
+                            raise DeadlineExceeded(f"Deadline exceeded for {endpoint.name} (rate limited)")
+                        await asyncio.sleep(delay)
+                        delay = self.rate_limit.blocked(endpoint.rate_class)
+                except BaseException:
+                    # Given up, or cancelled, before sending: the token wasn't used.
+                    self.rate_limit.release(endpoint.rate_class, reserved)
+                    raise
+            request_span = self._request_span(endpoint, attempt, span) if span is not None else None
+            sent = time.perf_counter()
+            try:
+                response = await self._request(endpoint.method, url, body, headers=headers,
+                                               timeout=self._timeout(endpoint, deadline), stream=stream)
+            except self.RETRY_ERRORS as error:
+                self._measure(endpoint, body, None, sent, span=request_span, error=error)
+                if deadline is not None and deadline.expired:
+                    raise DeadlineExceeded(f"Deadline exceeded for {endpoint.name}") from error
+                self._observe(endpoint, None)
+                delay = self._retry_delay(endpoint, attempt, started, deadline, error=error)
+                if delay is None:
+                    raise
+            except BaseException as error:
+                self._measure(endpoint, body, None, sent, span=request_span, error=error)
+                raise
+            else:
+                self._measure(endpoint, body, response, sent, stream, request_span)
+                self._observe(endpoint, response)
+                delay = self._retry_delay(endpoint, attempt, started, deadline, response=response)
+                if delay is None:
+                    return response
+                await response.aclose()
+            if span is not None:
+                span.add("clubhouse.backoff_seconds", delay)
+            await asyncio.sleep(delay)
+
+    async def _paginate(self, endpoint, kwargs, page):
+        """ (AsyncClubhouse, Endpoint, dict, int) -> async generator
+        Same as Clubhouse._paginate, for `async for`.
+        """
+        fetch = getattr(self, endpoint.name)
+        response = await fetch(page=page, **kwargs)
+        ahead = None
+        try:
+            while True:
+                next_page = response.get("next")
+                if next_page:
+                    ahead = self._spawn(fetch(page=next_page, **kwargs))
+                for item in response.get(endpoint.items) or ():
+                    yield item
+                if ahead is None:
+                    return
+                response, ahead = await ahead, None
+        finally:
+            if ahead is not None:
+                ahead.cancel()
+
+    async def _stream(self, endpoint, data, items, deadline=None, fields=None):
+        """ (AsyncClubhouse, Endpoint, dict, str, object, iterable) -> async generator
+        Same as Clubhouse._stream, for `async for`.
+        """
+        tree = compile_fields(fields)
+        tree = tree.get(items) if tree is not None else None
+        self._check_authentication(endpoint)
+        started = time.perf_counter()
+        span = self.tracer.start_span(endpoint.name, call_attributes(endpoint, data)) if self.tracer is not None else None
+        response = None
+        received = 0
+        error = None
+        try:
+            response = await self._fetch(endpoint, self._urls[endpoint.name], jsonlib.dumps(data),
+                                         deadline=Deadline.of(deadline), stream=True, span=span)
+            if span is not None:
+                self._queued(span, time.perf_counter() - started)
+            try:
+                if not 200 <= response.status_code < 300:
+                    await response.aread()
+                    self._stream_error(response)
+                parser = ArrayParser(items)
+                async for chunk in response.aiter_bytes(self.STREAM_CHUNK_SIZE):
+                    received += len(chunk)
+                    for item in parser.feed(chunk):
+                        item = project(item, tree)
+                        yield models.convert_field(items, item) if self.typed else item
+                    if parser.done:
+                        return
+                parser.close()
+            finally:
+                await response.aclose()
+        except GeneratorExit:
+            raise
+        except BaseException as exc:
+            error = exc
+            raise
+        finally:
+            if self.metrics is not None:
+                self.metrics.call(endpoint.name, time.perf_counter() - started, error=error,
+                                  received=received)
+            if span is not None:
+                span.set_attribute("clubhouse.received_bytes", received)
+                self._end_span(span, response, error=error)
+
+    async def _request(self, method, url, body=None, headers=None, timeout=None, stream=False):
+        """ (AsyncClubhouse, str, str, bytes, dict, tuple, bool) -> httpx.Response
+        Send a request to the API. `timeout` is (connect, read) in seconds.
+        """
+        request = self.session.build_request(
+            method,
+            url,
+            headers=self._headers(headers),
+            content=body.aiter_chunks() if isinstance(body, MultipartFile) else body,
+            timeout=httpx.Timeout(timeout[1], connect=timeout[0]) if timeout else httpx.USE_CLIENT_DEFAULT
+        )
+        return await self.session.send(request, stream=stream)
+
+    async def update_photo(self, photo_filename, *, resize=False, deadline=None, fields=None):
+        """ (AsyncClubhouse, str, bool) -> dict
+        Same as Clubhouse.update_photo. The photo is resized without blocking the event loop.
+        """
+        self._check_authentication(ENDPOINTS["update_photo"])
+        if resize:
+            photo_filename = photo_source(photo_filename)
+            resized = await asyncio.wrap_future(self._resize_photo(photo_filename, resize))
+            photo_filename = resized or photo_filename
+        with MultipartFile(photo_filename) as upload:
+            return await self._call(ENDPOINTS["update_photo"], upload, headers=upload.headers,
+                                    deadline=deadline, fields=fields)
+
+for _name in ENDPOINTS:
+    # Endpoints written down in AsyncClubhouse itself are already coroutines.
+    if _name not in vars(AsyncClubhouse):
+        setattr(AsyncClubhouse, _name, _make_async(getattr(Clubhouse, _name)))
@@ -0,0 +1,149 @@
+#!/usr/bin/python -u
+#-*- coding: utf-8 -*-
+
+"""
+breaker.py
+
+Per-endpoint circuit breakers, failing fast on endpoints that are down.
+"""
+
+import time
+import threading
+from clubhouse.exceptions import CircuitOpenError
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+class _Circuit:
+    """
+    State of the circuit of a single endpoint.
+    """
+
+    def __init__(self, threshold, reset_timeout):
+        self.threshold = threshold
+        self.reset_timeout = reset_timeout
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.probe_at = 0.0
+        self.opened = 0
+        self.rejected = 0
+
+class CircuitBreakers:
+    """
+    CircuitBreakers Class
+
+    One circuit breaker per endpoint name.
+
+    A circuit opens after `failure_threshold` consecutive failures
+    (connection errors and 5xx responses). While open, calls to the endpoint
+    raise CircuitOpenError right away instead of waiting on the network.
+    After `reset_timeout` seconds it is half-open: one call is let through,
+    and closes the circuit if it works or opens it again if it fails.
+    Other endpoints are not affected.
+
+    `endpoints` overrides the settings per endpoint name,
+    as {name: (failure_threshold, reset_timeout)}.
+
+    >>> breakers = CircuitBreakers(failure_threshold=3, endpoints={"search_users": (2, 60)})
+    >>> clubhouse = Clubhouse(user_id, user_token, user_device, breaker=breakers)
+    >>> breakers.state("search_users")
+    'closed'
+    """
+
+    def __init__(self, failure_threshold=5, reset_timeout=30.0, endpoints=None):
+        """ (CircuitBreakers, int, float, dict) -> NoneType """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.endpoints = dict(endpoints or {})
+        self._circuits = {}
+        self._lock = threading.Lock()
+
+    def _circuit(self, name):
+        """ (CircuitBreakers, str) -> _Circuit
+        Get the circuit of the given endpoint. The lock must be held.
+        """
+        circuit = self._circuits.get(name)
+        if circuit is None:
+            threshold, reset_timeout = self.endpoints.get(
+                name, (self.failure_threshold, self.reset_timeout)
+            )
+            circuit = self._circuits[name] = _Circuit(threshold, reset_timeout)
+        return circuit
+
+    def allow(self, name):
+        """ (CircuitBreakers, str) -> NoneType
+
+        Raise CircuitOpenError unless a request to the endpoint may be sent.
+        """
+        with self._lock:
+            circuit = self._circuit(name)
+            if circuit.state == CLOSED:
+                return
+            now = time.monotonic()
+            # A half-open circuit lets another call through if the last one never reported back.
+            since = circuit.opened_at if circuit.state == OPEN else circuit.probe_at
+            if now - since >= circuit.reset_timeout:
+                circuit.state = HALF_OPEN
+                circuit.probe_at = now
+                return
+            circuit.rejected += 1
+            retry_after = circuit.reset_timeout - (now - since)
+        raise CircuitOpenError(f"Circuit open for {name}", retry_after)
+
+    def success(self, name):
+        """ (CircuitBreakers, str) -> NoneType
+        Record a working call. Closes the circuit.
+        """
+        with self._lock:
+            circuit = self._circuit(name)
+            circuit.state = CLOSED
+            circuit.failures = 0
+
+    def failure(self, name):
+        """ (CircuitBreakers, str) -> NoneType
+        Record a failed call. Opens the circuit after too many of them.
+        """
+        with self._lock:
+            circuit = self._circuit(name)
+            circuit.failures += 1
+            if circuit.state == HALF_OPEN or circuit.failures >= circuit.threshold:
+                if circuit.state != OPEN:
+                    circuit.opened += 1
+                circuit.state = OPEN
+                circuit.opened_at = time.monotonic()
+
+    def state(self, name):
+        """ (CircuitBreakers, str) -> str
+        "closed", "open" or "half_open".
+        """
+        with self._lock:
+            circuit = self._circuits.get(name)
+            return circuit.state if circuit is not None else CLOSED
+
+    def reset(self, name=None):
+        """ (CircuitBreakers, str) -> NoneType
+        Close the circuit of the given endpoint, or of every endpoint.
+        """
+        with self._lock:
+            if name is None:
+                self._circuits.clear()
+            else:
+                self._circuits.pop(name, None)
+
+    def stats(self):
+        """ (CircuitBreakers) -> dict
+
+        State and counters of every endpoint called so far.
+        """
+        with self._lock:
+            return {
+                name: {
+                    "state": circuit.state,
+                    "failures": circuit.failures,
+                    "opened": circuit.opened,
+                    "rejected": circuit.rejected,
+                }
+                for name, circuit in self._circuits.items()
+            }
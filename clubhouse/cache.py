@@ -0,0 +1,193 @@
+#!/usr/bin/python -u
+#-*- coding: utf-8 -*-
+
+"""
+cache.py
+
+In-process response cache for the read-only endpoints.
+"""
+
+import time
+import threading
+from collections import OrderedDict
+
+class ResponseCache:
+    """
+    ResponseCache Class
+
+    LRU cache of raw response bodies, bounded by their total size in bytes.
+    Entries expire after the TTL of their endpoint (`Endpoint.cache_ttl`),
+    which can be overridden per endpoint name with `ttls`.
+
+    Endpoints with a `max_stale` are served stale-while-revalidate:
+    for `max_stale` seconds past the TTL, the old body is still returned
+    right away while the client refreshes it in the background.
+    Only one refresh per key runs at a time. (`begin_refresh`)
+
+    Bodies are stored as bytes and decoded on every hit,
+    so callers can never modify a cached response by accident.
+    One cache can be shared by several clients.
+
+    Writes drop the responses they make stale with `invalidate`,
+    following `Endpoint.invalidates`. Every invalidation bumps a generation
+    number, so a read that was already in flight doesn't store its outdated body.
+
+    >>> cache = ResponseCache(max_bytes=4 * 1024 * 1024, ttls={"get_profile": 30})
+    >>> clubhouse = Clubhouse(user_id, user_token, user_device, cache=cache)
+    """
+
+    def __init__(self, max_bytes=8 * 1024 * 1024, ttls=None, max_stale=None):
+        """ (ResponseCache, int, dict, dict) -> NoneType
+        `ttls` and `max_stale` override the endpoint table, by endpoint name.
+        """
+        self.max_bytes = max_bytes
+        self.ttls = dict(ttls or {})
+        self.max_stales = dict(max_stale or {})
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self.refreshes = 0
+        self._generations = {}
+        self._refreshing = set()
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def ttl(self, endpoint):
+        """ (ResponseCache, Endpoint) -> float
+        Seconds to keep responses of the given endpoint. 0 means no caching.
+        """
+        return self.ttls.get(endpoint.name, endpoint.cache_ttl)
+
+    def max_stale(self, endpoint):
+        """ (ResponseCache, Endpoint) -> float
+        Seconds past the TTL a response may still be served while it is refreshed.
+        """
+        return self.max_stales.get(endpoint.name, endpoint.max_stale)
+
+    def get(self, key):
+        """ (ResponseCache, tuple) -> (bytes, bool)
+
+        Get the cached body for the given key and whether it is still fresh.
+        Returns (None, False) when there is nothing usable.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None, False
+            fresh_until, stale_until, content = entry
+            now = time.monotonic()
+            if stale_until <= now:
+                self._remove(key)
+                self.misses += 1
+                return None, False
+            self._entries.move_to_end(key)
+            if fresh_until <= now:
+                self.stale_hits += 1
+                return content, False
+            self.hits += 1
+            return content, True
+
+    def generation(self, name):
+        """ (ResponseCache, str) -> int
+        Current generation of the given endpoint. Pass it to `set`.
+        """
+        return self._generations.get(name, 0)
+
+    def set(self, key, content, ttl, generation=None, max_stale=0):
+        """ (ResponseCache, tuple, bytes, float, int, float) -> NoneType
+
+        Store the body for the given key. Least recently used entries
+        are evicted until the cache fits in `max_bytes` again.
+        Nothing is stored if the endpoint was invalidated after `generation`.
+        """
+        if len(content) > self.max_bytes:
+            return
+        with self._lock:
+            if generation is not None and generation != self.generation(key[0]):
+                return
+            if key in self._entries:
+                self._remove(key)
+            fresh_until = time.monotonic() + ttl
+            self._entries[key] = (fresh_until, fresh_until + max_stale, content)
+            self._bytes += len(content)
+            while self._bytes > self.max_bytes:
+                _, (_, _, evicted) = self._entries.popitem(last=False)
+                self._bytes -= len(evicted)
+                self.evictions += 1
+
+    def begin_refresh(self, key):
+        """ (ResponseCache, tuple) -> bool
+
+        Claim the background refresh of a stale key.
+        Returns False if another refresh of the key is already running.
+        Call `end_refresh` once done, whether it worked or not.
+        """
+        with self._lock:
+            if key in self._refreshing:
+                return False
+            self._refreshing.add(key)
+            self.refreshes += 1
+            return True
+
+    def end_refresh(self, key):
+        """ (ResponseCache, tuple) -> NoneType
+        Release a key claimed with `begin_refresh`.
+        """
+        with self._lock:
+            self._refreshing.discard(key)
+
+    def invalidate(self, *names):
+        """ (ResponseCache, str, ...) -> NoneType
+
+        Drop every cached response of the given endpoints, for all users.
+        """
+        if not names:
+            return
+        with self._lock:
+            for name in names:
+                self._generations[name] = self.generation(name) + 1
+            for key in [key for key in self._entries if key[0] in names]:
+                self._remove(key)
+                self.invalidations += 1
+
+    def clear(self):
+        """ (ResponseCache) -> NoneType
+        Drop every entry. Statistics are kept.
+        """
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self):
+        """ (ResponseCache) -> dict
+
+        Snapshot of the cache statistics.
+        """
+        with self._lock:
+            lookups = self.hits + self.stale_hits + self.misses
+            return {
+                "hits": self.hits,
+                "stale_hits": self.stale_hits,
+                "misses": self.misses,
+                "hit_ratio": (self.hits + self.stale_hits) / lookups if lookups else 0.0,
+                "refreshes": self.refreshes,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+            }
+
+    def _remove(self, key):
+        """ (ResponseCache, tuple) -> NoneType
+        Remove a single entry. The lock must be held.
+        """
+        _, _, content = self._entries.pop(key)
+        self._bytes -= len(content)
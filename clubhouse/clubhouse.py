@@ -11,16 +11,80 @@ Please make sure to know what you're trying to do!
 Sending an odd API request could result in a permanent ban on your account.
 """
 
+import time
+import ssl
 import uuid
+import socket
+import select
 import random
+import threading
 import secrets
+import multiprocessing
 import functools
+import contextvars
+from types import MappingProxyType
+from collections.abc import Mapping
+from urllib.parse import urlsplit
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, wait
 import requests
+from requests.adapters import HTTPAdapter
+from clubhouse import jsonlib, models
+from clubhouse.endpoints import ENDPOINTS, build_method, build_iterator
+from clubhouse.lazy import LazyObject
+from clubhouse.stream import ArrayParser
+from clubhouse.projection import compile_fields, project
+from clubhouse.trails import ActionTrailQueue
+from clubhouse.dns import DNSCache
+from clubhouse.metrics import Metrics
+from clubhouse.tracing import call_attributes
+from clubhouse.upload import MultipartFile, photo_source, shrink_photo
+from clubhouse.cache import ResponseCache
+from clubhouse.singleflight import SingleFlight
+from clubhouse.ratelimit import RateLimiter, retry_after
+from clubhouse.retry import RetryPolicy
+from clubhouse.breaker import CircuitBreakers, OPEN
+from clubhouse.deadline import Deadline
+from clubhouse.exceptions import (
+    AuthenticationError, RateLimitedError, NotFoundError, ServerError, ResponseError,
+    DeadlineExceeded
+)
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+def _read_tickets(sock, timeout):
+    """ (socket.socket, float) -> NoneType
+
+    Read the session tickets a TLS 1.3 server sends after the handshake,
+    until none has come for `timeout` seconds. urllib3 takes a pooled
+    connection with unread data for a dropped one, and would reconnect.
+    """
+    if not isinstance(sock, ssl.SSLSocket) or sock.version() != "TLSv1.3":
+        return
+    previous = sock.gettimeout()
+    sock.settimeout(0)
+    try:
+        while select.select([sock], [], [], timeout)[0]:
+            try:
+                data = sock.recv(1)
+            except ssl.SSLWantReadError:
+                continue
+            if not data:
+                raise ConnectionError("Connection closed by the server during warmup")
+            raise ConnectionError("Unexpected data from the server during warmup")
+    finally:
+        sock.settimeout(previous)
 
 class Clubhouse:
     """
     Clubhouse Class
 
+    Most of the endpoint methods are generated from `clubhouse.endpoints.ENDPOINTS`.
+    Methods that need more than building a request are written down here.
+    Paginated endpoints also get an `iter_*` generator, like `iter_followers`.
+
     Decorators:
         @require_authentication:
             - this means that the endpoint requires authentication to access.
@@ -83,7 +147,7 @@ class Clubhouse:
         "CH-AppBuild": f"{API_BUILD_ID_ANDROID}",
         "CH-AppVersion": f"{API_BUILD_VERSION_ANDROID}",
         "User-Agent": f"{API_UA_ANDROID}",
-        "Connection": "close",
+        "Connection": "keep-alive",
         "Content-Type": "application/json; charset=utf-8",
         "Cookie": f"__cfduid={secrets.token_hex(21)}{random.randint(1, 9)}"
     }
@@ -92,10 +156,8 @@ class Clubhouse:
         """ Simple decorator to check for the authentication """
         @functools.wraps(func)
         def wrap(self, *args, **kwargs):
-            if not (self.HEADERS.get("CH-UserID") and
-                    self.HEADERS.get("CH-DeviceId") and
-                    self.HEADERS.get("Authorization")):
-                raise Exception('Not Authenticated')
+            if not self._is_authenticated():
+                raise AuthenticationError('Not Authenticated')
             return func(self, *args, **kwargs)
         return wrap
 
@@ -107,1522 +169,825 @@ class Clubhouse:
             return func(self, *args, **kwargs)
         return wrap
 
-    def __init__(self, user_id='', user_token='', user_device='', headers=None):
-        """ (Clubhouse, str, str, str, dict) -> NoneType
+    def __init__(self, user_id='', user_token='', user_device='', headers=None,
+                 pool_connections=10, pool_maxsize=10, keep_alive=True, cache=None,
+                 coalesce=True, rate_limit=None, retry=True, breaker=None, timeout=(5, 30),
+                 typed=False, lazy=False, trails=None, http2=False, dns_cache=None, warmup=False,
+                 metrics=True, tracer=None):
+        """ (Clubhouse, str, str, str, dict, int, int, bool, ResponseCache, bool, RateLimiter, RetryPolicy, CircuitBreakers, tuple, bool, bool, ActionTrailQueue, bool, DNSCache, bool, Metrics, Tracer) -> NoneType
         Set authenticated information
-        """
-        self.HEADERS = dict(self.HEADERS)
-        if isinstance(headers, dict):
-            self.HEADERS.update(headers)
-        self.HEADERS['CH-UserID'] = user_id if user_id else "(null)"
-        if user_token:
-            self.HEADERS['Authorization'] = f"Token {user_token}"
-        self.HEADERS['CH-DeviceId'] = user_device.upper() if user_device else str(uuid.uuid4()).upper()
-
-    def __str__(self):
-        """ (Clubhouse) -> str
-        Get information about the given class.
-        >>> clubhouse = Clubhouse()
-        >>> str(clubhouse)
-        Clubhouse(user_id=(null), user_token=None, user_device=31525f52-6b67-40de-83c0-8f9fe0f6f409)
-        """
-        return "Clubhouse(user_Id={}, user_token={}, user_device={})".format(
-            self.HEADERS.get('CH-UserID'),
-            self.HEADERS.get('Authorization'),
-            self.HEADERS.get('CH-DeviceId')
-        )
-
-    def start_phone_number_auth(self, phone_number):
-        """ (Clubhouse, str) -> dict
-
-        Begin phone number authentication.
-        Some examples for the phone number.
-
-        >>> clubhouse = Clubhouse()
-        >>> clubhouse.start_phone_number_auth("+821012341337")
-        ...
-        >>> clubhouse.start_phone_number_auth("+818013371221")
-        ...
-        """
-        if self.HEADERS.get("Authorization"):
-            raise Exception('Already Authenticatied')
-        data = {
-            "phone_number": phone_number
-        }
-        req = requests.post(f"{self.API_URL}/start_phone_number_auth", headers=self.HEADERS, json=data)
-        return req.json()
-
-    @unstable_endpoint
-    def call_phone_number_auth(self, phone_number):
-        """ (Clubhouse, str) -> dict
-
-        Call the person and send verification message.
-        """
-        if self.HEADERS.get("Authorization"):
-            raise Exception('Already Authenticatied')
-        data = {
-            "phone_number": phone_number
-        }
-        req = requests.post(f"{self.API_URL}/call_phone_number_auth", headers=self.HEADERS, json=data)
-        return req.json()
-
-    @unstable_endpoint
-    def resend_phone_number_auth(self, phone_number):
-        """ (Clubhouse, str) -> dict
-
-        Resend the verification message
-        """
-        if self.HEADERS.get("Authorization"):
-            raise Exception('Already Authenticatied')
-        data = {
-            "phone_number": phone_number
-        }
-        req = requests.post(f"{self.API_URL}/resend_phone_number_auth", headers=self.HEADERS, json=data)
-        return req.json()
-
-    def complete_phone_number_auth(self, phone_number, verification_code, rc_token=None, safety_net_nonce=None, safety_net_response=None):
-        """ (Clubhouse, str, str, str, str, str) -> dict
-
-        Complete phone number authentication.
-        
-        IMPORTANT NOTE
-        You need to also provide `rc_token`, `safety_net_nonce` and `safety_net_response`
-        depending on the platform type. Please do not send messages for the usage of these
-        options. Some of these features may not have a Python implementations.
-        """
-        if self.HEADERS.get("Authorization"):
-            raise Exception('Already Authenticatied')
-        
-        data = {
-            "device_token": None,
-            "rc_token": rc_token,
-            "safety_net_nonce": safety_net_nonce,
-            "safety_net_response": safety_net_response,
-            "phone_number": phone_number,
-            "verification_code": verification_code
-        }
-        req = requests.post(f"{self.API_URL}/complete_phone_number_auth", headers=self.HEADERS, json=data)
-        return req.json()
-
-    def check_for_update(self, is_testflight=False):
-        """ (Clubhouse, bool) -> dict
-
-        Check for app updates.
-
-        >>> clubhouse = Clubhouse()
-        >>> clubhouse.check_for_update(False)
-        {'has_update': False, 'success': True}
-        """
-        query = f"is_testflight={int(is_testflight)}"
-        req = requests.get(f"{self.API_URL}/check_for_update?{query}", headers=self.HEADERS)
-        return req.json()
-
-    @require_authentication
-    def logout(self):
-        """ (Clubhouse) -> dict
-
-        Logout from the app.
-        """
-        data = {}
-        req = requests.post(f"{self.API_URL}/logout", headers=self.HEADERS, json=data)
-        return req.json()
-
-    @require_authentication
-    def get_release_notes(self):
-        """ (Clubhouse) -> dict
-
-        Get release notes.
-        """
-        req = requests.post(f"{self.API_URL}/get_release_notes", headers=self.HEADERS)
-        return req.json()
-
-    @require_authentication
-    def check_waitlist_status(self):
-        """ (Clubhouse) -> dict
-
-        Check whether you're still on a waitlist or not.
-        """
-        req = requests.post(f"{self.API_URL}/check_waitlist_status", headers=self.HEADERS)
-        return req.json()
-
-    @require_authentication
-    def add_email(self, email):
-        """ (Clubhouse, str) -> dict
-
-        Request for email verification.
-        You only need to do this once.
-        """
-        data = {
-            "email": email
-        }
-        req = requests.post(f"{self.API_URL}/add_email", headers=self.HEADERS, json=data)
-        return req.json()
-
-    @require_authentication
-    def update_photo(self, photo_filename):
-        """ (Clubhouse, str) -> dict
-
-        Update photo. Please make sure to upload a JPG format.
-        """
-        files = {
-            "file": ("image.jpg", open(photo_filename, "rb"), "image/jpeg"),
-        }
-        tmp = self.HEADERS['Content-Type']
-        self.HEADERS.pop("Content-Type")
-        req = requests.post(f"{self.API_URL}/update_photo", headers=self.HEADERS, files=files)
-        self.HEADERS['Content-Type'] = tmp
-        return req.json()
-
-    @require_authentication
-    def follow(self, user_id, user_ids=None, source=4, source_topic_id=None):
-        """ (Clubhouse, int, list, int, int) -> dict
-
-        Follow a user.
-        Different value for `source` may require different parameters to be set
-        """
-        data = {
-            "source_topic_id": source_topic_id,
-            "user_ids": user_ids,
-            "user_id": int(user_id),
-            "source": source
-        }
-        req = requests.post(f"{self.API_URL}/follow", headers=self.HEADERS, json=data)
-        return req.json()
-
-    @require_authentication
-    def unfollow(self, user_id):
-        """ (Clubhouse, int) -> dict
-
-        Unfollow a user.
-        """
-        data = {
-            "user_id": int(user_id)
-        }
-        req = requests.post(f"{self.API_URL}/unfollow", headers=self.HEADERS, json=data)
-        return req.json()
-
-    @require_authentication
-    def block(self, user_id):
-        """ (Clubhouse, int) -> dict
-
-        Block a user.
-        """
-        data = {
-            "user_id": int(user_id)
-        }
-        req = requests.post(f"{self.API_URL}/block", headers=self.HEADERS, json=data)
-        return req.json()
-
-    @require_authentication
-    def unblock(self, user_id):
-        """ (Clubhouse, int) -> dict
-
-        Unfollow a user.
-        """
-        data = {
-            "user_id": int(user_id)
-        }
-        req = requests.post(f"{self.API_URL}/unblock", headers=self.HEADERS, json=data)
-        return req.json()
-
-    @require_authentication
-    def follow_multiple(self, user_ids, user_id=None, source=7, source_topic_id=None):
-        """ (Clubhouse, list, int, int, int) -> dict
-
-        Follow multiple users at once.
-        Different value for `source` may require different parameters to be set
-        """
-        data = {
-            "source_topic_id": source_topic_id,
-            "user_ids": user_ids,
-            "user_id": user_id,
-            "source": source
-        }
-        req = requests.post(f"{self.API_URL}/follow_multiple", headers=self.HEADERS, json=data)
-        return req.json()
-
-    @require_authentication
-    def follow_club(self, club_id, source_topic_id=None):
-        """ (Clubhouse, int, int) -> dict
-
-        Follow a club
-        """
-        data = {
-            "club_id": int(club_id),
-            "source_topic_id": source_topic_id
-        }
-        req = requests.post(f"{self.API_URL}/follow_club", headers=self.HEADERS, json=data)
-        return req.json()
-
-    @require_authentication
-    def unfollow_club(self, club_id, source_topic_id=None):
-        """ (Clubhouse, int, int) -> dict
-
-        Unfollow a club
-        """
-        data = {
-            "club_id": int(club_id),
-            "source_topic_id": source_topic_id
-        }
-        req = requests.post(f"{self.API_URL}/unfollow_club", headers=self.HEADERS, json=data)
-        return req.json()
-
-    @require_authentication
-    def update_follow_notifications(self, user_id, notification_type=2):
-        """ (Clubhouse, str, int) -> dict
-
-        Update notification frequency for the given user.
-        1 = Always notify, 2 = Sometimes, 3 = Never
-        """
-        data = {
-            "user_id": int(user_id),
-            "notification_type": int(notification_type)
-        }
-        req = requests.post(f"{self.API_URL}/update_follow_notifications", headers=self.HEADERS, json=data)
-        return req.json()
-
-    @require_authentication
-    def get_suggested_follows_similar(self, user_id='', username=''):
-        """ (Clubhouse, str, str) -> dict
-
-        Get similar users based on the given user.
-        """
-        data = {
-            "user_id": int(user_id) if user_id else None,
-            "username": username if username else None,
-            "query_id": None,
-            "query_result_position": None,
-        }
-        req = requests.post(f"{self.API_URL}/get_suggested_follows_similar", headers=self.HEADERS, json=data)
-        return req.json()
 
-    @require_authentication
-    def get_suggested_follows_friends_only(self, club_id=None, upload_contacts=True, contacts=()):
-        """ (Clubhouse, int, int, list of dict) -> dict
-
-        Get users based on the phone number.
-        Only seems to be used upon signup.
-        """
-        data = {
-            "club_id": club_id,
-            "upload_contacts": upload_contacts,
-            "contacts": contacts
-        }
-        req = requests.post(f"{self.API_URL}/get_suggested_follows_friends_only", headers=self.HEADERS, json=data)
-        return req.json()
-
-    @require_authentication
-    def get_suggested_follows_all(self, in_onboarding=True, page_size=50, page=1):
-        """ (Clubhouse, bool, int, int) -> dict
-
-        Get all suggested follows.
-        """
-        query = "in_onboarding={}&page_size={}&page={}".format(
-            "true" if in_onboarding else "false",
-            page_size,
-            page
-        )
-        req = requests.get(f"{self.API_URL}/get_suggested_follows_all?{query}", headers=self.HEADERS)
-        return req.json()
-
-    @require_authentication
-    def ignore_suggested_follow(self, user_id):
-        """ (Clubhouse, str) -> dict
+        `headers` are added to the headers of every request. The headers are
+        fixed once the client is created, so it can be shared between threads.
 
-        Remove user_id from the suggested follow list.
-        """
-        data = {
-            "user_id": int(user_id)
-        }
-        req = requests.post(f"{self.API_URL}/user_id", headers=self.HEADERS, json=data)
-        return req.json()
+        Every request goes through a pooled `requests.Session`.
+        `pool_connections` is the number of hosts to keep pools for, and
+        `pool_maxsize` is the number of connections kept alive per host.
+        Set `keep_alive` to False to close the connection after each request.
 
-    @require_authentication
-    def get_event(self, event_id=None, user_ids=None, club_id=None, is_member_only=False, event_hashid=None, description=None, time_start_epoch=None, name=None):
-        """ (Clubhouse, int, list, int, bool, int, str, int, str) -> dict
+        `cache` enables the response cache for the endpoints with a `cache_ttl`.
+        Pass True for a default ResponseCache, or a ResponseCache to share it.
 
-        Get details about the event
-        """
-        data = {
-            "user_ids": user_ids,
-            "club_id": club_id,
-            "is_member_only": is_member_only,
-            "event_id": int(event_id) if event_id else None,
-            "event_hashid": event_hashid,
-            "description": description,
-            "time_start_epoch": time_start_epoch,
-            "name": name
-        }
-        req = requests.post(f"{self.API_URL}/get_event", headers=self.HEADERS, json=data)
-        return req.json()
+        With `coalesce`, concurrent identical calls to idempotent endpoints
+        share one request. See `single_flight.stats()`.
 
-    @require_authentication
-    def create_event(self, name, time_start_epoch, description, event_id=None, user_ids=(), club_id=None, is_member_only=False, event_hashid=None):
-        """ (Clubhouse, str, int, str, int, list, int, bool, int) -> dict
+        `rate_limit` throttles requests on the client side. Pass True for
+        a default RateLimiter, or a RateLimiter to share it.
 
-        Create a new event
-        """
-        data = {
-            "user_ids": user_ids,
-            "club_id": club_id,
-            "is_member_only": is_member_only,
-            "event_id": int(event_id) if event_id else None,
-            "event_hashid": event_hashid,
-            "description": description,
-            "time_start_epoch": time_start_epoch,
-            "name": name
-        }
-        req = requests.post(f"{self.API_URL}/edit_event", headers=self.HEADERS, json=data)
-        return req.json()
+        `retry` is the RetryPolicy for failed requests. True uses the default
+        policy, and False disables retries.
 
-    @require_authentication
-    def edit_event(self, name, time_start_epoch, description, event_id=None, user_ids=(), club_id=None, is_member_only=False, event_hashid=None):
-        """ (Clubhouse, str, int, str, int, list, int, bool, int) -> dict
+        `breaker` makes calls to a failing endpoint raise CircuitOpenError
+        right away. Pass True for default CircuitBreakers, or CircuitBreakers
+        to share them. See `breaker.stats()`.
 
-        Edit an event.
-        """
-        data = {
-            "user_ids": user_ids,
-            "club_id": club_id,
-            "is_member_only": is_member_only,
-            "event_id": int(event_id) if event_id else None,
-            "event_hashid": event_hashid,
-            "description": description,
-            "time_start_epoch": time_start_epoch,
-            "name": name
-        }
-        req = requests.post(f"{self.API_URL}/edit_event", headers=self.HEADERS, json=data)
-        return req.json()
+        `timeout` is the (connect, read) timeouts of every request in seconds,
+        unless the endpoint has its own (`Endpoint.timeout`). Every endpoint
+        method also takes a `deadline` for the whole call, retries included,
+        and `fields` to trim the response to some dotted paths.
 
-    @require_authentication
-    def delete_event(self, event_id, user_ids=None, club_id=None, is_member_only=False, event_hashid=None, description=None, time_start_epoch=None, name=None):
-        """ (Clubhouse, str, list, int, bool, int, str, int, str) -> dict
+        With `typed`, users, channels, clubs, topics, events and notifications
+        in responses are returned as the compact classes of `clubhouse.models`.
 
-        Delete event.
-        """
-        data = {
-            "user_ids": user_ids,
-            "club_id": club_id,
-            "is_member_only": is_member_only,
-            "event_id": int(event_id) if event_id else None,
-            "event_hashid": event_hashid,
-            "description": description,
-            "time_start_epoch": time_start_epoch,
-            "name": name
-        }
-        req = requests.post(f"{self.API_URL}/delete_event", headers=self.HEADERS, json=data)
-        return req.json()
+        With `lazy`, responses are LazyObject views over the response bytes,
+        decoding each key on first access and arrays one element at a time.
 
-    @require_authentication
-    def get_events(self, is_filtered=True, page_size=25, page=1):
-        """ (Clubhouse, bool, int, int) -> dict
+        `trails` queues action trails to send them in batches in the background,
+        with `trails.record(trail)`. Pass True for a default ActionTrailQueue.
 
-        Get list of upcoming events with details.
-        """
-        _is_filtered = "true" if is_filtered else "false"
-        query = "is_filtered={}&page_size={}&page={}".format(
-            "true" if is_filtered else "false",
-            page_size,
-            page
-        )
-        req = requests.get(f"{self.API_URL}/get_events?{query}", headers=self.HEADERS)
-        return req.json()
+        With `http2`, requests go through httpx over HTTP/2, so concurrent
+        calls share one connection instead of one each. `pool_maxsize` is
+        then the maximum number of connections. (pip install httpx[http2])
 
-    @require_authentication
-    def get_club(self, club_id, source_topic_id=None):
-        """ (Clubhouse, int, int) -> dict
+        `dns_cache` caches DNS lookups of the whole process while the client
+        is open. Pass True for a default DNSCache, or a DNSCache to share it.
 
-        Get the information about the given club_id.
-        """
-        data = {
-            "club_id": int(club_id),
-            "source_topic_id": source_topic_id,
-            "query_id": None,
-            "query_result_position": None,
-            "slug": None,
-        }
-        req = requests.post(f"{self.API_URL}/get_club", headers=self.HEADERS, json=data)
-        return req.json()
+        With `warmup`, `warmup()` runs in the background from here,
+        and the first call waits for it instead of connecting on its own.
 
-    @require_authentication
-    def get_club_members(self, club_id, return_followers=False, return_members=True, page_size=50, page=1):
-        """ (Clubhouse, int, bool, bool, int, int) -> dict
+        `metrics` counts calls, requests, bytes and latencies per endpoint,
+        see `stats()`. Pass a Metrics to share it, or False to disable it.
 
-        Get list of members on the given club_id.
+        `tracer` wraps every call in a trace span, with a child span per
+        HTTP request. See `clubhouse.tracing`.
         """
-        query = "club_id={}&return_followers={}&return_members={}&page_size={}&page={}".format(
-            club_id,
-            int(return_followers),
-            int(return_members),
-            page_size,
-            page
-        )
-        req = requests.get(f"{self.API_URL}/get_club_members?{query}", headers=self.HEADERS)
-        return req.json()
-
-    @require_authentication
-    def get_settings(self):
+        self.http2 = http2
+        base = dict(self.HEADERS)
+        if http2:
+            if httpx is None:
+                raise ImportError("http2 requires httpx. (pip install httpx[http2])")
+            self.RETRY_ERRORS = (httpx.TransportError,)
+            # Connection-specific headers are not allowed in HTTP/2.
+            base.pop('Connection', None)
+        elif not keep_alive:
+            base['Connection'] = "close"
+        if isinstance(headers, dict):
+            base.update(headers)
+        base['CH-UserID'] = user_id if user_id else "(null)"
+        if user_token:
+            base['Authorization'] = f"Token {user_token}"
+        base['CH-DeviceId'] = user_device.upper() if user_device else str(uuid.uuid4()).upper()
+        # Read-only, so that threads sharing the client never see it change.
+        self.HEADERS = MappingProxyType(base)
+
+        self.session = self._create_session(pool_connections, pool_maxsize)
+
+        self.cache = ResponseCache() if cache is True else cache
+        self.single_flight = SingleFlight() if coalesce else None
+        self.rate_limit = RateLimiter() if rate_limit is True else rate_limit
+        self.retry = RetryPolicy() if retry is True else retry or None
+        self.breaker = CircuitBreakers() if breaker is True else breaker
+        self.timeout = timeout if isinstance(timeout, tuple) else (timeout, timeout)
+        self.typed = typed
+        self.lazy = lazy
+        self.trails = ActionTrailQueue() if trails is True else trails
+        if self.trails is not None and self.trails.send is None:
+            self.trails.send = self.record_action_trails
+        # Background threads and the photo worker process, started on first use
+        self._executor = None
+        self._processes = None
+        self._executors_lock = threading.Lock()
+        self.dns_cache = DNSCache() if dns_cache is True else dns_cache
+        if self.dns_cache is not None:
+            self.dns_cache.install()
+        self.metrics = Metrics() if metrics is True else metrics or None
+        self.tracer = tracer
+
+        # Full URL of every endpoint
+        self._urls = {name: f"{self.API_URL}{endpoint.path}" for name, endpoint in ENDPOINTS.items()}
+
+        self._warming = self._submit(self.warmup) if warmup else None
+
+    def __enter__(self):
+        """ (Clubhouse) -> Clubhouse
+        >>> with Clubhouse() as clubhouse:
+        ...     clubhouse.check_for_update()
+        """
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """ (Clubhouse) -> NoneType
+
+        Close all pooled connections. The client should not be used afterwards.
+        Queued action trails are sent first.
+        """
+        if self.trails is not None:
+            self.trails.close()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+        if self._processes is not None:
+            self._processes.shutdown(wait=False)
+        if self.dns_cache is not None:
+            self.dns_cache.uninstall()
+        self.session.close()
+
+    def stats(self):
         """ (Clubhouse) -> dict
 
-        Receive user's settings.
+        Snapshot of the client's metrics: per endpoint under "endpoints"
+        (see Metrics.stats), the stats of each enabled component,
+        and the connection pools under "pool" (see pool_stats).
         """
-        req = requests.get(f"{self.API_URL}/get_settings", headers=self.HEADERS)
-        return req.json()
+        ret = {"endpoints": self.metrics.stats() if self.metrics is not None else {}}
+        for name in ("cache", "single_flight", "rate_limit", "retry", "breaker", "trails", "dns_cache"):
+            component = getattr(self, name)
+            if component is not None:
+                ret[name] = component.stats()
+        ret["pool"] = self.pool_stats()
+        return ret
 
-    @require_authentication
-    def get_welcome_channel(self):
+    def pool_stats(self):
         """ (Clubhouse) -> dict
 
-        Seems to be called upon sign up. Does not seem to return much data.
+        Connection pools by origin, like "https://www.clubhouseapi.com:443":
+        connections in use, idle connections kept open, and the pool size,
+        None if unknown. Adapters that don't pool with urllib3 are left out.
+        """
+        ret = {}
+        if isinstance(self.session, requests.Session):
+            for adapter in self.session.adapters.values():
+                # Only HTTPAdapter and its subclasses pool with urllib3.
+                pools = getattr(getattr(adapter, "poolmanager", None), "pools", None)
+                if pools is None:
+                    continue
+                with pools.lock:
+                    pools = list(pools._container.values()) # pylint: disable=protected-access
+                for pool in pools:
+                    queue = pool.pool
+                    if queue is None:
+                        continue
+                    # Connections taken out of the queue are in use.
+                    idle = sum(1 for conn in list(queue.queue) if getattr(conn, "sock", None) is not None)
+                    ret[f"{pool.scheme}://{pool.host}:{pool.port}"] = {
+                        "in_use": max(queue.maxsize - queue.qsize(), 0),
+                        "idle": idle,
+                        "max": queue.maxsize,
+                    }
+            return ret
+        # httpx doesn't expose its pool; this is httpcore's.
+        pool = getattr(getattr(self.session, "_transport", None), "_pool", None)
+        for conn in list(getattr(pool, "connections", ())):
+            origin = getattr(conn, "_origin", None)
+            if origin is None or conn.is_closed():
+                continue
+            maximum = getattr(pool, "_max_connections", None)
+            entry = ret.setdefault(str(origin), {"in_use": 0, "idle": 0, "max": maximum})
+            entry["idle" if conn.is_idle() else "in_use"] += 1
+        return ret
+
+    def warmup(self, connections=1):
+        """ (Clubhouse, int) -> int
+
+        Resolve the API host and open `connections` pooled connections to it,
+        TLS handshake included, so that the first calls find them ready.
+        Returns the number of connections opened.
+
+        With `http2`, the host is only resolved; httpx connects on the first call.
+        """
+        parts = urlsplit(self.API_URL)
+        if self.http2:
+            socket.getaddrinfo(parts.hostname, parts.port or 443, 0, socket.SOCK_STREAM)
+            return 0
+        pool = self._connection_pool(self.API_URL)
+        # There's no public way to open a pooled connection ahead of a request,
+        # so take idle ones from urllib3's pool, connect them, and put them back.
+        conns = [pool._get_conn() for _ in range(min(connections, pool.pool.maxsize))] # pylint: disable=protected-access
+        connect_timeout = self.timeout[0]
+
+        def connect(conn):
+            # `is_closed` is only in urllib3 2; both versions unset `sock` when closed.
+            if conn.sock is None:
+                conn.timeout = connect_timeout
+                started = time.monotonic()
+                conn.connect()
+                _read_tickets(conn.sock, time.monotonic() - started)
+
+        try:
+            with ThreadPoolExecutor(max_workers=len(conns)) as executor:
+                list(executor.map(connect, conns))
+        finally:
+            for conn in conns:
+                pool._put_conn(conn) # pylint: disable=protected-access
+        return len(conns)
+
+    def _connection_pool(self, url):
+        """ (Clubhouse, str) -> urllib3.HTTPConnectionPool
+        The pool of the session that requests to the URL go through.
+        """
+        adapter = self.session.get_adapter(url)
+        settings = self.session.merge_environment_settings(url, {}, None, None, None)
+        if not hasattr(adapter, "get_connection_with_tls_context"):
+            # requests < 2.32.2
+            return adapter.get_connection(url, settings["proxies"])
+        request = requests.Request("GET", url).prepare()
+        return adapter.get_connection_with_tls_context(request, settings["verify"], settings["proxies"],
+                                                       settings["cert"])
+
+    def _await_warmup(self, deadline=None):
+        """ (Clubhouse, Deadline) -> NoneType
+        Wait for the background warmup, if it's still running, within the deadline.
+        A failed warmup is ignored; the call connects on its own.
+        """
+        warming = self._warming
+        if warming is not None:
+            wait((warming,), deadline.remaining() if deadline is not None else None)
+            if warming.done():
+                self._warming = None
+
+    # Photos are shrunk to fit in this size by `update_photo(resize=True)`,
+    # with this JPEG quality
+    PHOTO_SIZE = (600, 600)
+    PHOTO_QUALITY = 85
+
+    def _resize_photo(self, photo, size):
+        """ (Clubhouse, object, object) -> concurrent.futures.Future
+        Shrink a photo with shrink_photo() in the client's worker process.
+        """
+        if self._processes is None:
+            with self._executors_lock:
+                if self._processes is None:
+                    # Not forked: the client has threads that may hold locks.
+                    self._processes = ProcessPoolExecutor(max_workers=1,
+                                                          mp_context=multiprocessing.get_context("spawn"))
+        return self._processes.submit(shrink_photo, photo, self.PHOTO_SIZE if size is True else tuple(size),
+                                      self.PHOTO_QUALITY)
+
+    def _submit(self, func, *args):
+        """ (Clubhouse, function, ...) -> concurrent.futures.Future
+        Run the function on the client's background threads, in a copy of
+        the caller's context, so that spans started there nest under the
+        caller's current span.
+        """
+        if self._executor is None:
+            with self._executors_lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="clubhouse")
+        return self._executor.submit(contextvars.copy_context().run, func, *args)
+
+    # Errors of the HTTP library worth retrying idempotent calls for
+    RETRY_ERRORS = (requests.ConnectionError, requests.Timeout)
+
+    # Bytes read at a time from streamed responses
+    STREAM_CHUNK_SIZE = 16384
+
+    def _create_session(self, pool_connections, pool_maxsize):
+        """ (Clubhouse, int, int) -> requests.Session
+        Create the HTTP session shared by every endpoint,
+        or an httpx.Client with `http2`.
+        """
+        if self.http2:
+            limits = httpx.Limits(max_connections=pool_maxsize, max_keepalive_connections=pool_maxsize)
+            return httpx.Client(http2=True, limits=limits)
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        # requests merges the headers of each request into a copy of these.
+        session.headers = self.HEADERS
+        return session
+
+    def _is_authenticated(self):
+        """ (Clubhouse) -> bool
+        Check for the authentication headers.
+        """
+        return bool(self.HEADERS.get("CH-UserID") and
+                    self.HEADERS.get("CH-DeviceId") and
+                    self.HEADERS.get("Authorization"))
+
+    def _check_authentication(self, endpoint):
+        """ (Clubhouse, Endpoint) -> NoneType
+        Raise if the endpoint can't be called in the current state.
+        """
+        if endpoint.auth and not self._is_authenticated():
+            raise AuthenticationError('Not Authenticated')
+        if endpoint.anonymous_only and self.HEADERS.get("Authorization"):
+            raise AuthenticationError('Already Authenticatied')
+
+    def _request_key(self, endpoint, body, query):
+        """ (Clubhouse, Endpoint, bytes, str) -> tuple
+
+        Key identifying an idempotent call, for the response cache and
+        request coalescing. None if neither applies to this call.
+        Keys start with the endpoint name and include the user.
+        """
+        if not endpoint.idempotent or (self.cache is None and self.single_flight is None):
+            return None
+        return (endpoint.name, self.HEADERS.get("CH-UserID"), query, body or b"")
+
+    def _is_cached(self, endpoint):
+        """ (Clubhouse, Endpoint) -> bool
+        Whether responses of the endpoint go through the response cache.
+        """
+        return self.cache is not None and endpoint.idempotent and self.cache.ttl(endpoint) > 0
+
+    def _send(self, endpoint, key, url, body=None, headers=None, deadline=None, span=None):
+        """ (Clubhouse, Endpoint, tuple, str, bytes, dict, Deadline, Span) -> requests.Response
+        Send the request, joining an identical one in flight if there is one.
+        """
+        if key is not None and self.single_flight is not None:
+            timeout = deadline.remaining() if deadline is not None else None
+            return self.single_flight.do(key, self._fetch, endpoint, url, body, headers,
+                                         deadline, False, span, timeout=timeout)
+        return self._fetch(endpoint, url, body, headers, deadline, span=span)
+
+    def _fetch(self, endpoint, url, body=None, headers=None, deadline=None, stream=False, span=None):
+        """ (Clubhouse, Endpoint, str, bytes, dict, Deadline, bool, Span) -> requests.Response
+        Send a request to the endpoint, within the rate limit,
+        and retry it as long as the retry policy, the circuit breaker
+        and the deadline allow. With `stream`, the body is left unread.
+        Each request is a child span of the call's `span`, if any.
+        """
+        if self._warming is not None:
+            self._await_warmup(deadline)
+        started = time.monotonic()
+        attempt = 0
+        while True:
+            attempt += 1
+            if deadline is not None:
+                deadline.check(endpoint.name)
+            if self.breaker is not None:
+                self.breaker.allow(endpoint.name)
+            if self.rate_limit is not None:
+                if not self.rate_limit.acquire(endpoint.rate_class,
+                                               deadline.remaining() if deadline is not None else None):
+                    raise DeadlineExceeded(f"Deadline exceeded for {endpoint.name} (rate limited)")
+            request_span = self._request_span(endpoint, attempt, span) if span is not None else None
+            sent = time.perf_counter()
+            try:
+                response = self._request(endpoint.method, url, body, headers=headers,
+                                         timeout=self._timeout(endpoint, deadline), stream=stream)
+            except self.RETRY_ERRORS as error:
+                self._measure(endpoint, body, None, sent, span=request_span, error=error)
+                if deadline is not None and deadline.expired:
+                    raise DeadlineExceeded(f"Deadline exceeded for {endpoint.name}") from error
+                self._observe(endpoint, None)
+                delay = self._retry_delay(endpoint, attempt, started, deadline, error=error)
+                if delay is None:
+                    raise
+            except BaseException as error:
+                self._measure(endpoint, body, None, sent, span=request_span, error=error)
+                raise
+            else:
+                self._measure(endpoint, body, response, sent, stream, request_span)
+                self._observe(endpoint, response)
+                delay = self._retry_delay(endpoint, attempt, started, deadline, response=response)
+                if delay is None:
+                    return response
+                response.close()
+            if span is not None:
+                span.add("clubhouse.backoff_seconds", delay)
+            time.sleep(delay)
+
+    def _timeout(self, endpoint, deadline):
+        """ (Clubhouse, Endpoint, Deadline) -> tuple
+        (connect, read) timeouts of a request to the endpoint, within the deadline.
+        """
+        connect, read = endpoint.timeout or self.timeout
+        if deadline is not None:
+            # A timeout of None has no bound but the deadline.
+            remaining = deadline.remaining()
+            connect = remaining if connect is None else min(connect, remaining)
+            read = remaining if read is None else min(read, remaining)
+        return connect, read
+
+    def _observe(self, endpoint, response):
+        """ (Clubhouse, Endpoint, Response) -> NoneType
+        Report the response of a request, or None for a connection error,
+        to the rate limiter and the circuit breaker.
+        """
+        if response is not None and self.rate_limit is not None:
+            self.rate_limit.observe(endpoint.rate_class, response)
+        if self.breaker is not None:
+            if response is None or response.status_code >= 500:
+                self.breaker.failure(endpoint.name)
+            else:
+                self.breaker.success(endpoint.name)
+
+    def _retry_delay(self, endpoint, attempt, started, deadline, response=None, error=None):
+        """ (Clubhouse, Endpoint, int, float, Deadline, Response, Exception) -> float
+        Seconds to wait before trying the request again, or None to stop.
+        """
+        if self.retry is None:
+            return None
+        # Give the caller the actual error rather than CircuitOpenError.
+        if self.breaker is not None and self.breaker.state(endpoint.name) == OPEN:
+            return None
+        delay = self.retry.delay(endpoint, attempt, started, response, error)
+        if delay is None or (deadline is not None and delay >= deadline.remaining()):
+            return None
+        if self.metrics is not None:
+            self.metrics.retry(endpoint.name, delay)
+        return delay
+
+    def _measure(self, endpoint, body, response, started, stream=False, span=None, error=None):
+        """ (Clubhouse, Endpoint, bytes, Response, float, bool, Span, Exception) -> NoneType
+        Record a request sent at `started` (perf_counter) in the metrics,
+        with a None response for a connection error, and end its span.
+        The body of a streamed response is counted as it's read instead.
+        """
+        seconds = time.perf_counter() - started
+        if self.metrics is not None:
+            if response is None:
+                self.metrics.request(endpoint.name, None, seconds, len(body) if body is not None else 0)
+            else:
+                self.metrics.request(endpoint.name, response.status_code, seconds,
+                                     len(body) if body is not None else 0,
+                                     0 if stream else len(response.content))
+        if span is not None:
+            if response is not None:
+                span.set_attribute("http.response.status_code", response.status_code)
+            if error is not None:
+                span.record_exception(error)
+            span.end()
+            span.parent.add("clubhouse.attempts", 1)
+            span.parent.add("clubhouse.network_seconds", seconds)
+
+    def _request_span(self, endpoint, attempt, span):
+        """ (Clubhouse, Endpoint, int, Span) -> Span
+        Child span of the call's span, for one of its requests.
+        """
+        return self.tracer.start_span(f"{endpoint.method} {endpoint.path}",
+                                      {"clubhouse.attempt": attempt}, span)
+
+    def _queued(self, span, seconds):
+        """ (Clubhouse, Span, float) -> NoneType
+        Count the time a call spent sending, neither on the network nor
+        backing off, as waiting: for the rate limiter, the warmup, or an
+        identical call in flight.
+        """
+        totals = span.totals
+        waited = seconds - totals.get("clubhouse.network_seconds", 0) - totals.get("clubhouse.backoff_seconds", 0)
+        span.add("clubhouse.queue_seconds", max(waited, 0.0))
+
+    def _end_span(self, span, response=None, hit=False, error=None):
+        """ (Clubhouse, Span, Response, bool, Exception) -> NoneType
+        End the span of a call.
+        """
+        span.set_attribute("clubhouse.cache_hit", hit)
+        if response is not None:
+            span.set_attribute("http.response.status_code", response.status_code)
+        if error is not None:
+            span.record_exception(error)
+        span.end()
+
+    def _decode(self, content, fields=None):
+        """ (Clubhouse, bytes, iterable) -> dict
+        Decode a response body, keeping only the given fields if any.
+        """
+        if fields is not None:
+            ret = project(LazyObject(content) if self.lazy else jsonlib.loads(content), compile_fields(fields))
+            return models.convert(ret) if self.typed else ret
+        if self.lazy:
+            return LazyObject(content, models.convert_field if self.typed else None)
+        if self.typed:
+            return models.convert(jsonlib.loads(content))
+        return jsonlib.loads(content)
+
+    def _parse(self, response, fields=None):
+        """ (Clubhouse, Response, iterable) -> dict
+
+        Decode the response, raising the matching ClubhouseError on errors.
+        Other failed calls are answered with a JSON body whose `success`
+        is false, and are returned like any response.
+        """
+        status = response.status_code
+        try:
+            ret = self._decode(response.content, fields)
+        except ValueError:
+            ret = None
+        if status < 400 and ret is not None:
+            return ret
+        message = f"HTTP {status}"
+        if isinstance(ret, Mapping):
+            message = ret.get("error_message") or ret.get("detail") or message
+        if status in (401, 403):
+            raise AuthenticationError(message, response)
+        if status == 404:
+            raise NotFoundError(message, response)
+        if status == 429:
+            raise RateLimitedError(message, response, retry_after(response))
+        if status >= 500:
+            raise ServerError(message, response)
+        if ret is None:
+            raise ResponseError(f"Invalid response ({message})", response)
+        return ret
+
+    def _call(self, endpoint, data, query="", headers=None, deadline=None, fields=None):
+        """ (Clubhouse, Endpoint, dict, str, dict, object, iterable) -> dict
+        Call the given endpoint. Every endpoint method goes through here.
+
+        `data` is encoded once into the JSON body, unless it's a MultipartFile
+        to upload as is, and `query` is appended to the URL.
+        `deadline` is a Deadline or a number of seconds.
+        `fields` are the dotted paths to keep from the response, like "users.user_id".
+        """
+        self._check_authentication(endpoint)
+        url = self._urls[endpoint.name] + query
+        if isinstance(data, MultipartFile):
+            body = data
+        else:
+            body = jsonlib.dumps(data) if endpoint.body and data is not None else None
+
+        started = time.perf_counter()
+        span = self.tracer.start_span(endpoint.name, call_attributes(endpoint, data, query)) if self.tracer is not None else None
+        response = None
+        hit = False
+        error = None
+        try:
+            key = self._request_key(endpoint, body, query)
+            cached = self._is_cached(endpoint)
+            if cached:
+                content, fresh = self.cache.get(key)
+                if content is not None:
+                    hit = True
+                    if not fresh and self.cache.begin_refresh(key):
+                        self._submit(self._refresh, endpoint, key, url, body)
+                    return self._decode(content, fields)
+                generation = self.cache.generation(endpoint.name)
+
+            sending = time.perf_counter()
+            try:
+                response = self._send(endpoint, key, url, body, headers, Deadline.of(deadline), span)
+            finally:
+                # Even a failed write may have reached the server.
+                if self.cache is not None:
+                    self.cache.invalidate(*endpoint.invalidates)
+                if span is not None:
+                    self._queued(span, time.perf_counter() - sending)
+            ret = self._parse(response, fields)
+            if cached:
+                self._store(endpoint, key, response, generation)
+            return ret
+        except BaseException as exc:
+            error = exc
+            raise
+        finally:
+            if self.metrics is not None:
+                self.metrics.call(endpoint.name, time.perf_counter() - started, hit, error)
+            if span is not None:
+                self._end_span(span, response, hit, error)
+
+    def _store(self, endpoint, key, response, generation):
+        """ (Clubhouse, Endpoint, tuple, requests.Response, int) -> NoneType
+        Put a successful response into the cache. Failed calls are
+        answered with 200 too, with `success` false in the body.
+        """
+        if response.status_code != 200:
+            return
+        try:
+            # Only as far as `success` is decoded.
+            success = LazyObject(response.content).get("success")
+        except ValueError:
+            return
+        if success is True:
+            self.cache.set(key, response.content, self.cache.ttl(endpoint),
+                           generation, self.cache.max_stale(endpoint))
+
+    def _refresh(self, endpoint, key, url, body):
+        """ (Clubhouse, Endpoint, tuple, str, bytes) -> NoneType
+        Refresh a stale cache entry in the background.
+        """
+        try:
+            generation = self.cache.generation(endpoint.name)
+            self._store(endpoint, key, self._send(endpoint, key, url, body), generation)
+        except Exception: # pylint: disable=broad-except
+            # Keep serving the stale body; the next reader will try again.
+            pass
+        finally:
+            self.cache.end_refresh(key)
+
+    def _paginate(self, endpoint, kwargs, page):
+        """ (Clubhouse, Endpoint, dict, int) -> generator
+
+        Yield the items of a paginated endpoint, starting at the given page,
+        until a response has no `next` page. While a page is consumed,
+        the next one is fetched in the background, so at most two pages are
+        held in memory. Closing the generator cancels that fetch if it hasn't started.
+        """
+        fetch = getattr(self, endpoint.name)
+        response = fetch(page=page, **kwargs)
+        ahead = None
+        try:
+            while True:
+                next_page = response.get("next")
+                if next_page:
+                    ahead = self._submit(functools.partial(fetch, page=next_page, **kwargs))
+                yield from response.get(endpoint.items) or ()
+                if ahead is None:
+                    return
+                response, ahead = ahead.result(), None
+        finally:
+            if ahead is not None:
+                ahead.cancel()
+
+    def _stream_error(self, response):
+        """ (Clubhouse, Response) -> NoneType
+
+        Raise the ClubhouseError of a failed streamed call, whose body has been read.
+        An error with a JSON body, which `_parse` returns, raises ResponseError,
+        as there's no array to stream.
+        """
+        ret = self._parse(response)
+        message = f"HTTP {response.status_code}"
+        if isinstance(ret, Mapping):
+            message = ret.get("error_message") or ret.get("detail") or message
+        raise ResponseError(message, response)
+
+    def _stream(self, endpoint, data, items, deadline=None, fields=None):
+        """ (Clubhouse, Endpoint, dict, str, object, iterable) -> generator
+
+        Call the endpoint, and yield the elements of the `items` array
+        of the response as they arrive, without holding the whole body.
+        Streamed calls skip the cache and are never coalesced.
+        `fields` are paths from the top of the response, like "users.user_id".
+        """
+        tree = compile_fields(fields)
+        tree = tree.get(items) if tree is not None else None
+        self._check_authentication(endpoint)
+        started = time.perf_counter()
+        span = self.tracer.start_span(endpoint.name, call_attributes(endpoint, data)) if self.tracer is not None else None
+        response = None
+        received = 0
+        error = None
+        try:
+            response = self._fetch(endpoint, self._urls[endpoint.name], jsonlib.dumps(data),
+                                   deadline=Deadline.of(deadline), stream=True, span=span)
+            if span is not None:
+                self._queued(span, time.perf_counter() - started)
+            try:
+                if not 200 <= response.status_code < 300:
+                    self._stream_error(response)
+                parser = ArrayParser(items)
+                if self.http2:
+                    chunks = response.iter_bytes(self.STREAM_CHUNK_SIZE)
+                else:
+                    chunks = response.iter_content(self.STREAM_CHUNK_SIZE)
+                for chunk in chunks:
+                    received += len(chunk)
+                    for item in parser.feed(chunk):
+                        item = project(item, tree)
+                        yield models.convert_field(items, item) if self.typed else item
+                    if parser.done:
+                        return
+                parser.close()
+            finally:
+                response.close()
+        except GeneratorExit:
+            raise
+        except BaseException as exc:
+            error = exc
+            raise
+        finally:
+            if self.metrics is not None:
+                self.metrics.call(endpoint.name, time.perf_counter() - started, error=error,
+                                  received=received)
+            if span is not None:
+                span.set_attribute("clubhouse.received_bytes", received)
+                self._end_span(span, response, error=error)
+
+    def _headers(self, overrides=None):
+        """ (Clubhouse, dict) -> Mapping
+        Headers of a request: the client's, with `overrides` on top.
+        A header overridden with None is left out.
+        """
+        if not overrides:
+            return self.HEADERS
+        headers = {**self.HEADERS, **overrides}
+        return {key: value for key, value in headers.items() if value is not None}
+
+    def _request(self, method, url, body=None, headers=None, timeout=None, stream=False):
+        """ (Clubhouse, str, str, bytes, dict, tuple, bool) -> requests.Response
+        Send a request to the API. `body` is already encoded JSON, or a MultipartFile.
+        `headers` override the client's headers for this request only.
+        """
+        if self.http2:
+            request = self.session.build_request(
+                method,
+                url,
+                headers=self._headers(headers),
+                content=body,
+                timeout=httpx.Timeout(timeout[1], connect=timeout[0]) if timeout else httpx.USE_CLIENT_DEFAULT
+            )
+            return self.session.send(request, stream=stream)
+        # requests drops the headers overridden with None by itself.
+        return self.session.request(method, url, headers=headers, data=body,
+                                    timeout=timeout, stream=stream)
+
+    def __str__(self):
+        """ (Clubhouse) -> str
+        Get information about the given class.
+        >>> clubhouse = Clubhouse()
+        >>> str(clubhouse)
+        Clubhouse(user_id=(null), user_token=None, user_device=31525f52-6b67-40de-83c0-8f9fe0f6f409)
         """
-        req = requests.get(f"{self.API_URL}/get_welcome_channel", headers=self.HEADERS)
-        return req.json()
+        return "Clubhouse(user_Id={}, user_token={}, user_device={})".format(
+            self.HEADERS.get('CH-UserID'),
+            self.HEADERS.get('Authorization'),
+            self.HEADERS.get('CH-DeviceId')
+        )
 
     @require_authentication
-    def hide_channel(self, channel, hide=True):
+    def update_photo(self, photo_filename, *, resize=False, deadline=None, fields=None):
         """ (Clubhouse, str, bool) -> dict
 
-        Hide/unhide the channel from the channel list.
-        """
-        # Join channel
-        data = {
-            "channel": channel,
-            "hide": hide
-        }
-        req = requests.post(f"{self.API_URL}/hide_channel", headers=self.HEADERS, json=data)
-        return req.json()
-
-    @require_authentication
-    def join_channel(self, channel, attribution_source="feed", attribution_details="eyJpc19leHBsb3JlIjpmYWxzZSwicmFuayI6MX0="):
-        """ (Clubhouse, str, str) -> dict
+        Update photo. Please make sure to upload a JPG format.
 
-        Join the given channel
+        `photo_filename` may also be an open binary file, or a buffer like
+        bytes or mmap.mmap. The photo is streamed from it while it's uploaded.
+        With `resize`, it's first shrunk to PHOTO_SIZE, or to the given
+        (width, height), and recompressed in a worker process. (pip install Pillow)
         """
-        data = {
-            "channel": channel,
-            "attribution_source": attribution_source,
-            "attribution_details": attribution_details, # base64_json
-            # logging_context (json of some details)
-        }
-        req = requests.post(f"{self.API_URL}/join_channel", headers=self.HEADERS, json=data)
-        return req.json()
+        if resize:
+            photo_filename = photo_source(photo_filename)
+            photo_filename = self._resize_photo(photo_filename, resize).result() or photo_filename
+        with MultipartFile(photo_filename) as upload:
+            return self._call(ENDPOINTS["update_photo"], upload, headers=upload.headers,
+                              deadline=deadline, fields=fields)
 
     @require_authentication
-    def leave_channel(self, channel):
-        """ (Clubhouse, str) -> dict
-
-        Leave the given channel
-        """
-        data = {
-            "channel": channel
-        }
-        req = requests.post(f"{self.API_URL}/leave_channel", headers=self.HEADERS, json=data)
-        return req.json()
+    def change_handraise_settings(self, channel, is_enabled=True, handraise_permission=1, *, deadline=None, fields=None):
+        """ (Clubhouse, bool, int) -> dict
 
-    @require_authentication
-    def make_channel_public(self, channel, channel_id=None):
-        """ (Clubhouse, str, int) -> dict
+        Change handraise settings. Requires moderator privilege
 
-        Make the current channel open to public.
-        Everyone can join the channel.
+        * handraise_permission(int)
+           - 1: Everyone
+           - 2: Followed by the speakers
+        * is_enabled(bool)
+           - True: Enable handraise
+           - False: Disable handraise
         """
-        data = {
-            "channel": channel,
-            "channel_id": channel_id
-        }
-        req = requests.post(f"{self.API_URL}/make_channel_public", headers=self.HEADERS, json=data)
-        return req.json()
-
-    @require_authentication
-    def make_channel_social(self, channel, channel_id=None):
-        """ (Clubhouse, str, int) -> dict
+        handraise_permission = int(handraise_permission)
+        if not 1 <= handraise_permission <= 2:
+            return False
 
-        Make the current channel open to public.
-        Only people who user follows can join the channel.
-        """
         data = {
             "channel": channel,
-            "channel_id": channel_id
+            "is_enabled": is_enabled,
+            "handraise_permission": handraise_permission
         }
-        req = requests.post(f"{self.API_URL}/make_channel_social", headers=self.HEADERS, json=data)
-        return req.json()
+        return self._call(ENDPOINTS["change_handraise_settings"], data, deadline=deadline, fields=fields)
 
     @require_authentication
-    def end_channel(self, channel, channel_id=None):
-        """ (Clubhouse, str, int) -> dict
+    def iter_channel_users(self, channel, channel_id=None, *, deadline=None, fields=None):
+        """ (Clubhouse, str, int) -> generator
 
-        Kick everyone and close the channel. Requires moderator privilege.
+        Iterate over the users of `get_channel` while the response downloads.
+        The first users are yielded before the rest has arrived, and memory
+        stays flat however large the room is. `deadline` bounds connecting
+        and the wait for each chunk.
         """
         data = {
             "channel": channel,
             "channel_id": channel_id
         }
-        req = requests.post(f"{self.API_URL}/end_channel", headers=self.HEADERS, json=data)
-        return req.json()
-
-    @require_authentication
-    def make_moderator(self, channel, user_id):
-        """ (Clubhouse, str, int) -> dict
-
-        Make the given user moderator. Requires moderator privilege.
-        """
-        data = {
-            "channel": channel,
-            "user_id": int(user_id)
-        }
-        req = requests.post(f"{self.API_URL}/make_moderator", headers=self.HEADERS, json=data)
-        return req.json()
-
-    @require_authentication
-    def block_from_channel(self, channel, user_id):
-        """ (Clubhouse, str, int) -> dict
-
-        Remove the user from the channel. The user will not be able to re-join.
-        """
-        data = {
-            "channel": channel,
-            "user_id": int(user_id)
-        }
-        req = requests.post(f"{self.API_URL}/block_from_channel", headers=self.HEADERS, json=data)
-        return req.json()
+        return self._stream(ENDPOINTS["get_channel"], data, "users", deadline, fields)
 
     @require_authentication
-    def get_profile(self, user_id='', username=''):
-        """ (Clubhouse, str, str) -> dict
-
-        Lookup someone else's profile. It is OK to one's own profile with this method.
+    def update_skintone(self, skintone=1, *, deadline=None, fields=None):
+        """ (Clubhouse, int) -> dict
+        Updating skinetone for raising hands, etc.
         """
-        data = {
-            "query_id": None,
-            "query_result_position": 0,
-            "user_id": int(user_id) if user_id else None,
-            "username": username if username else None
-        }
-        req = requests.post(f"{self.API_URL}/get_profile", headers=self.HEADERS, json=data)
-        return req.json()
-
-    @require_authentication
-    def me(self, return_blocked_ids=False, timezone_identifier="Asia/Tokyo", return_following_ids=False):
-        """ (Clubhouse, bool, str, bool) -> dict
+        skintone = int(skintone)
+        if not 1 <= skintone <= 5:
+            return False
 
-        Get my information
-        """
         data = {
-            "return_blocked_ids": return_blocked_ids,
-            "timezone_identifier": timezone_identifier,
-            "return_following_ids": return_following_ids
+            "skintone": skintone
         }
-        req = requests.post(f"{self.API_URL}/me", headers=self.HEADERS, json=data)
-        return req.json()
+        return self._call(ENDPOINTS["update_skintone"], data, deadline=deadline, fields=fields)
 
-    @require_authentication
-    def get_following(self, user_id, page_size=50, page=1):
-        """ (Clubhouse, str, int, int) -> dict
-
-        Get following users type2
-        """
-        query = "user_id={}&page_size={}&page={}".format(
-            user_id,
-            page_size,
-            page
-        )
-        req = requests.get(f"{self.API_URL}/get_following?{query}", headers=self.HEADERS)
-        return req.json()
 
-    @require_authentication
-    def get_followers(self, user_id, page_size=50, page=1):
-        """ (Clubhouse, str, int, int) -> dict
-
-        Get followers of the given user_id.
-        """
-        query = "user_id={}&page_size={}&page={}".format(
-            user_id,
-            page_size,
-            page
-        )
-        req = requests.get(f"{self.API_URL}/get_followers?{query}", headers=self.HEADERS)
-        return req.json()
-
-    @require_authentication
-    def get_mutual_follows(self, user_id, page_size=50, page=1):
-        """ (Clubhouse, str, int, int) -> dict
-
-        Get mutual followers between the current user and the given user_id.
-        """
-        query = "user_id={}&page_size={}&page={}".format(
-            user_id,
-            page_size,
-            page
-        )
-        req = requests.get(f"{self.API_URL}/get_mutual_follows?{query}", headers=self.HEADERS)
-        return req.json()
-
-    @require_authentication
-    def get_all_topics(self):
-        """ (Clubhouse) -> dict
-
-        Get list of topics, based on the server's channel selection algorithm
-        """
-        req = requests.get(f"{self.API_URL}/get_all_topics", headers=self.HEADERS)
-        return req.json()
-
-    @require_authentication
-    def get_feed(self):
-        """ (Clubhouse) -> dict
-
-        Get list of channels, current invite status, etc.
-        """
-        req = requests.get(f"{self.API_URL}/get_feed?", headers=self.HEADERS)
-        return req.json()
-
-    @require_authentication
-    def get_channels(self):
-        """ (Clubhouse) -> dict
-
-        Get list of channels, based on the server's channel selection algorithm
-        """
-        req = requests.get(f"{self.API_URL}/get_channels", headers=self.HEADERS)
-        return req.json()
-
-    @require_authentication
-    def get_channel(self, channel, channel_id=None):
-        """ (Clubhouse, str, int) -> dict
-
-        Get information of the given channel
-        """
-        data = {
-            "channel": channel,
-            "channel_id": channel_id
-        }
-        req = requests.post(f"{self.API_URL}/get_channel", headers=self.HEADERS, json=data)
-        return req.json()
-
-    @require_authentication
-    def active_ping(self, channel):
-        """ (Clubhouse, str) -> dict
-
-        Keeping the user active while being in a chatroom
-        """
-        data = {
-            "channel": channel,
-            "chanel_id": None
-        }
-        req = requests.post(f"{self.API_URL}/active_ping", headers=self.HEADERS, json=data)
-        return req.json()
-
-    @require_authentication
-    def audience_reply(self, channel, raise_hands=True, unraise_hands=False):
-        """ (Clubhouse, str, bool, bool) -> bool
-
-        Request for raise_hands.
-        """
-        data = {
-            "channel": channel,
-            "raise_hands": raise_hands,
-            "unraise_hands": unraise_hands
-        }
-        req = requests.post(f"{self.API_URL}/audience_reply", headers=self.HEADERS, json=data)
-        return req.json()
-
-    @require_authentication
-    def change_handraise_settings(self, channel, is_enabled=True, handraise_permission=1):
-        """ (Clubhouse, bool, int) -> dict
-
-        Change handraise settings. Requires moderator privilege
-
-        * handraise_permission(int)
-           - 1: Everyone
-           - 2: Followed by the speakers
-        * is_enabled(bool)
-           - True: Enable handraise
-           - False: Disable handraise
-        """
-        handraise_permission = int(handraise_permission)
-        if not 1 <= handraise_permission <= 2:
-            return False
-
-        data = {
-            "channel": channel,
-            "is_enabled": is_enabled,
-            "handraise_permission": handraise_permission
-        }
-        req = requests.post(f"{self.API_URL}/change_handraise_settings", headers=self.HEADERS, json=data)
-        return req.json()
-
-    @require_authentication
-    def update_skintone(self, skintone=1):
-        """ (Clubhouse, int) -> dict
-        Updating skinetone for raising hands, etc.
-        """
-        skintone = int(skintone)
-        if not 1 <= skintone <= 5:
-            return False
-
-        data = {
-            "skintone": skintone
-        }
-        req = requests.post(f"{self.API_URL}/update_skintone", headers=self.HEADERS, json=data)
-        return req.json()
-
-    @require_authentication
-    def get_notifications(self, page_size=20, page=1):
-        """ (Clubhouse, int, int) -> dict
-
-        Get my notifications.
-        """
-        query = f"page_size={page_size}&page={page}"
-        req = requests.get(f"{self.API_URL}/get_notifications?{query}", headers=self.HEADERS)
-        return req.json()
-
-    @require_authentication
-    def get_actionable_notifications(self):
-        """ (Clubhouse, int, int) -> dict
-
-        Get notifications. This may return some notifications that require some actions
-        """
-        req = requests.get(f"{self.API_URL}/get_actionable_notifications", headers=self.HEADERS)
-        return req.json()
-
-    @require_authentication
-    def get_online_friends(self):
-        """ (Clubhouse) -> dict
-
-        List all online friends.
-        """
-        req = requests.post(f"{self.API_URL}/get_online_friends", headers=self.HEADERS, json={})
-        return req.json()
-
-    @require_authentication
-    def accept_speaker_invite(self, channel, user_id):
-        """ (Clubhouse, str, int) -> dict
-
-        Accept speaker's invitation, based on the (channel, invited_moderator)
-        `raise_hands` needs to be called first, prior to the invitation.
-        """
-        data = {
-            "channel": channel,
-            "user_id": int(user_id)
-        }
-        req = requests.post(f"{self.API_URL}/accept_speaker_invite", headers=self.HEADERS, json=data)
-        return req.json()
-
-    @require_authentication
-    def reject_speaker_invite(self, channel, user_id):
-        """ (Clubhouse, str, int) -> dict
-
-        Reject speaker's invitation.
-        """
-        data = {
-            "channel": channel,
-            "user_id": int(user_id)
-        }
-        req = requests.post(f"{self.API_URL}/reject_speaker_invite", headers=self.HEADERS, json=data)
-        return req.json()
-
-    @require_authentication
-    def invite_speaker(self, channel, user_id):
-        """ (Clubhouse, str, int) -> dict
-
-        Move audience to speaker. Requires moderator privilege.
-        """
-        data = {
-            "channel": channel,
-            "user_id": int(user_id)
-        }
-        req = requests.post(f"{self.API_URL}/invite_speaker", headers=self.HEADERS, json=data)
-        return req.json()
-
-    @require_authentication
-    def uninvite_speaker(self, channel, user_id):
-        """ (Clubhouse, str, int) -> dict
-
-        Move speaker to audience. Requires moderator privilege.
-        """
-        data = {
-            "channel": channel,
-            "user_id": int(user_id)
-        }
-        req = requests.post(f"{self.API_URL}/uninvite_speaker", headers=self.HEADERS, json=data)
-        return req.json()
-
-    @require_authentication
-    def mute_speaker(self, channel, user_id):
-        """ (Clubhouse, str, int) -> dict
-
-        Mute speaker. Requires moderator privilege
-        """
-        data = {
-            "channel": channel,
-            "user_id": int(user_id)
-        }
-        req = requests.post(f"{self.API_URL}/mute_speaker", headers=self.HEADERS, json=data)
-        return req.json()
-
-    @require_authentication
-    def get_suggested_speakers(self, channel):
-        """ (Clubhouse, str) -> dict
-
-        Get suggested speakers from the given channel
-        """
-        data = {
-            "channel": channel
-        }
-        req = requests.post(f"{self.API_URL}/get_suggested_speakers", headers=self.HEADERS, json=data)
-        return req.json()
-
-    @require_authentication
-    def create_channel(self, topic="", user_ids=(), is_private=False, is_social_mode=False):
-        """ (Clubhouse, str, list, bool, bool) -> dict
-
-        Create a new channel. Type of the room can be changed
-        """
-        data = {
-            "is_social_mode": is_social_mode,
-            "is_private": is_private,
-            "club_id": None,
-            "user_ids": user_ids,
-            "event_id": None,
-            "topic": topic
-        }
-        req = requests.post(f"{self.API_URL}/create_channel", headers=self.HEADERS, json=data)
-        return req.json()
-
-    @require_authentication
-    def get_create_channel_targets(self):
-        """ (Clubhouse) -> dict
-
-        Not sure what this does. Triggered upon channel creation
-        """
-        data = {}
-        req = requests.post(f"{self.API_URL}/get_create_channel_targets", headers=self.HEADERS, json=data)
-        return req.json()
-
-    @require_authentication
-    def get_suggested_invites(self, club_id=None, upload_contacts=True, contacts=()):
-        """ (Clubhouse, int, bool, list of dict) -> dict
-
-        Get invitations and user lists based on phone number.
-
-        contacts(dict)
-            - example: [{"name": "Test Name", "phone_number": "+821043219876"}, ...]
-        """
-        data = {
-            "club_id": club_id,
-            "upload_contacts": upload_contacts,
-            "contacts": contacts
-        }
-        req = requests.post(f"{self.API_URL}/get_suggested_invites", headers=self.HEADERS, json=data)
-        return req.json()
-
-    @require_authentication
-    def get_suggested_club_invites(self, upload_contacts=True, contacts=()):
-        """ (Clubhouse, int, bool, list of dict) -> dict
-
-        Get user lists based on phone number. For inviting clubs.
-
-        contacts(dict)
-            - example: [{"name": "Test Name", "phone_number": "+821043219876"}, ...]
-        """
-        data = {
-            "upload_contacts": upload_contacts,
-            "contacts": contacts
-        }
-        req = requests.post(f"{self.API_URL}/get_suggested_club_invites", headers=self.HEADERS, json=data)
-        return req.json()
-
-    @require_authentication
-    def invite_to_app(self, name, phone_number, message=None):
-        """ (Clubhouse, str, str, str) -> dict
-
-        Invite users to app. but this only works when you have a leftover invitation.
-        """
-        data = {
-            "name": name,
-            "phone_number": phone_number,
-            "message": message
-        }
-        req = requests.post(f"{self.API_URL}/invite_to_app", headers=self.HEADERS, json=data)
-        return req.json()
-
-    @require_authentication
-    def invite_from_waitlist(self, user_id):
-        """ (Clubhouse, str, str, str) -> dict
-
-        Invite someone from the waitlist.
-        This is much more reliable than inviting someone by invite_to_app
-        """
-        data = {
-            "user_id": int(user_id),
-        }
-        req = requests.post(f"{self.API_URL}/invite_from_waitlist", headers=self.HEADERS, json=data)
-        return req.json()
-
-    @require_authentication
-    def search_users(self, query, followers_only=False, following_only=False, cofollows_only=False):
-        """ (Clubhouse, str, bool, bool, bool) -> dict
-
-        Search users based on the given query.
-        """
-        data = {
-            "cofollows_only": cofollows_only,
-            "following_only": following_only,
-            "followers_only": followers_only,
-            "query": query
-        }
-        req = requests.post(f"{self.API_URL}/search_users", headers=self.HEADERS, json=data)
-        return req.json()
-
-    @require_authentication
-    def search_clubs(self, query, followers_only=False, following_only=False, cofollows_only=False):
-        """ (Clubhouse, str, bool, bool, bool) -> dict
-
-        Search clubs based on the given query.
-        """
-        data = {
-            "cofollows_only": cofollows_only,
-            "following_only": following_only,
-            "followers_only": followers_only,
-            "query": query
-        }
-        req = requests.post(f"{self.API_URL}/search_clubs", headers=self.HEADERS, json=data)
-        return req.json()
-
-    @require_authentication
-    def get_topic(self, topic_id):
-        """ (Clubhouse, int) -> dict
-
-        Get topic's information based on the given topic id.
-        """
-        data = {
-            "topic_id": int(topic_id)
-        }
-        req = requests.post(f"{self.API_URL}/get_topic", headers=self.HEADERS, json=data)
-        return req.json()
-
-    @require_authentication
-    def get_clubs_for_topic(self, topic_id, page_size=25, page=1):
-        """ (Clubhouse, int, int, int) -> dict
-
-        Get list of clubs based on the given topic id.
-        """
-        query = "topic_id={}&page_size={}&page={}".format(
-            topic_id,
-            page_size,
-            page
-        )
-        req = requests.get(f"{self.API_URL}/get_clubs_for_topic?{query}", headers=self.HEADERS)
-        return req.json()
-
-    @require_authentication
-    def get_clubs(self, is_startable_only):
-        """ (Clubhouse, bool) -> dict
-
-        Get list of clubs the user's in.
-        """
-        data = {
-            "is_startable_only": is_startable_only
-        }
-        req = requests.post(f"{self.API_URL}/get_clubs", headers=self.HEADERS, json=data)
-        return req.json()
-
-    @require_authentication
-    def get_users_for_topic(self, topic_id, page_size=25, page=1):
-        """ (Clubhouse, int, int, int) -> dict
-
-        Get list of users based on the given topic id.
-        """
-        query = "topic_id={}&page_size={}&page={}".format(
-            topic_id,
-            page_size,
-            page
-        )
-        req = requests.get(f"{self.API_URL}/get_users_for_topic?{query}", headers=self.HEADERS)
-        return req.json()
-
-    @require_authentication
-    def invite_to_existing_channel(self, channel, user_id):
-        """ (Clubhouse, str, int) -> dict
-
-        Invite someone to a currently joined channel.
-        It will send a ping notification to the given user_id.
-        """
-        data = {
-            "channel": channel,
-            "user_id": int(user_id)
-        }
-        req = requests.post(f"{self.API_URL}/invite_to_existing_channel", headers=self.HEADERS, json=data)
-        return req.json()
-
-    @require_authentication
-    def update_username(self, username):
-        """ (Clubhouse, str) -> dict
-
-        Change username. YOU HAVE LIMITED NUMBER OF TRIALS TO CHANGE YOUR USERNAME.
-        """
-        data = {
-            "username": username,
-        }
-        req = requests.post(f"{self.API_URL}/update_username", headers=self.HEADERS, json=data)
-        return req.json()
-
-    @require_authentication
-    def update_name(self, name):
-        """ (Clubhouse, str) -> dict
-
-        Change your legal name. Be careful of what you're trying to enter.
-            (1) Upon registration
-            (2) Changing your legal name. YOU CAN ONLY DO THIS ONCE.
-        """
-        data = {
-            "name": name,
-        }
-        req = requests.post(f"{self.API_URL}/update_name", headers=self.HEADERS, json=data)
-        return req.json()
-
-    @unstable_endpoint
-    @require_authentication
-    def update_twitter_username(self, username, twitter_token, twitter_secret):
-        """ (Clubhouse, str, str, str) -> dict
-
-        Change Twitter username based on Twitter Token.
-
-        >>> client.update_twitter_username(None, None, None) # Clear username
-        >>> client.update_twitter_username("stereotype32", "...", "...") # Set username
-        """
-        data = {
-            "username": username,
-            "twitter_token": twitter_token,
-            "twitter_secret": twitter_secret
-        }
-        req = requests.post(f"{self.API_URL}/update_twitter_username", headers=self.HEADERS, json=data)
-        return req.json()
-
-    @unstable_endpoint
-    @require_authentication
-    def update_instagram_username(self, code):
-        """ (Clubhouse, str) -> dict
-
-        Change Twitter username based on Instagram token.
-
-        >>> client.update_instagram_username(None) # Clear username
-        >>> client.update_instagram_username("...") # Set username
-        """
-        data = {
-            "code": code
-        }
-        req = requests.post(f"{self.API_URL}/update_instagram_username", headers=self.HEADERS, json=data)
-        return req.json()
-
-    @require_authentication
-    def update_displayname(self, name):
-        """ (Clubhouse, str) -> dict
-
-        Change your nickname. YOU CAN ONLY DO THIS ONCE.
-        """
-        data = {
-            "name": name,
-        }
-        req = requests.post(f"{self.API_URL}/update_name", headers=self.HEADERS, json=data)
-        return req.json()
-
-    @require_authentication
-    def refresh_token(self, refresh_token):
-        """ (Clubhouse, str) -> dict
-
-        Refresh the JWT token. returns both access and refresh token.
-        """
-        data = {
-            "refresh": refresh_token
-        }
-        req = requests.post(f"{self.API_URL}/refresh_token", headers=self.HEADERS, json=data)
-        return req.json()
-
-    @require_authentication
-    def update_bio(self, bio):
-        """ (Clubhouse, str) -> dict
-
-        Update bio on your profile
-        """
-        data = {
-            "bio": bio
-        }
-        req = requests.post(f"{self.API_URL}/update_bio", headers=self.HEADERS, json=data)
-        return req.json()
-
-    @require_authentication
-    def record_action_trails(self, action_trails=()):
-        """ (Clubhouse, list of dict) -> dict
-
-        Recording actions of the user interactions while using the app.
-        action_trails: [{"blob_data":{}, "trail_type": "...", ...}, ...]
-        """
-        data = {
-            "action_trails": action_trails
-        }
-        req = requests.post(f"{self.API_URL}/update_bio", headers=self.HEADERS, json=data)
-        return req.json()
-
-    @require_authentication
-    def add_user_topic(self, club_id=None, topic_id=None):
-        """ (Clubhouse, int, int) -> dict
-
-        Add user's interest.
-
-        Some interesting flags for Language has been shared in the following link.
-        Reference: https://github.com/grishka/Houseclub/issues/24
-        """
-        data = {
-            "club_id": int(club_id) if club_id else None,
-            "topic_id": int(topic_id) if topic_id else None
-        }
-        req = requests.post(f"{self.API_URL}/add_user_topic", headers=self.HEADERS, json=data)
-        return req.json()
-
-    @require_authentication
-    def remove_user_topic(self, club_id, topic_id):
-        """ (Clubhouse, int, int) -> dict
-
-        Remove user's interest
-        """
-        data = {
-            "club_id": int(club_id) if club_id else None,
-            "topic_id": int(topic_id) if topic_id else None
-        }
-        req = requests.post(f"{self.API_URL}/remove_user_topic", headers=self.HEADERS, json=data)
-        return req.json()
-
-    @unstable_endpoint
-    @require_authentication
-    def report_incident(self, user_id, channel, incident_type, incident_description, email):
-        """ (Clubhouse, int, str, unknown, str, str) -> dict
-
-        Report incident
-        There seemed to be a field for attachment, need to trace this later
-        """
-        data = {
-            "user_id": int(user_id),
-            "channel": channel,
-            "incident_type": incident_type,
-            "incident_description": incident_description,
-            "email": email
-        }
-        req = requests.post(f"{self.API_URL}/report_incident", headers=self.HEADERS, json=data)
-        return req.json()
-
-    @unstable_endpoint
-    @require_authentication
-    def reject_welcome_channel(self):
-        """ (Clubhouse) -> dict
-
-        Unknown
-        """
-        req = requests.get(f"{self.API_URL}/reject_welcome_channel", headers=self.HEADERS)
-        return req.json()
-
-    @unstable_endpoint
-    @require_authentication
-    def update_channel_flags(self, channel, visibility, flag_title, unflag_title):
-        """ (Clubhouse, str, bool, unknown, unknown) -> dict
-
-        Unknown
-        """
-        data = {
-            "channel": channel,
-            "visibility": visibility,
-            "flag_title": flag_title,
-            "unflag_title": unflag_title,
-        }
-        req = requests.post(f"{self.API_URL}/update_channel_flags", headers=self.HEADERS, json=data)
-        return req.json()
-
-    @unstable_endpoint
-    @require_authentication
-    def ignore_actionable_notification(self, actionable_notification_id):
-        """ (Clubhouse, int) -> dict
-
-        Ignore the actionable notification.
-        """
-        data = {
-            "actionable_notification_id": actionable_notification_id
-        }
-        req = requests.post(f"{self.API_URL}/ignore_actionable_notification", headers=self.HEADERS, json=data)
-        return req.json()
-
-    @unstable_endpoint
-    @require_authentication
-    def invite_to_new_channel(self, user_id, channel):
-        """ (Clubhouse, int, str) -> dict
-
-        Invite someone to the channel
-        """
-        data = {
-            "user_id": int(user_id),
-            "channel": channel
-        }
-        req = requests.post(f"{self.API_URL}/invite_to_new_channel", headers=self.HEADERS, json=data)
-        return req.json()
-
-    @unstable_endpoint
-    @require_authentication
-    def accept_new_channel_invite(self, channel_invite_id):
-        """ (Clubhouse, int) -> dict
-
-        Accept Channel Invitation
-        """
-        data = {
-            "channel_invite_id": channel_invite_id
-        }
-        req = requests.post(f"{self.API_URL}/accept_new_channel_invite", headers=self.HEADERS, json=data)
-        return req.json()
-
-    @unstable_endpoint
-    @require_authentication
-    def reject_new_channel_invite(self, channel_invite_id):
-        """ (Clubhouse, int) -> dict
-
-        Reject Channel Invitation
-        """
-        data = {
-            "channel_invite_id": channel_invite_id
-        }
-        req = requests.post(f"{self.API_URL}/reject_new_channel_invite", headers=self.HEADERS, json=data)
-        return req.json()
-
-    @unstable_endpoint
-    @require_authentication
-    def cancel_new_channel_invite(self, channel_invite_id):
-        """ (Clubhouse, int) -> dict
-
-        Cancel Channel Invitation
-        """
-        data = {
-            "channel_invite_id": channel_invite_id
-        }
-        req = requests.post(f"{self.API_URL}/cancel_new_channel_invite", headers=self.HEADERS, json=data)
-        return req.json()
-
-    @require_authentication
-    def add_club_admin(self, club_id, user_id):
-        """ (Clubhouse, int, int) -> dict
-
-        Add Club Admin. Requires privilege.
-        """
-        data = {
-            "club_id": int(club_id),
-            "user_id": int(user_id)
-        }
-        req = requests.post(f"{self.API_URL}/add_club_admin", headers=self.HEADERS, json=data)
-        return req.json()
-
-    @require_authentication
-    def remove_club_admin(self, club_id, user_id):
-        """ (Clubhouse, int, int) -> dict
-
-        Remove Club admin. Requires privilege.
-        """
-        data = {
-            "club_id": int(club_id) if club_id else None,
-            "user_id": int(user_id)
-        }
-        req = requests.post(f"{self.API_URL}/remove_club_admin", headers=self.HEADERS, json=data)
-        return req.json()
-
-    @require_authentication
-    def remove_club_member(self, club_id, user_id):
-        """ (Clubhouse, int, int) -> dict
-
-        Remove Club member. Requires privilege.
-        """
-        data = {
-            "club_id": int(club_id) if club_id else None,
-            "user_id": int(user_id)
-        }
-        req = requests.post(f"{self.API_URL}/remove_club_member", headers=self.HEADERS, json=data)
-        return req.json()
-
-    @require_authentication
-    def accept_club_member_invite(self, club_id, source_topic_id=None, invite_code=None):
-        """ (Clubhouse, int, int, str) -> dict
-
-        Accept Club member invite.
-        """
-        data = {
-            "club_id": int(club_id) if club_id else None,
-            "invite_code": invite_code,
-            "query_id": None,
-            "query_result_position": None,
-            "slug": None,
-            "source_topic_id": source_topic_id
-        }
-        req = requests.post(f"{self.API_URL}/accept_club_member_invite", headers=self.HEADERS, json=data)
-        return req.json()
-
-    @require_authentication
-    def add_club_member(self, club_id, user_id, name, phone_number, message, reason):
-        """ (Clubhouse, int, int, str, str, str, unknown) -> dict
-
-        Add club member
-        """
-        data = {
-            "club_id": int(club_id),
-            "user_id": int(user_id),
-            "name": name,
-            "phone_number": phone_number,
-            "message": message,
-            "reason": reason
-        }
-        req = requests.post(f"{self.API_URL}/add_club_member", headers=self.HEADERS, json=data)
-        return req.json()
-
-    @require_authentication
-    def get_club_nominations(self, club_id, source_topic_id):
-        """ (Club, int, int) -> dict
-
-        Get club nomination list
-        """
-        data = {
-            "club_id": int(club_id),
-            "source_topic_id": source_topic_id
-        }
-        req = requests.post(f"{self.API_URL}/get_club_nominations", headers=self.HEADERS, json=data)
-        return req.json()
-
-    @require_authentication
-    def approve_club_nomination(self, club_id, source_topic_id, invite_nomination_id):
-        """ (Club, int, int) -> dict
-
-        Approve club nomination
-        """
-        data = {
-            "club_id": int(club_id),
-            "source_topic_id": source_topic_id,
-            "invite_nomination_id": invite_nomination_id
-        }
-        req = requests.post(f"{self.API_URL}/approve_club_nomination", headers=self.HEADERS, json=data)
-        return req.json()
-
-    @require_authentication
-    def reject_club_nomination(self, club_id, source_topic_id, invite_nomination_id):
-        """ (Club, int, int) -> dict
-
-        Reject club nomination
-        """
-        data = {
-            "club_id": int(club_id),
-            "source_topic_id": source_topic_id,
-            "invite_nomination_id": invite_nomination_id
-        }
-        req = requests.post(f"{self.API_URL}/approve_club_nomination", headers=self.HEADERS, json=data)
-        return req.json()
-
-    @require_authentication
-    def add_club_topic(self, club_id, topic_id):
-        """ (Club, int, int) -> dict
-
-        Add club topic
-        """
-        data = {
-            "club_id": int(club_id),
-            "topic_id": int(topic_id)
-        }
-        req = requests.post(f"{self.API_URL}/add_club_topic", headers=self.HEADERS, json=data)
-        return req.json()
-
-    @require_authentication
-    def remove_club_topic(self, club_id, topic_id):
-        """ (Club, int, int) -> dict
-
-        Remove club topic
-        """
-        data = {
-            "club_id": int(club_id),
-            "topic_id": int(topic_id)
-        }
-        req = requests.post(f"{self.API_URL}/remove_club_topic", headers=self.HEADERS, json=data)
-        return req.json()
-
-    @require_authentication
-    def get_events_to_start(self):
-        """ (Clubhouse) -> dict
-
-        Get events to start
-        """
-        req = requests.get(f"{self.API_URL}/get_events_to_start", headers=self.HEADERS)
-        return req.json()
-
-    @require_authentication
-    def update_is_follow_allowed(self, club_id, is_follow_allowed=True):
-        """ (Clubhouse, int, bool) -> dict
-
-        Update follow button of the given Club
-        """
-        data = {
-            "club_id": int(club_id),
-            "is_follow_allowed": is_follow_allowed
-        }
-        req = requests.post(f"{self.API_URL}/update_is_follow_allowed", headers=self.HEADERS, json=data)
-        return req.json()
-
-    @require_authentication
-    def update_is_membership_private(self, club_id, is_membership_private=False):
-        """ (Clubhouse, int, bool) -> dict
-
-        Update club membership status of the given Club
-        If True, member list will not be shown to public.
-        """
-        data = {
-            "club_id": int(club_id),
-            "is_membership_private": is_membership_private
-        }
-        req = requests.post(f"{self.API_URL}/update_is_membership_private", headers=self.HEADERS, json=data)
-        return req.json()
-
-    @require_authentication
-    def update_is_community(self, club_id, is_community=False):
-        """ (Clubhouse, int, bool) -> dict
-
-        Change room start permission. If set False, Admins can only start club rooms.
-        """
-        data = {
-            "club_id": int(club_id),
-            "is_community": is_community
-        }
-        req = requests.post(f"{self.API_URL}/update_is_community", headers=self.HEADERS, json=data)
-        return req.json()
-
-    @require_authentication
-    def update_club_description(self, club_id, description):
-        """ (Clubhouse, int, str) -> dict
-
-        Update description of the given Club
-        """
-        data = {
-            "club_id": int(club_id),
-            "description": description
-        }
-        req = requests.post(f"{self.API_URL}/update_club_description", headers=self.HEADERS, json=data)
-        return req.json()
-
-    @require_authentication
-    def update_club_rules(self, club_id='', rules=()):
-        """ (Clubhouse, str, list) -> dict
-
-        Update Club's rules (Maximum upto 3 rules)
-        rules: [{'desc': "text", "title": "text"}, ...]
-        """
-        data = {
-            "club_id": int(club_id),
-            "rules": rules if rules else [],
-        }
-        req = requests.post(f"{self.API_URL}/update_club_rules", headers=self.HEADERS, json=data)
-        return req.json()
-
-    @require_authentication
-    def get_events_for_user(self, user_id='', page_size=25, page=1):
-        """ (Clubhouse, str, int, int) -> dict
-
-        Get events for the specific user.
-        """
-        query = f"user_id={user_id}&page_size={page_size}&page={page}"
-        req = requests.get(f"{self.API_URL}/get_events_for_user?{query}", headers=self.HEADERS)
-        return req.json()
+for _endpoint in ENDPOINTS.values():
+    if _endpoint.name in vars(Clubhouse):
+        continue
+    _method = build_method(_endpoint)
+    if _endpoint.unstable:
+        _method = Clubhouse.unstable_endpoint(_method)
+    setattr(Clubhouse, _endpoint.name, _method)
+    if _endpoint.items:
+        _iterator = build_iterator(_endpoint)
+        setattr(Clubhouse, _iterator.__name__, _iterator)
@@ -0,0 +1,60 @@
+#!/usr/bin/python -u
+#-*- coding: utf-8 -*-
+
+"""
+deadline.py
+
+Deadlines bounding the total time of a call, retries included.
+"""
+
+import time
+from clubhouse.exceptions import DeadlineExceeded
+
+class Deadline:
+    """
+    Deadline Class
+
+    A point in time by which an operation must be done.
+    Every endpoint method takes a `deadline`, either a number of seconds
+    or a Deadline. Pass the same Deadline to every call of an operation
+    made of several calls, so they all share the same time budget.
+
+    >>> deadline = Deadline(10)
+    >>> channel = clubhouse.join_channel(channel_name, deadline=deadline)
+    >>> if not channel['success']:
+    ...     channel = clubhouse.join_channel(channel_name, "link", "e30=", deadline=deadline)
+    """
+
+    def __init__(self, seconds):
+        """ (Deadline, float) -> NoneType """
+        self.expires = time.monotonic() + seconds
+
+    @classmethod
+    def of(cls, deadline):
+        """ (type, object) -> Deadline
+        Deadline from the `deadline` argument of a call. None stays None.
+        """
+        if deadline is None or isinstance(deadline, Deadline):
+            return deadline
+        return cls(deadline)
+
+    def remaining(self):
+        """ (Deadline) -> float
+        Seconds left, never negative.
+        """
+        return max(0.0, self.expires - time.monotonic())
+
+    @property
+    def expired(self):
+        """ (Deadline) -> bool """
+        return time.monotonic() >= self.expires
+
+    def check(self, name):
+        """ (Deadline, str) -> NoneType
+        Raise DeadlineExceeded if the deadline has passed.
+        """
+        if self.expired:
+            raise DeadlineExceeded(f"Deadline exceeded for {name}")
+
+    def __repr__(self):
+        return f"Deadline(remaining={self.remaining():.3f})"
@@ -0,0 +1,122 @@
+#!/usr/bin/python -u
+#-*- coding: utf-8 -*-
+
+"""
+dns.py
+
+In-process cache of DNS lookups, used by `Clubhouse(dns_cache=True)`.
+"""
+
+import time
+import socket
+import threading
+
+# Caches installed in the process, once per install(), latest last. Lookups
+# go through the latest; the resolver they replaced comes back with the last
+# uninstall().
+_installed = []
+_install_lock = threading.Lock()
+_resolver = socket.getaddrinfo
+
+def _resolve(host, port, family=0, type=0, proto=0, flags=0): # pylint: disable=redefined-builtin
+    """ (str, int, int, int, int, int) -> list
+    Lookup without any cache, with the resolver replaced by install().
+    """
+    return _resolver(host, port, family, type, proto, flags)
+
+def _getaddrinfo(host, port, family=0, type=0, proto=0, flags=0): # pylint: disable=redefined-builtin
+    """ (str, int, int, int, int, int) -> list
+    socket.getaddrinfo while a cache is installed.
+    """
+    try:
+        cache = _installed[-1]
+    except IndexError:
+        # Uninstalled meanwhile
+        return _resolve(host, port, family, type, proto, flags)
+    return cache.getaddrinfo(host, port, family, type, proto, flags)
+
+class DNSCache:
+    """
+    DNSCache Class
+
+    Caches the results of `socket.getaddrinfo` for `ttl` seconds.
+    Failed lookups are not cached.
+
+    requests, httpx and asyncio all resolve hosts with `socket.getaddrinfo`,
+    so `install()` replaces it for the whole process, until `uninstall()`.
+    A cache may be installed by several clients; it's uninstalled
+    when all of them have uninstalled it. With several caches installed,
+    lookups go through the one installed last, and the original
+    `socket.getaddrinfo` is back once every install is undone,
+    in any order.
+
+    >>> cache = DNSCache(ttl=60)
+    >>> cache.install()
+    >>> cache.stats()
+    {'hits': 0, 'misses': 0, 'size': 0}
+    """
+
+    def __init__(self, ttl=300.0):
+        """ (DNSCache, float) -> NoneType """
+        self.ttl = ttl
+        self._entries = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def getaddrinfo(self, host, port, family=0, type=0, proto=0, flags=0): # pylint: disable=redefined-builtin
+        """ (DNSCache, str, int, int, int, int, int) -> list
+        Same as socket.getaddrinfo, from the cache while the entry is fresh.
+        """
+        if isinstance(host, bytes):
+            host = host.decode("idna")
+        key = (host, port, family, type, proto, flags)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > now:
+                self.hits += 1
+                return list(entry[1])
+            self.misses += 1
+        ret = _resolve(host, port, family, type, proto, flags)
+        with self._lock:
+            self._entries[key] = (now + self.ttl, ret)
+        return list(ret)
+
+    def install(self):
+        """ (DNSCache) -> NoneType
+        Make every lookup of the process go through the cache.
+        """
+        global _resolver # pylint: disable=global-statement
+        with _install_lock:
+            if not _installed and socket.getaddrinfo is not _getaddrinfo:
+                _resolver = socket.getaddrinfo
+                socket.getaddrinfo = _getaddrinfo
+            _installed.append(self)
+
+    def uninstall(self):
+        """ (DNSCache) -> NoneType
+        Undo install(), once every install() has been undone.
+        """
+        with _install_lock:
+            if self not in _installed:
+                return
+            # The latest install of this cache
+            del _installed[len(_installed) - 1 - _installed[::-1].index(self)]
+            # Leave it alone if something else replaced it since.
+            if not _installed and socket.getaddrinfo is _getaddrinfo:
+                socket.getaddrinfo = _resolver
+
+    def clear(self):
+        """ (DNSCache) -> NoneType
+        Forget every lookup.
+        """
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """ (DNSCache) -> dict
+        Cache hits and misses so far, and lookups cached.
+        """
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "size": len(self._entries)}
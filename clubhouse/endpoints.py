@@ -0,0 +1,1466 @@
+#!/usr/bin/python -u
+#-*- coding: utf-8 -*-
+# pylint: disable=line-too-long,too-many-lines,too-many-instance-attributes,too-many-arguments
+
+"""
+endpoints.py
+
+Declarative definitions of the Clubhouse API endpoints.
+
+Clubhouse and AsyncClubhouse generate their methods from `ENDPOINTS`,
+so the table is the single place to add or change an endpoint.
+Every entry is plain data (name, HTTP method, path, parameters and flags),
+which makes it usable by other front-ends such as the MCP server as well.
+"""
+
+import inspect
+
+REQUIRED = inspect.Parameter.empty
+
+def optional(value):
+    """ (object) -> object
+    Send falsy values as null.
+    """
+    return value if value else None
+
+def optional_int(value):
+    """ (object) -> int
+    Send falsy values as null and others as int.
+    """
+    return int(value) if value else None
+
+def lowercase_bool(value):
+    """ (bool) -> str
+    Booleans for the query string.
+    """
+    return "true" if value else "false"
+
+def list_or_empty(value):
+    """ (list) -> list
+    Send falsy values as an empty list.
+    """
+    return value if value else []
+
+# Converters written inline into the generated methods, saving a function call
+INLINE_CONVERTERS = {
+    int: "int({0})",
+    optional: "({0} if {0} else None)",
+    optional_int: "(int({0}) if {0} else None)",
+    lowercase_bool: "('true' if {0} else 'false')",
+    list_or_empty: "({0} if {0} else [])",
+}
+
+class Param:
+    """
+    Parameter of an endpoint.
+
+    name: argument name of the generated method
+    default: default value, or REQUIRED
+    convert: applied to the argument before sending
+    key: name of the field on the wire, if different from `name`
+    """
+
+    def __init__(self, name, default=REQUIRED, convert=None, key=None):
+        self.name = name
+        self.default = default
+        self.convert = convert
+        self.key = key or name
+
+    def __repr__(self):
+        return f"Param({self.name!r})"
+
+class Endpoint:
+    """
+    Definition of an API endpoint.
+
+    name: method name on the client
+    method: "GET" sends params in the query string, "POST" as a JSON body
+    path: URL path below API_URL, defaults to "/{name}"
+    params: tuple of Param, in the order of the method arguments
+    extra: constant fields sent along with the params
+    body: False to send a POST request without any body
+    auth: requires authentication
+    anonymous_only: refuses to run once authenticated
+    idempotent: safe to send more than once. defaults to True for GET
+    unstable: endpoint was never tested
+    cache_ttl: seconds a response may be served from the response cache. 0 disables it
+    max_stale: seconds past `cache_ttl` a response is still served while refreshed in the background
+    invalidates: names of the endpoints whose cached responses are dropped after this call
+    items: key of the list in paginated responses. The client gets an `iter_*` generator for it
+    rate_class: token bucket of the RateLimiter. defaults to "auth", "read" or "write"
+    timeout: (connect, read) timeouts in seconds, if different from the client's
+    """
+
+    def __init__(self, name, method, path=None, params=(), extra=None, body=True,
+                 auth=True, anonymous_only=False, idempotent=None, unstable=False,
+                 cache_ttl=0, max_stale=0, invalidates=(), items=None, rate_class=None,
+                 timeout=None, doc=""):
+        self.name = name
+        self.method = method
+        self.path = path or f"/{name}"
+        self.params = params
+        self.extra = extra or {}
+        self.body = body and method != "GET"
+        self.auth = auth
+        self.anonymous_only = anonymous_only
+        self.idempotent = method == "GET" if idempotent is None else idempotent
+        self.unstable = unstable
+        self.cache_ttl = cache_ttl
+        self.max_stale = max_stale
+        self.invalidates = invalidates
+        self.items = items
+        if rate_class is None:
+            rate_class = "auth" if anonymous_only else "read" if self.idempotent else "write"
+        self.rate_class = rate_class
+        self.timeout = timeout
+        self.doc = inspect.cleandoc(doc)
+
+    def __repr__(self):
+        return f"Endpoint({self.name!r}, {self.method!r}, {self.path!r})"
+
+def build_method(endpoint):
+    """ (Endpoint) -> function
+
+    Generate the client method for the given endpoint.
+    The method has a real signature, plus keyword-only `deadline` and `fields`,
+    and only builds the request fields before handing them to `self._call`.
+    GET requests get their query string compiled into an f-string.
+    """
+    namespace = {"_endpoint": endpoint}
+    args = ["self"]
+    values = []
+    for i, param in enumerate(endpoint.params):
+        if param.default is REQUIRED:
+            args.append(param.name)
+        else:
+            namespace[f"_default{i}"] = param.default
+            args.append(f"{param.name}=_default{i}")
+        value = param.name
+        if param.convert in INLINE_CONVERTERS:
+            value = INLINE_CONVERTERS[param.convert].format(param.name)
+        elif param.convert:
+            namespace[f"_convert{i}"] = param.convert
+            value = f"_convert{i}({param.name})"
+        values.append(value)
+
+    if endpoint.method == "GET":
+        query = ""
+        if endpoint.params:
+            query = "?" + "&".join(f"{param.key}={{{value}}}" for param, value in zip(endpoint.params, values))
+        call = f"self._call(_endpoint, None, f{query!r}, deadline=deadline, fields=fields)"
+    else:
+        fields = [f"{param.key!r}: {value}" for param, value in zip(endpoint.params, values)]
+        for i, (key, value) in enumerate(endpoint.extra.items()):
+            namespace[f"_extra{i}"] = value
+            fields.append(f"{key!r}: _extra{i}")
+        call = f"self._call(_endpoint, {{{', '.join(fields)}}}, deadline=deadline, fields=fields)"
+
+    args.extend(("*", "deadline=None", "fields=None"))
+    source = (
+        f"def {endpoint.name}({', '.join(args)}):\n"
+        f"    return {call}\n"
+    )
+    exec(source, namespace) # pylint: disable=exec-used
+    method = namespace[endpoint.name]
+    method.__doc__ = endpoint.doc
+    return method
+
+def build_iterator(endpoint):
+    """ (Endpoint) -> function
+
+    Generate the `iter_*` method of a paginated endpoint.
+    It takes the same arguments as the endpoint method, `page` being the first
+    page to read, and `fields`, and hands them to `self._paginate`.
+    """
+    name = "iter_" + (endpoint.name[4:] if endpoint.name.startswith("get_") else endpoint.name)
+    namespace = {"_endpoint": endpoint}
+    args = ["self"]
+    fields = []
+    for i, param in enumerate(endpoint.params):
+        if param.default is REQUIRED:
+            args.append(param.name)
+        else:
+            namespace[f"_default{i}"] = param.default
+            args.append(f"{param.name}=_default{i}")
+        if param.name != "page":
+            fields.append(f"{param.name!r}: {param.name}")
+    args.extend(("*", "fields=None"))
+    fields.append("'fields': fields")
+
+    source = (
+        f"def {name}({', '.join(args)}):\n"
+        f"    return self._paginate(_endpoint, {{{', '.join(fields)}}}, page)\n"
+    )
+    exec(source, namespace) # pylint: disable=exec-used
+    method = namespace[name]
+    method.__doc__ = (
+        f"Iterate over the {endpoint.items} of `{endpoint.name}`, page by page.\n"
+        f"The next page is fetched in the background while the current one is consumed."
+    )
+    return method
+
+ENDPOINTS = {endpoint.name: endpoint for endpoint in (
+    Endpoint(
+        "start_phone_number_auth", "POST",
+        params=(Param("phone_number"),),
+        auth=False,
+        anonymous_only=True,
+        doc="""
+        (Clubhouse, str) -> dict
+
+        Begin phone number authentication.
+        Some examples for the phone number.
+
+        >>> clubhouse = Clubhouse()
+        >>> clubhouse.start_phone_number_auth("+821012341337")
+        ...
+        >>> clubhouse.start_phone_number_auth("+818013371221")
+        ...
+        """
+    ),
+    Endpoint(
+        "call_phone_number_auth", "POST",
+        params=(Param("phone_number"),),
+        auth=False,
+        anonymous_only=True,
+        unstable=True,
+        doc="""
+        (Clubhouse, str) -> dict
+
+        Call the person and send verification message.
+        """
+    ),
+    Endpoint(
+        "resend_phone_number_auth", "POST",
+        params=(Param("phone_number"),),
+        auth=False,
+        anonymous_only=True,
+        unstable=True,
+        doc="""
+        (Clubhouse, str) -> dict
+
+        Resend the verification message
+        """
+    ),
+    Endpoint(
+        "complete_phone_number_auth", "POST",
+        params=(
+            Param("phone_number"),
+            Param("verification_code"),
+            Param("rc_token", None),
+            Param("safety_net_nonce", None),
+            Param("safety_net_response", None),
+        ),
+        extra={"device_token": None},
+        auth=False,
+        anonymous_only=True,
+        doc="""
+        (Clubhouse, str, str, str, str, str) -> dict
+
+        Complete phone number authentication.
+
+        IMPORTANT NOTE
+        You need to also provide `rc_token`, `safety_net_nonce` and `safety_net_response`
+        depending on the platform type. Please do not send messages for the usage of these
+        options. Some of these features may not have a Python implementations.
+        """
+    ),
+    Endpoint(
+        "check_for_update", "GET",
+        params=(Param("is_testflight", False, convert=int),),
+        auth=False,
+        doc="""
+        (Clubhouse, bool) -> dict
+
+        Check for app updates.
+
+        >>> clubhouse = Clubhouse()
+        >>> clubhouse.check_for_update(False)
+        {'has_update': False, 'success': True}
+        """
+    ),
+    Endpoint(
+        "logout", "POST",
+        doc="""
+        (Clubhouse) -> dict
+
+        Logout from the app.
+        """
+    ),
+    Endpoint(
+        "get_release_notes", "POST",
+        body=False,
+        idempotent=True,
+        cache_ttl=3600,
+        doc="""
+        (Clubhouse) -> dict
+
+        Get release notes.
+        """
+    ),
+    Endpoint(
+        "check_waitlist_status", "POST",
+        body=False,
+        idempotent=True,
+        doc="""
+        (Clubhouse) -> dict
+
+        Check whether you're still on a waitlist or not.
+        """
+    ),
+    Endpoint(
+        "add_email", "POST",
+        params=(Param("email"),),
+        invalidates=("me",),
+        doc="""
+        (Clubhouse, str) -> dict
+
+        Request for email verification.
+        You only need to do this once.
+        """
+    ),
+    Endpoint(
+        "update_photo", "POST",
+        params=(Param("photo_filename"),),
+        invalidates=("me", "get_profile"),
+        timeout=(10, 120),
+        doc="""
+        (Clubhouse, str) -> dict
+
+        Update photo. Please make sure to upload a JPG format.
+        """
+    ),
+    Endpoint(
+        "follow", "POST",
+        params=(
+            Param("user_id", convert=int),
+            Param("user_ids", None),
+            Param("source", 4),
+            Param("source_topic_id", None),
+        ),
+        invalidates=("me", "get_profile", "get_following", "get_followers", "get_mutual_follows"),
+        doc="""
+        (Clubhouse, int, list, int, int) -> dict
+
+        Follow a user.
+        Different value for `source` may require different parameters to be set
+        """
+    ),
+    Endpoint(
+        "unfollow", "POST",
+        params=(Param("user_id", convert=int),),
+        invalidates=("me", "get_profile", "get_following", "get_followers", "get_mutual_follows"),
+        doc="""
+        (Clubhouse, int) -> dict
+
+        Unfollow a user.
+        """
+    ),
+    Endpoint(
+        "block", "POST",
+        params=(Param("user_id", convert=int),),
+        invalidates=("me", "get_profile"),
+        doc="""
+        (Clubhouse, int) -> dict
+
+        Block a user.
+        """
+    ),
+    Endpoint(
+        "unblock", "POST",
+        params=(Param("user_id", convert=int),),
+        invalidates=("me", "get_profile"),
+        doc="""
+        (Clubhouse, int) -> dict
+
+        Unfollow a user.
+        """
+    ),
+    Endpoint(
+        "follow_multiple", "POST",
+        params=(
+            Param("user_ids"),
+            Param("user_id", None),
+            Param("source", 7),
+            Param("source_topic_id", None),
+        ),
+        invalidates=("me", "get_profile", "get_following", "get_followers", "get_mutual_follows"),
+        doc="""
+        (Clubhouse, list, int, int, int) -> dict
+
+        Follow multiple users at once.
+        Different value for `source` may require different parameters to be set
+        """
+    ),
+    Endpoint(
+        "follow_club", "POST",
+        params=(Param("club_id", convert=int), Param("source_topic_id", None)),
+        invalidates=("me", "get_club", "get_clubs"),
+        doc="""
+        (Clubhouse, int, int) -> dict
+
+        Follow a club
+        """
+    ),
+    Endpoint(
+        "unfollow_club", "POST",
+        params=(Param("club_id", convert=int), Param("source_topic_id", None)),
+        invalidates=("me", "get_club", "get_clubs"),
+        doc="""
+        (Clubhouse, int, int) -> dict
+
+        Unfollow a club
+        """
+    ),
+    Endpoint(
+        "update_follow_notifications", "POST",
+        params=(Param("user_id", convert=int), Param("notification_type", 2, convert=int)),
+        invalidates=("get_profile",),
+        doc="""
+        (Clubhouse, str, int) -> dict
+
+        Update notification frequency for the given user.
+        1 = Always notify, 2 = Sometimes, 3 = Never
+        """
+    ),
+    Endpoint(
+        "get_suggested_follows_similar", "POST",
+        params=(
+            Param("user_id", "", convert=optional_int),
+            Param("username", "", convert=optional),
+        ),
+        extra={"query_id": None, "query_result_position": None},
+        idempotent=True,
+        doc="""
+        (Clubhouse, str, str) -> dict
+
+        Get similar users based on the given user.
+        """
+    ),
+    Endpoint(
+        "get_suggested_follows_friends_only", "POST",
+        params=(Param("club_id", None), Param("upload_contacts", True), Param("contacts", ())),
+        idempotent=True,
+        doc="""
+        (Clubhouse, int, int, list of dict) -> dict
+
+        Get users based on the phone number.
+        Only seems to be used upon signup.
+        """
+    ),
+    Endpoint(
+        "get_suggested_follows_all", "GET",
+        params=(
+            Param("in_onboarding", True, convert=lowercase_bool),
+            Param("page_size", 50),
+            Param("page", 1),
+        ),
+        items="users",
+        doc="""
+        (Clubhouse, bool, int, int) -> dict
+
+        Get all suggested follows.
+        """
+    ),
+    Endpoint(
+        "ignore_suggested_follow", "POST",
+        path="/user_id",
+        params=(Param("user_id", convert=int),),
+        doc="""
+        (Clubhouse, str) -> dict
+
+        Remove user_id from the suggested follow list.
+        """
+    ),
+    Endpoint(
+        "get_event", "POST",
+        params=(
+            Param("event_id", None, convert=optional_int),
+            Param("user_ids", None),
+            Param("club_id", None),
+            Param("is_member_only", False),
+            Param("event_hashid", None),
+            Param("description", None),
+            Param("time_start_epoch", None),
+            Param("name", None),
+        ),
+        idempotent=True,
+        doc="""
+        (Clubhouse, int, list, int, bool, int, str, int, str) -> dict
+
+        Get details about the event
+        """
+    ),
+    Endpoint(
+        "create_event", "POST",
+        path="/edit_event",
+        params=(
+            Param("name"),
+            Param("time_start_epoch"),
+            Param("description"),
+            Param("event_id", None, convert=optional_int),
+            Param("user_ids", ()),
+            Param("club_id", None),
+            Param("is_member_only", False),
+            Param("event_hashid", None),
+        ),
+        invalidates=("get_event", "get_events", "get_events_for_user", "get_events_to_start"),
+        doc="""
+        (Clubhouse, str, int, str, int, list, int, bool, int) -> dict
+
+        Create a new event
+        """
+    ),
+    Endpoint(
+        "edit_event", "POST",
+        params=(
+            Param("name"),
+            Param("time_start_epoch"),
+            Param("description"),
+            Param("event_id", None, convert=optional_int),
+            Param("user_ids", ()),
+            Param("club_id", None),
+            Param("is_member_only", False),
+            Param("event_hashid", None),
+        ),
+        invalidates=("get_event", "get_events", "get_events_for_user", "get_events_to_start"),
+        doc="""
+        (Clubhouse, str, int, str, int, list, int, bool, int) -> dict
+
+        Edit an event.
+        """
+    ),
+    Endpoint(
+        "delete_event", "POST",
+        params=(
+            Param("event_id", convert=optional_int),
+            Param("user_ids", None),
+            Param("club_id", None),
+            Param("is_member_only", False),
+            Param("event_hashid", None),
+            Param("description", None),
+            Param("time_start_epoch", None),
+            Param("name", None),
+        ),
+        invalidates=("get_event", "get_events", "get_events_for_user", "get_events_to_start"),
+        doc="""
+        (Clubhouse, str, list, int, bool, int, str, int, str) -> dict
+
+        Delete event.
+        """
+    ),
+    Endpoint(
+        "get_events", "GET",
+        params=(
+            Param("is_filtered", True, convert=lowercase_bool),
+            Param("page_size", 25),
+            Param("page", 1),
+        ),
+        items="events",
+        doc="""
+        (Clubhouse, bool, int, int) -> dict
+
+        Get list of upcoming events with details.
+        """
+    ),
+    Endpoint(
+        "get_club", "POST",
+        params=(Param("club_id", convert=int), Param("source_topic_id", None)),
+        extra={"query_id": None, "query_result_position": None, "slug": None},
+        idempotent=True,
+        cache_ttl=300,
+        doc="""
+        (Clubhouse, int, int) -> dict
+
+        Get the information about the given club_id.
+        """
+    ),
+    Endpoint(
+        "get_club_members", "GET",
+        params=(
+            Param("club_id"),
+            Param("return_followers", False, convert=int),
+            Param("return_members", True, convert=int),
+            Param("page_size", 50),
+            Param("page", 1),
+        ),
+        items="users",
+        doc="""
+        (Clubhouse, int, bool, bool, int, int) -> dict
+
+        Get list of members on the given club_id.
+        """
+    ),
+    Endpoint(
+        "get_settings", "GET",
+        cache_ttl=300,
+        doc="""
+        (Clubhouse) -> dict
+
+        Receive user's settings.
+        """
+    ),
+    Endpoint(
+        "get_welcome_channel", "GET",
+        doc="""
+        (Clubhouse) -> dict
+
+        Seems to be called upon sign up. Does not seem to return much data.
+        """
+    ),
+    Endpoint(
+        "hide_channel", "POST",
+        params=(Param("channel"), Param("hide", True)),
+        doc="""
+        (Clubhouse, str, bool) -> dict
+
+        Hide/unhide the channel from the channel list.
+        """
+    ),
+    Endpoint(
+        "join_channel", "POST",
+        params=(
+            Param("channel"),
+            Param("attribution_source", "feed"),
+            Param("attribution_details", "eyJpc19leHBsb3JlIjpmYWxzZSwicmFuayI6MX0="),
+        ),
+        doc="""
+        (Clubhouse, str, str) -> dict
+
+        Join the given channel
+        """
+    ),
+    Endpoint(
+        "leave_channel", "POST",
+        params=(Param("channel"),),
+        doc="""
+        (Clubhouse, str) -> dict
+
+        Leave the given channel
+        """
+    ),
+    Endpoint(
+        "make_channel_public", "POST",
+        params=(Param("channel"), Param("channel_id", None)),
+        doc="""
+        (Clubhouse, str, int) -> dict
+
+        Make the current channel open to public.
+        Everyone can join the channel.
+        """
+    ),
+    Endpoint(
+        "make_channel_social", "POST",
+        params=(Param("channel"), Param("channel_id", None)),
+        doc="""
+        (Clubhouse, str, int) -> dict
+
+        Make the current channel open to public.
+        Only people who user follows can join the channel.
+        """
+    ),
+    Endpoint(
+        "end_channel", "POST",
+        params=(Param("channel"), Param("channel_id", None)),
+        doc="""
+        (Clubhouse, str, int) -> dict
+
+        Kick everyone and close the channel. Requires moderator privilege.
+        """
+    ),
+    Endpoint(
+        "make_moderator", "POST",
+        params=(Param("channel"), Param("user_id", convert=int)),
+        doc="""
+        (Clubhouse, str, int) -> dict
+
+        Make the given user moderator. Requires moderator privilege.
+        """
+    ),
+    Endpoint(
+        "block_from_channel", "POST",
+        params=(Param("channel"), Param("user_id", convert=int)),
+        doc="""
+        (Clubhouse, str, int) -> dict
+
+        Remove the user from the channel. The user will not be able to re-join.
+        """
+    ),
+    Endpoint(
+        "get_profile", "POST",
+        params=(
+            Param("user_id", "", convert=optional_int),
+            Param("username", "", convert=optional),
+        ),
+        extra={"query_id": None, "query_result_position": 0},
+        idempotent=True,
+        cache_ttl=60,
+        doc="""
+        (Clubhouse, str, str) -> dict
+
+        Lookup someone else's profile. It is OK to one's own profile with this method.
+        """
+    ),
+    Endpoint(
+        "me", "POST",
+        params=(
+            Param("return_blocked_ids", False),
+            Param("timezone_identifier", "Asia/Tokyo"),
+            Param("return_following_ids", False),
+        ),
+        idempotent=True,
+        cache_ttl=60,
+        doc="""
+        (Clubhouse, bool, str, bool) -> dict
+
+        Get my information
+        """
+    ),
+    Endpoint(
+        "get_following", "GET",
+        params=(Param("user_id"), Param("page_size", 50), Param("page", 1)),
+        cache_ttl=60,
+        items="users",
+        doc="""
+        (Clubhouse, str, int, int) -> dict
+
+        Get following users type2
+        """
+    ),
+    Endpoint(
+        "get_followers", "GET",
+        params=(Param("user_id"), Param("page_size", 50), Param("page", 1)),
+        items="users",
+        doc="""
+        (Clubhouse, str, int, int) -> dict
+
+        Get followers of the given user_id.
+        """
+    ),
+    Endpoint(
+        "get_mutual_follows", "GET",
+        params=(Param("user_id"), Param("page_size", 50), Param("page", 1)),
+        items="users",
+        doc="""
+        (Clubhouse, str, int, int) -> dict
+
+        Get mutual followers between the current user and the given user_id.
+        """
+    ),
+    Endpoint(
+        "get_all_topics", "GET",
+        cache_ttl=3600,
+        doc="""
+        (Clubhouse) -> dict
+
+        Get list of topics, based on the server's channel selection algorithm
+        """
+    ),
+    Endpoint(
+        "get_feed", "GET",
+        cache_ttl=5,
+        max_stale=60,
+        doc="""
+        (Clubhouse) -> dict
+
+        Get list of channels, current invite status, etc.
+        """
+    ),
+    Endpoint(
+        "get_channels", "GET",
+        cache_ttl=5,
+        max_stale=60,
+        doc="""
+        (Clubhouse) -> dict
+
+        Get list of channels, based on the server's channel selection algorithm
+        """
+    ),
+    Endpoint(
+        "get_channel", "POST",
+        params=(Param("channel"), Param("channel_id", None)),
+        idempotent=True,
+        doc="""
+        (Clubhouse, str, int) -> dict
+
+        Get information of the given channel
+        """
+    ),
+    Endpoint(
+        "active_ping", "POST",
+        params=(Param("channel"),),
+        extra={"chanel_id": None},
+        doc="""
+        (Clubhouse, str) -> dict
+
+        Keeping the user active while being in a chatroom
+        """
+    ),
+    Endpoint(
+        "audience_reply", "POST",
+        params=(Param("channel"), Param("raise_hands", True), Param("unraise_hands", False)),
+        doc="""
+        (Clubhouse, str, bool, bool) -> bool
+
+        Request for raise_hands.
+        """
+    ),
+    Endpoint(
+        "change_handraise_settings", "POST",
+        params=(
+            Param("channel"),
+            Param("is_enabled", True),
+            Param("handraise_permission", 1, convert=int),
+        ),
+        doc="""
+        (Clubhouse, bool, int) -> dict
+
+        Change handraise settings. Requires moderator privilege
+
+        * handraise_permission(int)
+           - 1: Everyone
+           - 2: Followed by the speakers
+        * is_enabled(bool)
+           - True: Enable handraise
+           - False: Disable handraise
+        """
+    ),
+    Endpoint(
+        "update_skintone", "POST",
+        params=(Param("skintone", 1, convert=int),),
+        invalidates=("me",),
+        doc="""
+        (Clubhouse, int) -> dict
+        Updating skinetone for raising hands, etc.
+        """
+    ),
+    Endpoint(
+        "get_notifications", "GET",
+        params=(Param("page_size", 20), Param("page", 1)),
+        items="notifications",
+        doc="""
+        (Clubhouse, int, int) -> dict
+
+        Get my notifications.
+        """
+    ),
+    Endpoint(
+        "get_actionable_notifications", "GET",
+        doc="""
+        (Clubhouse, int, int) -> dict
+
+        Get notifications. This may return some notifications that require some actions
+        """
+    ),
+    Endpoint(
+        "get_online_friends", "POST",
+        idempotent=True,
+        cache_ttl=5,
+        max_stale=30,
+        doc="""
+        (Clubhouse) -> dict
+
+        List all online friends.
+        """
+    ),
+    Endpoint(
+        "accept_speaker_invite", "POST",
+        params=(Param("channel"), Param("user_id", convert=int)),
+        doc="""
+        (Clubhouse, str, int) -> dict
+
+        Accept speaker's invitation, based on the (channel, invited_moderator)
+        `raise_hands` needs to be called first, prior to the invitation.
+        """
+    ),
+    Endpoint(
+        "reject_speaker_invite", "POST",
+        params=(Param("channel"), Param("user_id", convert=int)),
+        doc="""
+        (Clubhouse, str, int) -> dict
+
+        Reject speaker's invitation.
+        """
+    ),
+    Endpoint(
+        "invite_speaker", "POST",
+        params=(Param("channel"), Param("user_id", convert=int)),
+        doc="""
+        (Clubhouse, str, int) -> dict
+
+        Move audience to speaker. Requires moderator privilege.
+        """
+    ),
+    Endpoint(
+        "uninvite_speaker", "POST",
+        params=(Param("channel"), Param("user_id", convert=int)),
+        doc="""
+        (Clubhouse, str, int) -> dict
+
+        Move speaker to audience. Requires moderator privilege.
+        """
+    ),
+    Endpoint(
+        "mute_speaker", "POST",
+        params=(Param("channel"), Param("user_id", convert=int)),
+        doc="""
+        (Clubhouse, str, int) -> dict
+
+        Mute speaker. Requires moderator privilege
+        """
+    ),
+    Endpoint(
+        "get_suggested_speakers", "POST",
+        params=(Param("channel"),),
+        idempotent=True,
+        doc="""
+        (Clubhouse, str) -> dict
+
+        Get suggested speakers from the given channel
+        """
+    ),
+    Endpoint(
+        "create_channel", "POST",
+        params=(
+            Param("topic", ""),
+            Param("user_ids", ()),
+            Param("is_private", False),
+            Param("is_social_mode", False),
+        ),
+        extra={"club_id": None, "event_id": None},
+        doc="""
+        (Clubhouse, str, list, bool, bool) -> dict
+
+        Create a new channel. Type of the room can be changed
+        """
+    ),
+    Endpoint(
+        "get_create_channel_targets", "POST",
+        idempotent=True,
+        doc="""
+        (Clubhouse) -> dict
+
+        Not sure what this does. Triggered upon channel creation
+        """
+    ),
+    Endpoint(
+        "get_suggested_invites", "POST",
+        params=(Param("club_id", None), Param("upload_contacts", True), Param("contacts", ())),
+        idempotent=True,
+        doc="""
+        (Clubhouse, int, bool, list of dict) -> dict
+
+        Get invitations and user lists based on phone number.
+
+        contacts(dict)
+            - example: [{"name": "Test Name", "phone_number": "+821043219876"}, ...]
+        """
+    ),
+    Endpoint(
+        "get_suggested_club_invites", "POST",
+        params=(Param("upload_contacts", True), Param("contacts", ())),
+        idempotent=True,
+        doc="""
+        (Clubhouse, int, bool, list of dict) -> dict
+
+        Get user lists based on phone number. For inviting clubs.
+
+        contacts(dict)
+            - example: [{"name": "Test Name", "phone_number": "+821043219876"}, ...]
+        """
+    ),
+    Endpoint(
+        "invite_to_app", "POST",
+        params=(Param("name"), Param("phone_number"), Param("message", None)),
+        doc="""
+        (Clubhouse, str, str, str) -> dict
+
+        Invite users to app. but this only works when you have a leftover invitation.
+        """
+    ),
+    Endpoint(
+        "invite_from_waitlist", "POST",
+        params=(Param("user_id", convert=int),),
+        doc="""
+        (Clubhouse, str, str, str) -> dict
+
+        Invite someone from the waitlist.
+        This is much more reliable than inviting someone by invite_to_app
+        """
+    ),
+    Endpoint(
+        "search_users", "POST",
+        params=(
+            Param("query"),
+            Param("followers_only", False),
+            Param("following_only", False),
+            Param("cofollows_only", False),
+        ),
+        idempotent=True,
+        doc="""
+        (Clubhouse, str, bool, bool, bool) -> dict
+
+        Search users based on the given query.
+        """
+    ),
+    Endpoint(
+        "search_clubs", "POST",
+        params=(
+            Param("query"),
+            Param("followers_only", False),
+            Param("following_only", False),
+            Param("cofollows_only", False),
+        ),
+        idempotent=True,
+        doc="""
+        (Clubhouse, str, bool, bool, bool) -> dict
+
+        Search clubs based on the given query.
+        """
+    ),
+    Endpoint(
+        "get_topic", "POST",
+        params=(Param("topic_id", convert=int),),
+        idempotent=True,
+        cache_ttl=3600,
+        doc="""
+        (Clubhouse, int) -> dict
+
+        Get topic's information based on the given topic id.
+        """
+    ),
+    Endpoint(
+        "get_clubs_for_topic", "GET",
+        params=(Param("topic_id"), Param("page_size", 25), Param("page", 1)),
+        items="clubs",
+        doc="""
+        (Clubhouse, int, int, int) -> dict
+
+        Get list of clubs based on the given topic id.
+        """
+    ),
+    Endpoint(
+        "get_clubs", "POST",
+        params=(Param("is_startable_only"),),
+        idempotent=True,
+        doc="""
+        (Clubhouse, bool) -> dict
+
+        Get list of clubs the user's in.
+        """
+    ),
+    Endpoint(
+        "get_users_for_topic", "GET",
+        params=(Param("topic_id"), Param("page_size", 25), Param("page", 1)),
+        items="users",
+        doc="""
+        (Clubhouse, int, int, int) -> dict
+
+        Get list of users based on the given topic id.
+        """
+    ),
+    Endpoint(
+        "invite_to_existing_channel", "POST",
+        params=(Param("channel"), Param("user_id", convert=int)),
+        doc="""
+        (Clubhouse, str, int) -> dict
+
+        Invite someone to a currently joined channel.
+        It will send a ping notification to the given user_id.
+        """
+    ),
+    Endpoint(
+        "update_username", "POST",
+        params=(Param("username"),),
+        invalidates=("me", "get_profile"),
+        doc="""
+        (Clubhouse, str) -> dict
+
+        Change username. YOU HAVE LIMITED NUMBER OF TRIALS TO CHANGE YOUR USERNAME.
+        """
+    ),
+    Endpoint(
+        "update_name", "POST",
+        params=(Param("name"),),
+        invalidates=("me", "get_profile"),
+        doc="""
+        (Clubhouse, str) -> dict
+
+        Change your legal name. Be careful of what you're trying to enter.
+            (1) Upon registration
+            (2) Changing your legal name. YOU CAN ONLY DO THIS ONCE.
+        """
+    ),
+    Endpoint(
+        "update_twitter_username", "POST",
+        params=(Param("username"), Param("twitter_token"), Param("twitter_secret")),
+        unstable=True,
+        invalidates=("me", "get_profile"),
+        doc="""
+        (Clubhouse, str, str, str) -> dict
+
+        Change Twitter username based on Twitter Token.
+
+        >>> client.update_twitter_username(None, None, None) # Clear username
+        >>> client.update_twitter_username("stereotype32", "...", "...") # Set username
+        """
+    ),
+    Endpoint(
+        "update_instagram_username", "POST",
+        params=(Param("code"),),
+        unstable=True,
+        invalidates=("me", "get_profile"),
+        doc="""
+        (Clubhouse, str) -> dict
+
+        Change Twitter username based on Instagram token.
+
+        >>> client.update_instagram_username(None) # Clear username
+        >>> client.update_instagram_username("...") # Set username
+        """
+    ),
+    Endpoint(
+        "update_displayname", "POST",
+        path="/update_name",
+        params=(Param("name"),),
+        invalidates=("me", "get_profile"),
+        doc="""
+        (Clubhouse, str) -> dict
+
+        Change your nickname. YOU CAN ONLY DO THIS ONCE.
+        """
+    ),
+    Endpoint(
+        "refresh_token", "POST",
+        params=(Param("refresh_token", key="refresh"),),
+        doc="""
+        (Clubhouse, str) -> dict
+
+        Refresh the JWT token. returns both access and refresh token.
+        """
+    ),
+    Endpoint(
+        "update_bio", "POST",
+        params=(Param("bio"),),
+        invalidates=("me", "get_profile"),
+        doc="""
+        (Clubhouse, str) -> dict
+
+        Update bio on your profile
+        """
+    ),
+    Endpoint(
+        "record_action_trails", "POST",
+        params=(Param("action_trails", ()),),
+        doc="""
+        (Clubhouse, list of dict) -> dict
+
+        Recording actions of the user interactions while using the app.
+        action_trails: [{"blob_data":{}, "trail_type": "...", ...}, ...]
+        """
+    ),
+    Endpoint(
+        "add_user_topic", "POST",
+        params=(
+            Param("club_id", None, convert=optional_int),
+            Param("topic_id", None, convert=optional_int),
+        ),
+        invalidates=("me", "get_profile"),
+        doc="""
+        (Clubhouse, int, int) -> dict
+
+        Add user's interest.
+
+        Some interesting flags for Language has been shared in the following link.
+        Reference: https://github.com/grishka/Houseclub/issues/24
+        """
+    ),
+    Endpoint(
+        "remove_user_topic", "POST",
+        params=(Param("club_id", convert=optional_int), Param("topic_id", convert=optional_int)),
+        invalidates=("me", "get_profile"),
+        doc="""
+        (Clubhouse, int, int) -> dict
+
+        Remove user's interest
+        """
+    ),
+    Endpoint(
+        "report_incident", "POST",
+        params=(
+            Param("user_id", convert=int),
+            Param("channel"),
+            Param("incident_type"),
+            Param("incident_description"),
+            Param("email"),
+        ),
+        unstable=True,
+        doc="""
+        (Clubhouse, int, str, unknown, str, str) -> dict
+
+        Report incident
+        There seemed to be a field for attachment, need to trace this later
+        """
+    ),
+    Endpoint(
+        "reject_welcome_channel", "GET",
+        idempotent=False,
+        unstable=True,
+        doc="""
+        (Clubhouse) -> dict
+
+        Unknown
+        """
+    ),
+    Endpoint(
+        "update_channel_flags", "POST",
+        params=(Param("channel"), Param("visibility"), Param("flag_title"), Param("unflag_title")),
+        unstable=True,
+        doc="""
+        (Clubhouse, str, bool, unknown, unknown) -> dict
+
+        Unknown
+        """
+    ),
+    Endpoint(
+        "ignore_actionable_notification", "POST",
+        params=(Param("actionable_notification_id"),),
+        unstable=True,
+        doc="""
+        (Clubhouse, int) -> dict
+
+        Ignore the actionable notification.
+        """
+    ),
+    Endpoint(
+        "invite_to_new_channel", "POST",
+        params=(Param("user_id", convert=int), Param("channel")),
+        unstable=True,
+        doc="""
+        (Clubhouse, int, str) -> dict
+
+        Invite someone to the channel
+        """
+    ),
+    Endpoint(
+        "accept_new_channel_invite", "POST",
+        params=(Param("channel_invite_id"),),
+        unstable=True,
+        doc="""
+        (Clubhouse, int) -> dict
+
+        Accept Channel Invitation
+        """
+    ),
+    Endpoint(
+        "reject_new_channel_invite", "POST",
+        params=(Param("channel_invite_id"),),
+        unstable=True,
+        doc="""
+        (Clubhouse, int) -> dict
+
+        Reject Channel Invitation
+        """
+    ),
+    Endpoint(
+        "cancel_new_channel_invite", "POST",
+        params=(Param("channel_invite_id"),),
+        unstable=True,
+        doc="""
+        (Clubhouse, int) -> dict
+
+        Cancel Channel Invitation
+        """
+    ),
+    Endpoint(
+        "add_club_admin", "POST",
+        params=(Param("club_id", convert=int), Param("user_id", convert=int)),
+        invalidates=("get_club", "get_club_members", "get_club_nominations"),
+        doc="""
+        (Clubhouse, int, int) -> dict
+
+        Add Club Admin. Requires privilege.
+        """
+    ),
+    Endpoint(
+        "remove_club_admin", "POST",
+        params=(Param("club_id", convert=optional_int), Param("user_id", convert=int)),
+        invalidates=("get_club", "get_club_members", "get_club_nominations"),
+        doc="""
+        (Clubhouse, int, int) -> dict
+
+        Remove Club admin. Requires privilege.
+        """
+    ),
+    Endpoint(
+        "remove_club_member", "POST",
+        params=(Param("club_id", convert=optional_int), Param("user_id", convert=int)),
+        invalidates=("get_club", "get_club_members", "get_club_nominations"),
+        doc="""
+        (Clubhouse, int, int) -> dict
+
+        Remove Club member. Requires privilege.
+        """
+    ),
+    Endpoint(
+        "accept_club_member_invite", "POST",
+        params=(
+            Param("club_id", convert=optional_int),
+            Param("source_topic_id", None),
+            Param("invite_code", None),
+        ),
+        extra={"query_id": None, "query_result_position": None, "slug": None},
+        invalidates=("me", "get_club", "get_club_members", "get_clubs"),
+        doc="""
+        (Clubhouse, int, int, str) -> dict
+
+        Accept Club member invite.
+        """
+    ),
+    Endpoint(
+        "add_club_member", "POST",
+        params=(
+            Param("club_id", convert=int),
+            Param("user_id", convert=int),
+            Param("name"),
+            Param("phone_number"),
+            Param("message"),
+            Param("reason"),
+        ),
+        invalidates=("get_club", "get_club_members", "get_club_nominations"),
+        doc="""
+        (Clubhouse, int, int, str, str, str, unknown) -> dict
+
+        Add club member
+        """
+    ),
+    Endpoint(
+        "get_club_nominations", "POST",
+        params=(Param("club_id", convert=int), Param("source_topic_id")),
+        idempotent=True,
+        doc="""
+        (Club, int, int) -> dict
+
+        Get club nomination list
+        """
+    ),
+    Endpoint(
+        "approve_club_nomination", "POST",
+        params=(
+            Param("club_id", convert=int),
+            Param("source_topic_id"),
+            Param("invite_nomination_id"),
+        ),
+        invalidates=("get_club", "get_club_members", "get_club_nominations"),
+        doc="""
+        (Club, int, int) -> dict
+
+        Approve club nomination
+        """
+    ),
+    Endpoint(
+        "reject_club_nomination", "POST",
+        path="/approve_club_nomination",
+        params=(
+            Param("club_id", convert=int),
+            Param("source_topic_id"),
+            Param("invite_nomination_id"),
+        ),
+        invalidates=("get_club", "get_club_members", "get_club_nominations"),
+        doc="""
+        (Club, int, int) -> dict
+
+        Reject club nomination
+        """
+    ),
+    Endpoint(
+        "add_club_topic", "POST",
+        params=(Param("club_id", convert=int), Param("topic_id", convert=int)),
+        invalidates=("get_club", "get_clubs_for_topic"),
+        doc="""
+        (Club, int, int) -> dict
+
+        Add club topic
+        """
+    ),
+    Endpoint(
+        "remove_club_topic", "POST",
+        params=(Param("club_id", convert=int), Param("topic_id", convert=int)),
+        invalidates=("get_club", "get_clubs_for_topic"),
+        doc="""
+        (Club, int, int) -> dict
+
+        Remove club topic
+        """
+    ),
+    Endpoint(
+        "get_events_to_start", "GET",
+        doc="""
+        (Clubhouse) -> dict
+
+        Get events to start
+        """
+    ),
+    Endpoint(
+        "update_is_follow_allowed", "POST",
+        params=(Param("club_id", convert=int), Param("is_follow_allowed", True)),
+        invalidates=("get_club",),
+        doc="""
+        (Clubhouse, int, bool) -> dict
+
+        Update follow button of the given Club
+        """
+    ),
+    Endpoint(
+        "update_is_membership_private", "POST",
+        params=(Param("club_id", convert=int), Param("is_membership_private", False)),
+        invalidates=("get_club",),
+        doc="""
+        (Clubhouse, int, bool) -> dict
+
+        Update club membership status of the given Club
+        If True, member list will not be shown to public.
+        """
+    ),
+    Endpoint(
+        "update_is_community", "POST",
+        params=(Param("club_id", convert=int), Param("is_community", False)),
+        invalidates=("get_club",),
+        doc="""
+        (Clubhouse, int, bool) -> dict
+
+        Change room start permission. If set False, Admins can only start club rooms.
+        """
+    ),
+    Endpoint(
+        "update_club_description", "POST",
+        params=(Param("club_id", convert=int), Param("description")),
+        invalidates=("get_club",),
+        doc="""
+        (Clubhouse, int, str) -> dict
+
+        Update description of the given Club
+        """
+    ),
+    Endpoint(
+        "update_club_rules", "POST",
+        params=(Param("club_id", "", convert=int), Param("rules", (), convert=list_or_empty)),
+        invalidates=("get_club",),
+        doc="""
+        (Clubhouse, str, list) -> dict
+
+        Update Club's rules (Maximum upto 3 rules)
+        rules: [{'desc': "text", "title": "text"}, ...]
+        """
+    ),
+    Endpoint(
+        "get_events_for_user", "GET",
+        params=(Param("user_id", ""), Param("page_size", 25), Param("page", 1)),
+        items="events",
+        doc="""
+        (Clubhouse, str, int, int) -> dict
+
+        Get events for the specific user.
+        """
+    ),
+)}
@@ -0,0 +1,73 @@
+#!/usr/bin/python -u
+#-*- coding: utf-8 -*-
+
+"""
+exceptions.py
+
+Exceptions raised by the Clubhouse client.
+"""
+
+class ClubhouseError(Exception):
+    """
+    Base class of every error raised by the client.
+
+    `response` is the HTTP response that caused the error, if any.
+    """
+
+    def __init__(self, message, response=None):
+        super().__init__(message)
+        self.response = response
+
+    @property
+    def status_code(self):
+        """ (ClubhouseError) -> int
+        HTTP status of the response, or None.
+        """
+        return self.response.status_code if self.response is not None else None
+
+class AuthenticationError(ClubhouseError):
+    """
+    The client isn't (or is already) authenticated for the endpoint,
+    or the server refused the credentials. (401, 403)
+    """
+
+class RateLimitedError(ClubhouseError):
+    """
+    The server is rate limiting the client. (429)
+    `retry_after` is the number of seconds it asked to wait, or None.
+    """
+
+    def __init__(self, message, response=None, retry_after=None):
+        super().__init__(message, response)
+        self.retry_after = retry_after
+
+class NotFoundError(ClubhouseError):
+    """
+    The endpoint or the requested object doesn't exist. (404)
+    """
+
+class ServerError(ClubhouseError):
+    """
+    The server failed to handle the request. (5xx)
+    """
+
+class ResponseError(ClubhouseError):
+    """
+    Any other response that isn't a valid JSON document.
+    """
+
+class CircuitOpenError(ClubhouseError):
+    """
+    The endpoint failed too often recently, so the call was refused
+    without sending it. `retry_after` is the number of seconds until
+    the circuit breaker lets a request through again.
+    """
+
+    def __init__(self, message, retry_after=None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+class DeadlineExceeded(ClubhouseError, TimeoutError):
+    """
+    The deadline of the call passed before it could finish.
+    """
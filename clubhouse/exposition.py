@@ -0,0 +1,303 @@
+#!/usr/bin/python -u
+#-*- coding: utf-8 -*-
+
+"""
+exposition.py
+
+Export the metrics of clients in the OpenMetrics / Prometheus text format,
+from a local HTTP endpoint or to a file for node_exporter's textfile collector.
+
+Nothing is computed until a scrape or a write asks for it.
+"""
+
+import os
+import time
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+OPENMETRICS_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+TEXT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Label of the entries of components whose stats are keyed by name.
+_COMPONENT_LABELS = {"breaker": "endpoint", "rate_limit": "rate_class"}
+
+class ThreadHealth:
+    """
+    ThreadHealth Class
+
+    Liveness of long-running background threads, like periodic loops.
+    A thread registers itself under a name, then reports each run.
+    The exporter shows whether it's alive, its runs and failures,
+    and when it last ran.
+
+    >>> THREADS.register("ping")
+    >>> while not stopped.wait(30):
+    ...     THREADS.ran("ping", ok=ping())
+    >>> THREADS.unregister("ping")
+    """
+
+    def __init__(self):
+        self._threads = {}
+        self._lock = threading.Lock()
+
+    def register(self, name, thread=None):
+        """ (ThreadHealth, str, threading.Thread) -> NoneType
+        Watch the thread, the calling one by default, replacing any under the same name.
+        """
+        with self._lock:
+            self._threads[name] = {
+                "thread": thread or threading.current_thread(),
+                "runs": 0,
+                "failures": 0,
+                "last_run": None,
+            }
+
+    def ran(self, name, ok=True):
+        """ (ThreadHealth, str, bool) -> NoneType
+        Report a run of the thread, and whether it succeeded.
+        """
+        with self._lock:
+            entry = self._threads.get(name)
+            if entry is None:
+                return
+            entry["runs"] += 1
+            if not ok:
+                entry["failures"] += 1
+            entry["last_run"] = time.time()
+
+    def unregister(self, name):
+        """ (ThreadHealth, str) -> NoneType
+        Stop watching the thread, once it's done on purpose.
+        """
+        with self._lock:
+            self._threads.pop(name, None)
+
+    def stats(self):
+        """ (ThreadHealth) -> dict
+
+        Whether each thread is alive, its runs and failures so far,
+        and the time of its last run (time.time), None before the first.
+        """
+        with self._lock:
+            return {
+                name: {
+                    "alive": entry["thread"].is_alive(),
+                    "runs": entry["runs"],
+                    "failures": entry["failures"],
+                    "last_run": entry["last_run"],
+                }
+                for name, entry in self._threads.items()
+            }
+
+# Threads of the process, shown by every exporter unless told otherwise.
+THREADS = ThreadHealth()
+
+def _escape(value):
+    """ (object) -> str
+    Label value, escaped.
+    """
+    return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+def _number(value):
+    """ (object) -> str """
+    if isinstance(value, float):
+        return repr(value) if value == value else "NaN"
+    return str(int(value))
+
+class _Family:
+    """
+    Samples of a metric family, before formatting.
+    """
+
+    __slots__ = ("name", "type", "help", "samples")
+
+    def __init__(self, name, type_, help_):
+        self.name = name
+        self.type = type_
+        self.help = help_
+        # (suffix, labels, value)
+        self.samples = []
+
+    def add(self, labels, value, suffix=""):
+        self.samples.append((suffix, labels, value))
+
+class OpenMetricsExporter:
+    """
+    OpenMetricsExporter Class
+
+    Metrics of one or more clients, with the health of `threads`:
+        - per endpoint: calls, errors, cache hits, requests by status code,
+          retries, bytes sent and received, and call and request latencies
+          as summaries (p50/p95/p99)
+        - connections of each pool, in use and idle, and the pool size
+        - the stats of the cache, rate limiter, breakers, etc. when enabled
+        - background threads: up, runs, failures, and the last run
+
+    Every sample has a `client` label, the name the client was added with.
+
+    >>> exporter = OpenMetricsExporter(clubhouse)
+    >>> exporter.serve(9464)   # GET http://127.0.0.1:9464/metrics
+    >>> exporter.write("/var/lib/node_exporter/clubhouse.prom")
+    """
+
+    def __init__(self, *clients, threads=THREADS, namespace="clubhouse"):
+        """ (OpenMetricsExporter, Clubhouse..., ThreadHealth, str) -> NoneType """
+        self.threads = threads
+        self.namespace = namespace
+        self._clients = {}
+        self._server = None
+        for client in clients:
+            self.add(client)
+
+    def add(self, client, name=None):
+        """ (OpenMetricsExporter, Clubhouse, str) -> NoneType
+        Export the client's metrics too, labelled with `name`,
+        or its position among the clients.
+        """
+        self._clients[name or str(len(self._clients))] = client
+
+    def remove(self, name):
+        """ (OpenMetricsExporter, str) -> NoneType """
+        self._clients.pop(name, None)
+
+    def collect(self):
+        """ (OpenMetricsExporter) -> list
+        Gather the metric families from the clients and threads.
+        """
+        ns = self.namespace
+        families = {}
+        def family(name, type_, help_):
+            if name not in families:
+                families[name] = _Family(f"{ns}_{name}", type_, help_)
+            return families[name]
+
+        for client_name, client in list(self._clients.items()):
+            stats = client.stats()
+            for endpoint, counters in stats.pop("endpoints").items():
+                labels = {"client": client_name, "endpoint": endpoint}
+                family("calls", "counter", "Endpoint method calls.").add(labels, counters["calls"], "_total")
+                family("call_errors", "counter", "Endpoint method calls that raised.").add(labels, counters["errors"], "_total")
+                family("call_cache_hits", "counter", "Calls answered from the response cache.").add(labels, counters["cache_hits"], "_total")
+                family("retries", "counter", "Requests retried.").add(labels, counters["retries"], "_total")
+                family("sent_bytes", "counter", "Request body bytes sent.").add(labels, counters["bytes_sent"], "_total")
+                family("received_bytes", "counter", "Response body bytes received.").add(labels, counters["bytes_received"], "_total")
+                requests = family("requests", "counter", "HTTP requests by status code; \"none\" for connection errors.")
+                for status, count in counters["status"].items():
+                    requests.add(dict(labels, status=status or "none"), count, "_total")
+                for name, key, help_ in (
+                        ("call_duration_seconds", "latency", "Duration of endpoint method calls, retries included."),
+                        ("request_duration_seconds", "network", "Duration of each HTTP request.")):
+                    summary = family(name, "summary", help_)
+                    snapshot = counters[key]
+                    for quantile in ("0.5", "0.95", "0.99"):
+                        summary.add(dict(labels, quantile=quantile), snapshot["p" + str(round(float(quantile) * 100))])
+                    summary.add(labels, snapshot["sum"], "_sum")
+                    summary.add(labels, counters["calls"] if key == "latency" else counters["requests"], "_count")
+
+            for origin, pool in stats.pop("pool").items():
+                labels = {"client": client_name, "origin": origin}
+                connections = family("pool_connections", "gauge", "Pooled connections, in use or idle.")
+                connections.add(dict(labels, state="in_use"), pool["in_use"])
+                connections.add(dict(labels, state="idle"), pool["idle"])
+                if pool["max"] is not None:
+                    family("pool_max_connections", "gauge", "Size of the connection pool.").add(labels, pool["max"])
+
+            for component, values in stats.items():
+                label = _COMPONENT_LABELS.get(component)
+                entries = values.items() if label else ((None, values),)
+                for entry, fields in entries:
+                    labels = {"client": client_name}
+                    if label:
+                        labels[label] = entry
+                    for key, value in fields.items():
+                        if isinstance(value, (int, float)):
+                            family(f"{component}_{key}", "unknown", f"{key} of {component}.stats().").add(labels, value)
+                        elif isinstance(value, str):
+                            family(f"{component}_{key}", "gauge", f"{key} of {component}.stats(), as a label.").add(dict(labels, **{key: value}), 1)
+
+        for name, entry in self.threads.stats().items():
+            labels = {"thread": name}
+            family("thread_up", "gauge", "Whether the background thread is alive.").add(labels, entry["alive"])
+            family("thread_runs", "counter", "Runs of the background thread.").add(labels, entry["runs"], "_total")
+            family("thread_failures", "counter", "Failed runs of the background thread.").add(labels, entry["failures"], "_total")
+            if entry["last_run"] is not None:
+                family("thread_last_run_timestamp_seconds", "gauge", "Time of the last run of the background thread.").add(labels, entry["last_run"])
+        return list(families.values())
+
+    def render(self, openmetrics=True):
+        """ (OpenMetricsExporter, bool) -> str
+
+        Metrics in the OpenMetrics text format, or in the older Prometheus
+        text format (0.0.4), which node_exporter's textfile collector reads.
+        """
+        lines = []
+        for family in self.collect():
+            name, type_ = family.name, family.type
+            if not openmetrics:
+                # The older format names counters after their samples.
+                if type_ == "counter":
+                    name += "_total"
+                type_ = "untyped" if type_ == "unknown" else type_
+            lines.append(f"# TYPE {name} {type_}")
+            lines.append(f"# HELP {name} {family.help}")
+            for suffix, labels, value in family.samples:
+                sample = family.name + suffix
+                if labels:
+                    sample += "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels.items()) + "}"
+                lines.append(f"{sample} {_number(value)}")
+        if openmetrics:
+            lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+
+    def write(self, path):
+        """ (OpenMetricsExporter, str) -> NoneType
+        Write the metrics in the Prometheus text format, replacing the file
+        at once so a collector never reads half of it.
+        """
+        temporary = f"{path}.{os.getpid()}.tmp"
+        with open(temporary, "w") as metrics_file:
+            metrics_file.write(self.render(openmetrics=False))
+        os.replace(temporary, path)
+
+    def serve(self, port=9464, host="127.0.0.1"):
+        """ (OpenMetricsExporter, int, str) -> tuple
+
+        Serve the metrics on http://host:port/metrics from a daemon thread,
+        in OpenMetrics when the scraper accepts it. Returns the (host, port)
+        listened on; pass port 0 to pick a free port.
+        """
+        exporter = self
+
+        class Handler(BaseHTTPRequestHandler):
+            """ Answers GET /metrics. """
+
+            def log_message(self, *args): # pylint: disable=arguments-differ
+                pass
+
+            def do_GET(self): # pylint: disable=invalid-name
+                if self.path.split("?")[0] not in ("/", "/metrics"):
+                    self.send_error(404)
+                    return
+                openmetrics = "application/openmetrics-text" in self.headers.get("Accept", "")
+                body = exporter.render(openmetrics).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", OPENMETRICS_TYPE if openmetrics else TEXT_TYPE)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        self.close()
+        server = ThreadingHTTPServer((host, port), Handler)
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, name="clubhouse-metrics", daemon=True).start()
+        self._server = server
+        return server.server_address[:2]
+
+    def close(self):
+        """ (OpenMetricsExporter) -> NoneType
+        Stop serving the metrics.
+        """
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
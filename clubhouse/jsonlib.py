@@ -0,0 +1,66 @@
+#!/usr/bin/python -u
+#-*- coding: utf-8 -*-
+
+"""
+jsonlib.py
+
+JSON encoding and decoding of request and response bodies.
+
+Uses orjson or ujson when one of them is installed (pip install orjson),
+and the standard library otherwise.
+Both functions work on bytes, so bodies are never copied into a str.
+"""
+
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ujson
+except ImportError:
+    ujson = None
+
+def _json_dumps(obj):
+    """ (object) -> bytes """
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode()
+
+def _ujson_dumps(obj):
+    """ (object) -> bytes """
+    return ujson.dumps(obj, ensure_ascii=False).encode()
+
+def _backends():
+    """ () -> dict
+    Available backends, as {name: (loads, dumps)}, fastest first.
+    """
+    backends = {}
+    if orjson is not None:
+        backends["orjson"] = (orjson.loads, orjson.dumps)
+    if ujson is not None:
+        backends["ujson"] = (ujson.loads, _ujson_dumps)
+    backends["json"] = (json.loads, _json_dumps)
+    return backends
+
+BACKENDS = _backends()
+
+BACKEND = None
+loads = None
+dumps = None
+
+def use(name=None):
+    """ (str) -> NoneType
+
+    Switch the backend used by every client: "orjson", "ujson" or "json".
+    None picks the fastest one installed.
+    """
+    global BACKEND, loads, dumps # pylint: disable=global-statement
+    if name is None:
+        name = next(iter(BACKENDS))
+    if name not in BACKENDS:
+        raise ValueError(f"JSON backend {name} is not installed (choose from {', '.join(BACKENDS)})")
+    BACKEND = name
+    loads, dumps = BACKENDS[name]
+
+use()
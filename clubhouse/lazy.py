@@ -0,0 +1,336 @@
+#!/usr/bin/python -u
+#-*- coding: utf-8 -*-
+
+"""
+lazy.py
+
+Lazy views over the raw bytes of a response, used by `Clubhouse(lazy=True)`.
+
+Nothing is decoded up front. Reading a key decodes the response only as
+far as that key, and arrays are decoded one element at a time while
+iterating, so a large `users` array never exists as a list of dicts.
+The views share the response bytes; only the span being decoded is copied.
+
+Scanning JSON byte by byte in Python is slower than decoding it with
+orjson. The end of an element of an array is first guessed as the first
+`}` that could close it, which is right for objects with no object inside,
+and checked by decoding it. Otherwise, and for values skipped on the way
+to a key, the end is found with a regex jumping from bracket to bracket
+over everything else, strings included, and counting their depth;
+skipped values are only decoded when they're read.
+"""
+
+import re
+import itertools
+from collections.abc import Mapping, Sequence
+from clubhouse import jsonlib
+
+_STRING = rb'"[^"\\]*(?:\\.[^"\\]*)*"'
+
+# A key and its colon, up to the value
+_MEMBER = re.compile(rb'\s*(' + _STRING + rb')\s*:\s*', re.S)
+_SCALAR = re.compile(_STRING + rb'|[^\s,\]}]+', re.S)
+# A `}` that could end an object, followed by what may come after a value
+_CLOSER = re.compile(rb'\}(?=\s*(?:[,\]}]|\Z))')
+# Anything up to the next bracket outside strings. Ends at a `"` that
+# starts no whole string, or at the end, when the value is cut short.
+_BRACKET = re.compile(rb'(?:[^"{}\[\]]+|' + _STRING + rb')*(?:([{}\[\]])|"|\Z)', re.S)
+_SEPARATOR = re.compile(rb'\s*([,\]}])\s*')
+_SPACE = re.compile(rb'\s*')
+
+def _close(content, pos):
+    """ (bytes, int) -> int
+    End of the object or array starting at `pos`, not checking what's inside.
+    """
+    match = _BRACKET.match
+    depth = 0
+    while True:
+        bracket = match(content, pos)
+        pos = bracket.end()
+        bracket = bracket.group(1)
+        if bracket is None:
+            raise ValueError(f"Invalid JSON value at {pos}")
+        if bracket == b"{" or bracket == b"[":
+            depth += 1
+        else:
+            depth -= 1
+            if depth == 0:
+                return pos
+
+def _object(content, pos):
+    """ (bytes, int) -> (dict, int)
+    Decode the object starting at `pos`, and find its end.
+    """
+    match = _CLOSER.search(content, pos)
+    if match is not None:
+        try:
+            return jsonlib.loads(content[pos:match.end()]), match.end()
+        except ValueError:
+            pass
+    end = _close(content, pos)
+    return jsonlib.loads(content[pos:end]), end
+
+def _array(content, pos):
+    """ (bytes, int) -> generator
+    Yield (start, end) of the elements of the array starting at `pos`,
+    and return the end of the array.
+    """
+    pos = _SPACE.match(content, pos + 1).end()
+    if content[pos:pos + 1] == b"]":
+        return pos + 1
+    while True:
+        end = _skip(content, pos)
+        yield pos, end
+        match = _SEPARATOR.match(content, end)
+        if match is None or match.group(1) == b"}":
+            raise ValueError(f"Invalid JSON array at {end}")
+        if match.group(1) == b"]":
+            return match.end(1)
+        pos = match.end()
+
+def _skip(content, pos):
+    """ (bytes, int) -> int
+    End of the JSON value starting at `pos`.
+    """
+    if content[pos] in (0x7b, 0x5b): # { [
+        return _close(content, pos)
+    match = _SCALAR.match(content, pos)
+    if match is None:
+        raise ValueError(f"Invalid JSON value at {pos}")
+    return match.end()
+
+def _leading(index):
+    """ (object) -> bool
+    Whether an index or slice only needs the elements up to some position.
+    """
+    if isinstance(index, slice):
+        return (index.step in (None, 1) and index.stop is not None
+                and (index.start or 0) >= 0 and index.stop >= 0)
+    return isinstance(index, int) and index >= 0
+
+class LazyObject(Mapping):
+    """
+    LazyObject Class
+
+    Read-only mapping over the JSON object of a response.
+    Keys are found as far as needed on first access, and each value is
+    decoded the first time it's read. Arrays are returned as a LazyList.
+
+    `convert(key, value)` is applied to every decoded value,
+    e.g. `clubhouse.models.convert_field`.
+
+    >>> channel = LazyObject(response.content)
+    >>> channel["channel_id"]
+    12345
+    >>> for user in channel["users"]:
+    ...     print(user["username"])
+    """
+
+    __slots__ = ("_content", "_convert", "_pos", "_pending", "_spans", "_values")
+
+    def __init__(self, content, convert=None):
+        """ (LazyObject, bytes, function) -> NoneType """
+        start = _SPACE.match(content).end()
+        if content[start:start + 1] != b"{":
+            raise ValueError("Response is not a JSON object")
+        self._content = content
+        self._convert = convert
+        self._spans = {}
+        self._values = {}
+        # Key and start of an array read before its end was needed
+        self._pending = None
+        # Position of the next key to read, or None once they're all read
+        self._pos = _SPACE.match(content, start + 1).end()
+        if content[self._pos:self._pos + 1] == b"}":
+            self._pos = None
+
+    def _scan(self, until=None):
+        """ (LazyObject, str) -> NoneType
+        Read keys until the given one, or to the end.
+        """
+        content = self._content
+        if self._pending is not None:
+            key, start = self._pending
+            self._pending = None
+            end = _skip(content, start)
+            self._spans[key] = (start, end)
+            self._pos = self._next(end)
+        pos = self._pos
+        while pos is not None:
+            match = _MEMBER.match(content, pos)
+            if match is None:
+                raise ValueError(f"Invalid JSON key at {pos}")
+            key = jsonlib.loads(match.group(1))
+            start = match.end()
+            if key == until and content[start] == 0x5b:
+                # Iterating the array doesn't need its end
+                self._spans[key] = (start, None)
+                self._pending = (key, start)
+                return
+            end = _skip(content, start)
+            self._spans[key] = (start, end)
+            pos = self._pos = self._next(end)
+            if key == until:
+                return
+
+    def _next(self, end):
+        """ (LazyObject, int) -> int
+        Position of the key after the value ending at `end`, or None after the last one.
+        """
+        match = _SEPARATOR.match(self._content, end)
+        if match is None or match.group(1) == b"]":
+            raise ValueError(f"Invalid JSON object at {end}")
+        return match.end() if match.group(1) == b"," else None
+
+    def _load(self, key, value):
+        """ (LazyObject, str, object) -> object """
+        return self._convert(key, value) if self._convert is not None else value
+
+    def __getitem__(self, key):
+        try:
+            return self._values[key]
+        except KeyError:
+            pass
+        if key not in self._spans:
+            self._scan(key)
+        start, end = self._spans[key]
+        if self._content[start] == 0x5b:
+            value = LazyList(self._content, start, end, key, self._convert)
+        else:
+            value = self._load(key, jsonlib.loads(self._content[start:end]))
+        self._values[key] = value
+        return value
+
+    def __contains__(self, key):
+        if key not in self._spans:
+            self._scan(key)
+        return key in self._spans
+
+    def __iter__(self):
+        self._scan()
+        return iter(self._spans)
+
+    def __len__(self):
+        self._scan()
+        return len(self._spans)
+
+    def raw(self, key=None):
+        """ (LazyObject, str) -> bytes
+        Undecoded JSON of a value, or of the whole response.
+        """
+        if key is None:
+            return self._content
+        value = self[key]
+        if isinstance(value, LazyList):
+            return value.raw()
+        start, end = self._spans[key]
+        return self._content[start:end]
+
+    def to_dict(self):
+        """ (LazyObject) -> dict
+        Decode the whole response.
+        """
+        return {key: self._load(key, value) for key, value in jsonlib.loads(self._content).items()}
+
+    def __repr__(self):
+        return f"LazyObject({list(self)})"
+
+class LazyList(Sequence):
+    """
+    LazyList Class
+
+    Read-only sequence over a JSON array of a response.
+    Iterating decodes one element at a time and keeps none of them,
+    so only the element being looked at is in memory, and stopping early
+    skips the rest. Indexing decodes the element again on every access;
+    keep what you need.
+    """
+
+    __slots__ = ("_content", "_start", "_end", "_key", "_convert", "_spans")
+
+    def __init__(self, content, start, end, key=None, convert=None):
+        """ (LazyList, bytes, int, int, str, function) -> NoneType """
+        self._content = content
+        self._start = start
+        self._end = end
+        self._key = key
+        self._convert = convert
+        self._spans = None
+
+    def _index(self):
+        """ (LazyList) -> list
+        Span of every element, as [(start, end)].
+        """
+        if self._spans is None:
+            self._spans = list(_array(self._content, self._start))
+        return self._spans
+
+    def _load(self, value):
+        """ (LazyList, object) -> object """
+        return self._convert(self._key, value) if self._convert is not None else value
+
+    def __getitem__(self, index):
+        content = self._content
+        if self._spans is None and _leading(index):
+            # Decode up to the last element asked for, without finding the others
+            if isinstance(index, slice):
+                return list(itertools.islice(self, index.start, index.stop))
+            for value in itertools.islice(self, index, None):
+                return value
+            raise IndexError("LazyList index out of range")
+        if isinstance(index, slice):
+            return [self._load(jsonlib.loads(content[start:end])) for start, end in self._index()[index]]
+        start, end = self._index()[index]
+        return self._load(jsonlib.loads(content[start:end]))
+
+    def __iter__(self):
+        content = self._content
+        if self._spans is not None:
+            for start, end in self._spans:
+                yield self._load(jsonlib.loads(content[start:end]))
+            return
+        pos = _SPACE.match(content, self._start + 1).end()
+        if content[pos:pos + 1] == b"]":
+            return
+        while True:
+            if content[pos] == 0x7b:
+                value, end = _object(content, pos)
+            else:
+                end = _skip(content, pos)
+                value = jsonlib.loads(content[pos:end])
+            yield self._load(value)
+            match = _SEPARATOR.match(content, end)
+            if match is None or match.group(1) != b",":
+                return
+            pos = match.end()
+
+    def __len__(self):
+        return len(self._index())
+
+    def __bool__(self):
+        pos = _SPACE.match(self._content, self._start + 1).end()
+        return self._content[pos:pos + 1] != b"]"
+
+    def __eq__(self, other):
+        if isinstance(other, (list, LazyList)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    __hash__ = None
+
+    def raw(self):
+        """ (LazyList) -> bytes
+        Undecoded JSON of the array.
+        """
+        if self._end is None:
+            self._end = _skip(self._content, self._start)
+        return self._content[self._start:self._end]
+
+    def to_list(self):
+        """ (LazyList) -> list
+        Decode the whole array.
+        """
+        return self._load(jsonlib.loads(self.raw()))
+
+    def __repr__(self):
+        return f"LazyList({len(self)} items)"
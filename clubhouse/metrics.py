@@ -0,0 +1,212 @@
+#!/usr/bin/python -u
+#-*- coding: utf-8 -*-
+
+"""
+metrics.py
+
+Per-endpoint metrics of the calls of a client, used by `Clubhouse.stats()`.
+
+Recording a call costs a lock and a few additions, so metrics can stay on
+in production; see `python3 benchmark.py metrics`.
+"""
+
+import math
+import threading
+from collections import Counter
+
+# Latency histogram buckets grow by 10% from 10 µs, up to about 10 minutes,
+# so quantiles are within 10% of the actual latency.
+_LOW = 1e-5
+_GROWTH = 1.1
+_SCALE = 1 / math.log(_GROWTH)
+_BUCKETS = int(math.log(600 / _LOW) * _SCALE) + 2
+
+QUANTILES = (0.5, 0.95, 0.99)
+
+class Histogram:
+    """
+    Histogram Class
+
+    Latencies in seconds, counted in buckets growing by 10%.
+    """
+
+    __slots__ = ("counts", "count", "sum", "max")
+
+    def __init__(self):
+        self.counts = [0] * _BUCKETS
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def add(self, seconds):
+        """ (Histogram, float) -> NoneType """
+        index = int(math.log(seconds / _LOW) * _SCALE) + 1 if seconds > _LOW else 0
+        self.counts[index if index < _BUCKETS else _BUCKETS - 1] += 1
+        self.count += 1
+        self.sum += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def quantile(self, q):
+        """ (Histogram, float) -> float
+        Upper bound of the bucket of the given quantile, like 0.99.
+        """
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank and count:
+                return min(_LOW * _GROWTH ** index, self.max)
+        return self.max
+
+    def snapshot(self):
+        """ (Histogram) -> dict """
+        ret = {f"p{round(q * 100)}": self.quantile(q) for q in QUANTILES}
+        ret["mean"] = self.sum / self.count if self.count else 0.0
+        ret["max"] = self.max
+        ret["sum"] = self.sum
+        return ret
+
+class _Endpoint:
+    """
+    Counters of an endpoint.
+    """
+
+    __slots__ = ("calls", "errors", "cache_hits", "requests", "retries", "bytes_sent",
+                 "bytes_received", "status", "latency", "network")
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.cache_hits = 0
+        self.requests = 0
+        self.retries = 0
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.status = Counter()
+        # Whole calls, and each HTTP request of them
+        self.latency = Histogram()
+        self.network = Histogram()
+
+class Metrics:
+    """
+    Metrics Class
+
+    Counts, per endpoint, calls and their latency, HTTP requests and their
+    status codes and latency, bytes sent and received, retries, cache hits
+    and calls that raised. A Metrics can be shared by several clients.
+
+    Every callable in `observers` is also called with each event, as a dict:
+        - {"type": "call", "endpoint", "seconds", "cached", "error", "bytes_received"}
+          when a call returns or raises, `error` being the exception or None.
+          `bytes_received` only counts streamed responses.
+        - {"type": "request", "endpoint", "status", "seconds", "bytes_sent", "bytes_received"}
+          for each HTTP request, `status` being None for a connection error.
+        - {"type": "retry", "endpoint", "delay"} before a request is retried.
+    Observers run in the calling thread, and should return quickly.
+    Exceptions they raise are counted, and otherwise ignored.
+
+    >>> clubhouse = Clubhouse(user_id, user_token, user_device)
+    >>> clubhouse.metrics.observers.append(print)
+    >>> clubhouse.stats()["endpoints"]["get_feed"]["latency"]
+    {'p50': 0.213, 'p95': 0.412, 'p99': 0.498, 'mean': 0.236, 'max': 0.511, 'sum': 2.36}
+    """
+
+    def __init__(self):
+        self.observers = []
+        self.observer_errors = 0
+        self._endpoints = {}
+        self._lock = threading.Lock()
+
+    def _endpoint(self, name):
+        """ (Metrics, str) -> _Endpoint
+        Counters of the endpoint. The lock must be held.
+        """
+        counters = self._endpoints.get(name)
+        if counters is None:
+            counters = self._endpoints[name] = _Endpoint()
+        return counters
+
+    def call(self, endpoint, seconds, cached=False, error=None, received=0):
+        """ (Metrics, str, float, bool, Exception, int) -> NoneType
+        Record a call to the endpoint. `received` is the size of a streamed
+        response body, which its request didn't count.
+        """
+        with self._lock:
+            counters = self._endpoint(endpoint)
+            counters.calls += 1
+            counters.latency.add(seconds)
+            counters.bytes_received += received
+            if cached:
+                counters.cache_hits += 1
+            if error is not None:
+                counters.errors += 1
+        if self.observers:
+            self._notify({"type": "call", "endpoint": endpoint, "seconds": seconds,
+                          "cached": cached, "error": error, "bytes_received": received})
+
+    def request(self, endpoint, status, seconds, sent=0, received=0):
+        """ (Metrics, str, int, float, int, int) -> NoneType
+        Record an HTTP request to the endpoint, with a None status for a connection error.
+        """
+        with self._lock:
+            counters = self._endpoint(endpoint)
+            counters.requests += 1
+            counters.network.add(seconds)
+            counters.bytes_sent += sent
+            counters.bytes_received += received
+            counters.status[status] += 1
+        if self.observers:
+            self._notify({"type": "request", "endpoint": endpoint, "status": status,
+                          "seconds": seconds, "bytes_sent": sent, "bytes_received": received})
+
+    def retry(self, endpoint, delay):
+        """ (Metrics, str, float) -> NoneType
+        Record that a request to the endpoint is retried after `delay` seconds.
+        """
+        with self._lock:
+            self._endpoint(endpoint).retries += 1
+        if self.observers:
+            self._notify({"type": "retry", "endpoint": endpoint, "delay": delay})
+
+    def _notify(self, event):
+        """ (Metrics, dict) -> NoneType """
+        for observer in list(self.observers):
+            try:
+                observer(event)
+            except Exception: # pylint: disable=broad-except
+                with self._lock:
+                    self.observer_errors += 1
+
+    def stats(self):
+        """ (Metrics) -> dict
+
+        Counters and latency quantiles of every endpoint called so far.
+        Status codes are keyed by code, and None for connection errors.
+        """
+        with self._lock:
+            return {
+                name: {
+                    "calls": counters.calls,
+                    "errors": counters.errors,
+                    "cache_hits": counters.cache_hits,
+                    "requests": counters.requests,
+                    "retries": counters.retries,
+                    "bytes_sent": counters.bytes_sent,
+                    "bytes_received": counters.bytes_received,
+                    "status": dict(counters.status),
+                    "latency": counters.latency.snapshot(),
+                    "network": counters.network.snapshot(),
+                }
+                for name, counters in self._endpoints.items()
+            }
+
+    def reset(self):
+        """ (Metrics) -> NoneType
+        Forget everything recorded so far.
+        """
+        with self._lock:
+            self._endpoints.clear()
+            self.observer_errors = 0
@@ -0,0 +1,324 @@
+#!/usr/bin/python -u
+#-*- coding: utf-8 -*-
+# pylint: disable=line-too-long,too-many-instance-attributes,attribute-defined-outside-init
+# Generated by generate_models.py from openapi.yaml. Do not edit.
+
+"""
+models.py
+
+Compact response models, used by `Clubhouse(typed=True)`.
+
+Each model keeps its fields in `__slots__` instead of a dict.
+Fields missing from a response are None, and fields unknown to openapi.yaml
+are kept in `extra` and can be read as attributes too.
+"""
+
+def _convert(model, value):
+    """ (type, object) -> object
+    Turn a dict, or the dicts of a list, into the given model.
+    """
+    if isinstance(value, dict):
+        return model.from_dict(value)
+    if isinstance(value, list):
+        return [model.from_dict(item) if isinstance(item, dict) else item for item in value]
+    return value
+
+class Model:
+    """
+    Base class of the response models.
+    """
+
+    __slots__ = ("extra",)
+    FIELDS = frozenset()
+    REPR = ()
+
+    def __getattr__(self, name):
+        extra = object.__getattribute__(self, "extra")
+        if extra and name in extra:
+            return extra[name]
+        raise AttributeError(f"{type(self).__name__} has no field {name}")
+
+    def _extra(self, data):
+        """ (Model, dict) -> NoneType
+        Keep the fields that are not in FIELDS.
+        """
+        self.extra = None if self.FIELDS.issuperset(data) else {
+            key: value for key, value in data.items() if key not in self.FIELDS
+        }
+
+    def to_dict(self):
+        """ (Model) -> dict
+        Back to the dict of the response.
+        """
+        ret = {}
+        for name in self.__slots__:
+            value = getattr(self, name)
+            if isinstance(value, Model):
+                value = value.to_dict()
+            elif isinstance(value, list):
+                value = [item.to_dict() if isinstance(item, Model) else item for item in value]
+            ret[name] = value
+        ret.update(self.extra or {})
+        return ret
+
+    def __eq__(self, other):
+        return type(self) is type(other) and self.to_dict() == other.to_dict()
+
+    def __repr__(self):
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.REPR)
+        return f"{type(self).__name__}({fields})"
+
+
+class User(Model):
+    """
+    User from `users`, `user_profile`, `invited_by_user_profile`, `hosts`, `mutual_follows` of a response.
+    """
+
+    __slots__ = (
+        'bio', 'can_edit_displayname', 'can_edit_name', 'can_edit_username', 'clubs',
+        'displayname', 'first_name', 'follows_me', 'has_verified_email', 'instagram',
+        'invited_by_user_profile', 'is_blocked_by_network', 'is_followed_by_speaker',
+        'is_invited_as_speaker', 'is_moderator', 'is_new', 'is_speaker',
+        'mutual_follows', 'mutual_follows_count', 'name', 'notification_type',
+        'num_followers', 'num_following', 'photo_url', 'skintone', 'time_created',
+        'time_joined_as_speaker', 'topics', 'twitter', 'user_id', 'username',
+    )
+    FIELDS = frozenset(__slots__)
+    REPR = ('user_id', 'username', 'name')
+
+    @classmethod
+    def from_dict(cls, data):
+        """ (type, dict) -> User """
+        self = object.__new__(cls)
+        get = data.get
+        self.bio = get('bio')
+        self.can_edit_displayname = get('can_edit_displayname')
+        self.can_edit_name = get('can_edit_name')
+        self.can_edit_username = get('can_edit_username')
+        self.clubs = _convert(Club, get('clubs'))
+        self.displayname = get('displayname')
+        self.first_name = get('first_name')
+        self.follows_me = get('follows_me')
+        self.has_verified_email = get('has_verified_email')
+        self.instagram = get('instagram')
+        self.invited_by_user_profile = _convert(User, get('invited_by_user_profile'))
+        self.is_blocked_by_network = get('is_blocked_by_network')
+        self.is_followed_by_speaker = get('is_followed_by_speaker')
+        self.is_invited_as_speaker = get('is_invited_as_speaker')
+        self.is_moderator = get('is_moderator')
+        self.is_new = get('is_new')
+        self.is_speaker = get('is_speaker')
+        self.mutual_follows = _convert(User, get('mutual_follows'))
+        self.mutual_follows_count = get('mutual_follows_count')
+        self.name = get('name')
+        self.notification_type = get('notification_type')
+        self.num_followers = get('num_followers')
+        self.num_following = get('num_following')
+        self.photo_url = get('photo_url')
+        self.skintone = get('skintone')
+        self.time_created = get('time_created')
+        self.time_joined_as_speaker = get('time_joined_as_speaker')
+        self.topics = _convert(Topic, get('topics'))
+        self.twitter = get('twitter')
+        self.user_id = get('user_id')
+        self.username = get('username')
+        self._extra(data)
+        return self
+
+class Channel(Model):
+    """
+    Channel from `channels`, `channel` of a response.
+    """
+
+    __slots__ = (
+        'channel', 'channel_id', 'club', 'club_id', 'club_name',
+        'creator_user_profile_id', 'has_blocked_speakers', 'is_explore_channel',
+        'is_private', 'is_social_mode', 'num_all', 'num_other', 'num_speakers', 'topic',
+        'url', 'users', 'welcome_for_user_profile',
+    )
+    FIELDS = frozenset(__slots__)
+    REPR = ('channel_id', 'channel', 'club_id')
+
+    @classmethod
+    def from_dict(cls, data):
+        """ (type, dict) -> Channel """
+        self = object.__new__(cls)
+        get = data.get
+        self.channel = _convert(Channel, get('channel'))
+        self.channel_id = get('channel_id')
+        self.club = _convert(Club, get('club'))
+        self.club_id = get('club_id')
+        self.club_name = get('club_name')
+        self.creator_user_profile_id = get('creator_user_profile_id')
+        self.has_blocked_speakers = get('has_blocked_speakers')
+        self.is_explore_channel = get('is_explore_channel')
+        self.is_private = get('is_private')
+        self.is_social_mode = get('is_social_mode')
+        self.num_all = get('num_all')
+        self.num_other = get('num_other')
+        self.num_speakers = get('num_speakers')
+        self.topic = _convert(Topic, get('topic'))
+        self.url = get('url')
+        self.users = _convert(User, get('users'))
+        self.welcome_for_user_profile = get('welcome_for_user_profile')
+        self._extra(data)
+        return self
+
+class Club(Model):
+    """
+    Club from `club`, `clubs` of a response.
+    """
+
+    __slots__ = (
+        'club_id', 'description', 'enable_private', 'is_community', 'is_follow_allowed',
+        'is_follower', 'is_member', 'is_membership_private', 'name', 'num_followers',
+        'num_members', 'num_online', 'photo_url', 'rules',
+    )
+    FIELDS = frozenset(__slots__)
+    REPR = ('club_id', 'name')
+
+    @classmethod
+    def from_dict(cls, data):
+        """ (type, dict) -> Club """
+        self = object.__new__(cls)
+        get = data.get
+        self.club_id = get('club_id')
+        self.description = get('description')
+        self.enable_private = get('enable_private')
+        self.is_community = get('is_community')
+        self.is_follow_allowed = get('is_follow_allowed')
+        self.is_follower = get('is_follower')
+        self.is_member = get('is_member')
+        self.is_membership_private = get('is_membership_private')
+        self.name = get('name')
+        self.num_followers = get('num_followers')
+        self.num_members = get('num_members')
+        self.num_online = get('num_online')
+        self.photo_url = get('photo_url')
+        self.rules = get('rules')
+        self._extra(data)
+        return self
+
+class Topic(Model):
+    """
+    Topic from `topic`, `topics` of a response.
+    """
+
+    __slots__ = (
+        'abbreviated_title', 'id', 'title', 'topics',
+    )
+    FIELDS = frozenset(__slots__)
+    REPR = ('id', 'title')
+
+    @classmethod
+    def from_dict(cls, data):
+        """ (type, dict) -> Topic """
+        self = object.__new__(cls)
+        get = data.get
+        self.abbreviated_title = get('abbreviated_title')
+        self.id = get('id')
+        self.title = get('title')
+        self.topics = _convert(Topic, get('topics'))
+        self._extra(data)
+        return self
+
+class Event(Model):
+    """
+    Event from `events`, `event` of a response.
+    """
+
+    __slots__ = (
+        'channel', 'club', 'club_is_follower', 'club_is_member', 'description',
+        'event_id', 'hosts', 'is_expired', 'is_member_only', 'name', 'time_start',
+        'url',
+    )
+    FIELDS = frozenset(__slots__)
+    REPR = ('channel', 'event_id', 'name')
+
+    @classmethod
+    def from_dict(cls, data):
+        """ (type, dict) -> Event """
+        self = object.__new__(cls)
+        get = data.get
+        self.channel = _convert(Channel, get('channel'))
+        self.club = _convert(Club, get('club'))
+        self.club_is_follower = get('club_is_follower')
+        self.club_is_member = get('club_is_member')
+        self.description = get('description')
+        self.event_id = get('event_id')
+        self.hosts = _convert(User, get('hosts'))
+        self.is_expired = get('is_expired')
+        self.is_member_only = get('is_member_only')
+        self.name = get('name')
+        self.time_start = get('time_start')
+        self.url = get('url')
+        self._extra(data)
+        return self
+
+class Notification(Model):
+    """
+    Notification from `notifications` of a response.
+    """
+
+    __slots__ = (
+        'channel', 'club', 'event_id', 'is_unread', 'message', 'notification_id',
+        'time_created', 'type', 'user_profile',
+    )
+    FIELDS = frozenset(__slots__)
+    REPR = ('channel', 'event_id', 'notification_id')
+
+    @classmethod
+    def from_dict(cls, data):
+        """ (type, dict) -> Notification """
+        self = object.__new__(cls)
+        get = data.get
+        self.channel = _convert(Channel, get('channel'))
+        self.club = _convert(Club, get('club'))
+        self.event_id = get('event_id')
+        self.is_unread = get('is_unread')
+        self.message = get('message')
+        self.notification_id = get('notification_id')
+        self.time_created = get('time_created')
+        self.type = get('type')
+        self.user_profile = _convert(User, get('user_profile'))
+        self._extra(data)
+        return self
+
+# Response keys holding models
+KEYS = {
+    'users': User,
+    'user_profile': User,
+    'invited_by_user_profile': User,
+    'hosts': User,
+    'mutual_follows': User,
+    'channels': Channel,
+    'channel': Channel,
+    'club': Club,
+    'clubs': Club,
+    'topic': Topic,
+    'topics': Topic,
+    'events': Event,
+    'event': Event,
+    'notifications': Notification,
+}
+
+def convert_field(key, value):
+    """ (str, object) -> object
+    Turn the value of a response key into models, if the key holds models.
+    """
+    model = KEYS.get(key)
+    return _convert(model, value) if model is not None else value
+
+def convert(response):
+    """ (dict) -> dict
+
+    Turn the models of a decoded response into model objects.
+    The response itself stays a dict, for `success`, `next` and other metadata.
+    """
+    if not isinstance(response, dict):
+        return response
+    for key, value in response.items():
+        model = KEYS.get(key)
+        if model is not None:
+            response[key] = _convert(model, value)
+    return response
@@ -0,0 +1,75 @@
+#!/usr/bin/python -u
+#-*- coding: utf-8 -*-
+
+"""
+projection.py
+
+Trimming of decoded responses to the fields the caller asked for,
+used by the `fields` argument of the endpoint methods.
+
+Fields are dotted paths from the top of the response, like
+"users.user_id" or "channel.num_speakers". Lists are walked through,
+so "users.user_id" keeps the `user_id` of every user.
+"""
+
+import functools
+from collections.abc import Mapping
+from clubhouse.lazy import LazyList
+
+# Top-level keys kept whatever the fields, for error handling and pagination
+KEEP = ("success", "error_message", "next")
+
+@functools.lru_cache(maxsize=256)
+def _compile(fields):
+    """ (tuple) -> dict
+    Turn dotted paths into a tree of keys, where True keeps a whole value.
+    """
+    tree = dict.fromkeys(KEEP, True)
+    for path in fields:
+        node = tree
+        *parents, last = path.split(".")
+        for key in parents:
+            child = node.get(key)
+            if child is True:
+                break
+            if child is None:
+                child = node[key] = {}
+            node = child
+        else:
+            node[last] = True
+    return tree
+
+def compile_fields(fields):
+    """ (iterable) -> dict
+
+    Tree of keys to keep for the given dotted paths, or None to keep everything.
+    A single path may be given as a str.
+    """
+    if fields is None:
+        return None
+    if isinstance(fields, str):
+        fields = (fields,)
+    return _compile(tuple(fields))
+
+def project(value, tree):
+    """ (object, dict) -> object
+
+    Keep the keys of the tree in a decoded value, descending into lists.
+    Keys missing from the value are left out. `tree` is from compile_fields().
+    """
+    if tree is None or tree is True:
+        return value
+    if isinstance(value, Mapping):
+        ret = {}
+        for key, node in tree.items():
+            if key in value:
+                item = value[key]
+                if node is not True:
+                    item = project(item, node)
+                elif isinstance(item, LazyList):
+                    item = list(item)
+                ret[key] = item
+        return ret
+    if isinstance(value, (list, LazyList)):
+        return [project(item, tree) for item in value]
+    return value
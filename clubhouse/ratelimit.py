@@ -0,0 +1,202 @@
+#!/usr/bin/python -u
+#-*- coding: utf-8 -*-
+
+"""
+ratelimit.py
+
+Client-side rate limiting, adapting to the rate limits of the server.
+"""
+
+import time
+import threading
+from email.utils import parsedate_to_datetime
+
+# Statuses telling the client to slow down
+THROTTLE_STATUSES = (429, 503)
+
+def retry_after(response):
+    """ (Response) -> float
+    Seconds to wait from the `Retry-After` header, or None.
+    """
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+class TokenBucket:
+    """
+    Token bucket of a single rate class.
+
+    `rate` starts at `max_rate` requests per second and goes down and up
+    with the throttling responses of the server. (AIMD)
+    Not thread-safe by itself; RateLimiter holds the lock.
+    """
+
+    def __init__(self, max_rate, burst):
+        self.max_rate = max_rate
+        self.rate = max_rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self.decreased = 0.0
+        self.requests = 0
+        self.throttled = 0
+        self.waited = 0.0
+
+    def reserve(self, now):
+        """ (TokenBucket, float) -> float
+        Take a token, returning how long to wait before using it.
+        """
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        self.tokens -= 1
+        self.requests += 1
+        delay = max(-self.tokens / self.rate, self.blocked_until - now, 0.0)
+        self.waited += delay
+        return delay
+
+    def release(self, delay):
+        """ (TokenBucket, float) -> NoneType
+        Give back a token reserved with `delay` that won't be used after all.
+        """
+        self.tokens = min(self.burst, self.tokens + 1)
+        self.requests -= 1
+        self.waited -= delay
+
+class RateLimiter:
+    """
+    RateLimiter Class
+
+    One token bucket per rate class of endpoints (`Endpoint.rate_class`).
+    Every request waits for a token of its class before being sent.
+
+    When the server answers 429 or 503, the rate of the class is cut by
+    `backoff` (at most once per second), and nothing is sent until its
+    `Retry-After` has passed. Every other response raises the rate again by
+    `recovery` times the configured rate, so the client settles just under
+    the limit of the server instead of running into it over and over.
+
+    One limiter can be shared by several clients, to throttle them together.
+
+    >>> limiter = RateLimiter(rates={"read": (5, 10)})
+    >>> clubhouse = Clubhouse(user_id, user_token, user_device, rate_limit=limiter)
+    """
+
+    # Requests per second and burst size, per rate class
+    RATES = {
+        "auth": (0.2, 3),
+        "read": (10, 20),
+        "write": (2, 5),
+    }
+
+    def __init__(self, rates=None, backoff=0.5, recovery=0.02, min_rate=0.05):
+        """ (RateLimiter, dict, float, float, float) -> NoneType
+        `rates` overrides RATES, as {rate_class: (requests per second, burst)}.
+        """
+        self.rates = {**self.RATES, **(rates or {})}
+        self.backoff = backoff
+        self.recovery = recovery
+        self.min_rate = min_rate
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def _bucket(self, rate_class):
+        """ (RateLimiter, str) -> TokenBucket
+        Get the bucket of the given class. The lock must be held.
+        """
+        bucket = self._buckets.get(rate_class)
+        if bucket is None:
+            rate, burst = self.rates.get(rate_class, self.rates["read"])
+            bucket = self._buckets[rate_class] = TokenBucket(rate, burst)
+        return bucket
+
+    def reserve(self, rate_class):
+        """ (RateLimiter, str) -> float
+
+        Take a token of the given class. Returns the number of seconds
+        the caller must wait before sending its request.
+        """
+        with self._lock:
+            return self._bucket(rate_class).reserve(time.monotonic())
+
+    def release(self, rate_class, delay=0.0):
+        """ (RateLimiter, str, float) -> NoneType
+
+        Give back a token taken with `reserve()`, returning `delay`,
+        when the request won't be sent after all, so it doesn't count
+        against the rate.
+        """
+        with self._lock:
+            self._bucket(rate_class).release(delay)
+
+    def blocked(self, rate_class):
+        """ (RateLimiter, str) -> float
+
+        Seconds left until the `Retry-After` of the given class has passed.
+        Check it again after waiting for a reservation, since the server
+        may have asked to back off in the meantime.
+        """
+        with self._lock:
+            return max(self._bucket(rate_class).blocked_until - time.monotonic(), 0.0)
+
+    def acquire(self, rate_class, timeout=None):
+        """ (RateLimiter, str, float) -> bool
+
+        Block until a request of the given class may be sent.
+        Returns False right away if that would take more than `timeout` seconds.
+        """
+        end = time.monotonic() + timeout if timeout is not None else None
+        delay = reserved = self.reserve(rate_class)
+        while delay > 0:
+            if end is not None and time.monotonic() + delay > end:
+                self.release(rate_class, reserved)
+                return False
+            time.sleep(delay)
+            delay = self.blocked(rate_class)
+        return True
+
+    def observe(self, rate_class, response):
+        """ (RateLimiter, str, Response) -> NoneType
+
+        Adapt the rate of the given class to a response of the server.
+        """
+        with self._lock:
+            bucket = self._bucket(rate_class)
+            now = time.monotonic()
+            if response.status_code not in THROTTLE_STATUSES:
+                bucket.rate = min(bucket.max_rate, bucket.rate + bucket.max_rate * self.recovery)
+                return
+            bucket.throttled += 1
+            wait = retry_after(response)
+            if wait is not None:
+                bucket.blocked_until = max(bucket.blocked_until, now + wait)
+            # Responses to requests sent before the first 429 don't count again.
+            if now - bucket.decreased >= 1:
+                bucket.rate = max(self.min_rate, bucket.rate * self.backoff)
+                bucket.tokens = min(bucket.tokens, 0)
+                bucket.decreased = now
+
+    def stats(self):
+        """ (RateLimiter) -> dict
+
+        Current rate and counters of every rate class used so far.
+        """
+        with self._lock:
+            return {
+                rate_class: {
+                    "rate": bucket.rate,
+                    "max_rate": bucket.max_rate,
+                    "requests": bucket.requests,
+                    "throttled": bucket.throttled,
+                    "waited": bucket.waited,
+                }
+                for rate_class, bucket in self._buckets.items()
+            }
@@ -0,0 +1,82 @@
+#!/usr/bin/python -u
+#-*- coding: utf-8 -*-
+
+"""
+retry.py
+
+Retries of failed requests, with jittered exponential backoff.
+"""
+
+import time
+import random
+import threading
+from collections import Counter
+from clubhouse.ratelimit import retry_after
+
+class RetryPolicy:
+    """
+    RetryPolicy Class
+
+    Decides whether a failed request is sent again, and when.
+
+    Idempotent endpoints (`Endpoint.idempotent`) are retried on connection
+    errors and on the statuses in `statuses`. Other endpoints are only retried
+    on 429, which the server sends before handling the request,
+    so writes are never applied twice.
+
+    The n-th retry waits a random time between 0 and `backoff * 2 ** n` seconds,
+    capped to `max_backoff` (full jitter), or longer if the server sent a
+    `Retry-After`. A call gives up after `attempts` tries, or when the next
+    try would start more than `budget` seconds after the first one.
+
+    >>> clubhouse = Clubhouse(user_id, user_token, user_device, retry=RetryPolicy(attempts=5, budget=60))
+    """
+
+    def __init__(self, attempts=3, backoff=0.5, max_backoff=8.0, budget=30.0,
+                 statuses=(429, 500, 502, 503, 504)):
+        """ (RetryPolicy, int, float, float, float, tuple) -> NoneType """
+        self.attempts = attempts
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.budget = budget
+        self.statuses = statuses
+        self.retries = Counter()
+        self._lock = threading.Lock()
+
+    def delay(self, endpoint, attempt, started, response=None, error=None):
+        """ (RetryPolicy, Endpoint, int, float, Response, Exception) -> float
+
+        Seconds to wait before retrying the call, or None to give up.
+        `attempt` counts the tries so far from 1, and `started` is the
+        `time.monotonic()` of the first one. Pass the response or the
+        connection error of the last try.
+        """
+        if attempt >= self.attempts:
+            return None
+        if error is not None:
+            if not endpoint.idempotent:
+                return None
+        elif response.status_code not in self.statuses:
+            return None
+        elif response.status_code != 429 and not endpoint.idempotent:
+            return None
+
+        delay = random.uniform(0, min(self.max_backoff, self.backoff * 2 ** (attempt - 1)))
+        if response is not None:
+            delay = max(delay, retry_after(response) or 0)
+        if time.monotonic() + delay - started > self.budget:
+            return None
+        with self._lock:
+            self.retries[endpoint.name] += 1
+        return delay
+
+    def stats(self):
+        """ (RetryPolicy) -> dict
+
+        Number of retries, in total and per endpoint.
+        """
+        with self._lock:
+            return {
+                "retries": sum(self.retries.values()),
+                "retries_by_endpoint": dict(self.retries),
+            }
@@ -0,0 +1,144 @@
+#!/usr/bin/python -u
+#-*- coding: utf-8 -*-
+
+"""
+singleflight.py
+
+Request coalescing. Concurrent identical calls share a single request.
+"""
+
+import time
+import asyncio
+import threading
+from collections import Counter
+from clubhouse.exceptions import DeadlineExceeded
+
+class _Flight:
+    """
+    A call in progress, waited on by the callers that joined it.
+    `done` is only created once a caller joins, so that calls nobody
+    joins cost no Event.
+    """
+
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = None
+        self.result = None
+        self.error = None
+
+class SingleFlight:
+    """
+    SingleFlight Class
+
+    While a call for a key is in flight, other threads asking for the same key
+    wait for it and get the same result (or exception) instead of calling again.
+    Keys start with the endpoint name, like the ResponseCache keys.
+    Results are raw responses, so every caller still decodes its own copy.
+    """
+
+    def __init__(self):
+        self.calls = 0
+        self.collapsed = Counter()
+        self._flights = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, func, *args, timeout=None):
+        """ (SingleFlight, tuple, function, ..., float) -> object
+
+        Call func(*args) unless the same key is already in flight.
+        A caller joining a call in flight waits at most `timeout` seconds
+        for it, then raises DeadlineExceeded. If the call in flight runs out
+        of its own caller's deadline, the callers that joined it call again.
+        """
+        until = time.monotonic() + timeout if timeout is not None else None
+        while True:
+            with self._lock:
+                flight = self._flights.get(key)
+                leader = flight is None
+                if leader:
+                    flight = self._flights[key] = _Flight()
+                    self.calls += 1
+                else:
+                    if flight.done is None:
+                        flight.done = threading.Event()
+                    self.collapsed[key[0]] += 1
+
+            if leader:
+                break
+            if not flight.done.wait(until - time.monotonic() if until is not None else None):
+                raise DeadlineExceeded(f"Deadline exceeded waiting for {key[0]}")
+            if isinstance(flight.error, DeadlineExceeded):
+                # The deadline was the leader's, not ours.
+                continue
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+
+        try:
+            flight.result = func(*args)
+        except BaseException as error:
+            flight.error = error
+            raise
+        finally:
+            # No caller can join once the flight is removed, so `done`
+            # is final here.
+            with self._lock:
+                del self._flights[key]
+                done = flight.done
+            if done is not None:
+                done.set()
+        return flight.result
+
+    def stats(self):
+        """ (SingleFlight) -> dict
+
+        Number of calls sent, and of calls collapsed into them per endpoint.
+        """
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "collapsed": sum(self.collapsed.values()),
+                "in_flight": len(self._flights),
+                "collapsed_by_endpoint": dict(self.collapsed),
+            }
+
+class AsyncSingleFlight(SingleFlight):
+    """
+    AsyncSingleFlight Class
+
+    SingleFlight for coroutines. Must be used from a single event loop.
+    Cancelling one caller doesn't cancel the call for the others.
+    """
+
+    def _forget(self, key, task):
+        """ (AsyncSingleFlight, tuple, asyncio.Task) -> NoneType """
+        if self._flights.get(key) is task:
+            del self._flights[key]
+
+    async def do(self, key, func, *args, timeout=None):
+        """ (AsyncSingleFlight, tuple, coroutine function, ..., float) -> object
+
+        Await func(*args) unless the same key is already in flight.
+        """
+        loop = asyncio.get_running_loop()
+        until = loop.time() + timeout if timeout is not None else None
+        while True:
+            task = self._flights.get(key)
+            if task is None or task.done():
+                task = self._flights[key] = asyncio.ensure_future(func(*args))
+                task.add_done_callback(lambda done: self._forget(key, done))
+                self.calls += 1
+                return await asyncio.shield(task)
+            self.collapsed[key[0]] += 1
+            try:
+                return await asyncio.wait_for(asyncio.shield(task), until - loop.time() if until is not None else None)
+            except DeadlineExceeded:
+                # The deadline was the leader's, not ours.
+                continue
+            except asyncio.TimeoutError:
+                raise DeadlineExceeded(f"Deadline exceeded waiting for {key[0]}") from None
+            except asyncio.CancelledError:
+                if not task.cancelled():
+                    raise
+                # The call was cancelled, not us.
@@ -0,0 +1,148 @@
+#!/usr/bin/python -u
+#-*- coding: utf-8 -*-
+
+"""
+stream.py
+
+Incremental parsing of a response while it downloads.
+
+ArrayParser is fed the body chunk by chunk, and returns the elements of
+one array of the response as soon as each of them has arrived, so the
+body is never held in full. Elements are found the same way as in
+`clubhouse.lazy`.
+"""
+
+from clubhouse import jsonlib
+from clubhouse.lazy import _MEMBER, _SEPARATOR, _SPACE, _object, _skip
+
+# Parser states
+_START = "start"
+_MEMBERS = "members"
+_ITEMS = "items"
+_ITEM = "item"
+_DONE = "done"
+
+_NOTHING = object()
+
+class ArrayParser:
+    """
+    ArrayParser Class
+
+    Parse the array under `key` of a JSON object streamed as chunks of bytes.
+    The keys before it are skipped, and everything after it is ignored.
+    Only the bytes of the element being received are buffered.
+
+    >>> parser = ArrayParser("users")
+    >>> parser.feed(b'{"success": true, "users": [{"user_id": 1}, {"us')
+    [{'user_id': 1}]
+    >>> parser.feed(b'er_id": 2}]}')
+    [{'user_id': 2}]
+    >>> parser.done
+    True
+    """
+
+    def __init__(self, key):
+        """ (ArrayParser, str) -> NoneType """
+        self.key = key
+        self._state = _START
+        self._buffer = b""
+        self._pos = 0
+
+    @property
+    def done(self):
+        """ (ArrayParser) -> bool
+        Whether the array ended, or the object ended without it.
+        """
+        return self._state == _DONE
+
+    def feed(self, chunk):
+        """ (ArrayParser, bytes) -> list
+
+        Add the next bytes of the body, and get the elements they completed.
+        """
+        if self._state == _DONE:
+            return []
+        self._buffer = self._buffer[self._pos:] + chunk
+        self._pos = 0
+        items = []
+        try:
+            while self._state != _DONE:
+                item = self._step()
+                if item is not _NOTHING:
+                    items.append(item)
+        except (ValueError, IndexError):
+            # The rest of the value hasn't arrived yet.
+            pass
+        return items
+
+    def close(self):
+        """ (ArrayParser) -> NoneType
+        Raise ValueError if the body ended before the array did.
+        """
+        if self._state != _DONE:
+            raise ValueError(f"Invalid or incomplete JSON response (at the {self._state} of {self.key})")
+
+    def _step(self):
+        """ (ArrayParser) -> object
+
+        Parse the next token, and return the element it completed, if any.
+        Raises ValueError or IndexError, leaving the position unchanged,
+        when the buffer ends before the token.
+        """
+        buffer, pos = self._buffer, self._pos
+        if self._state == _START:
+            pos = _SPACE.match(buffer, pos).end()
+            if buffer[pos] != 0x7b:
+                raise ValueError("Response is not a JSON object")
+            pos = _SPACE.match(buffer, pos + 1).end()
+            self._state = _DONE if buffer[pos] == 0x7d else _MEMBERS
+            self._pos = pos + 1 if self._state == _DONE else pos
+            return _NOTHING
+
+        if self._state == _MEMBERS:
+            match = _MEMBER.match(buffer, pos)
+            if match is None:
+                raise ValueError(f"Invalid JSON key at {pos}")
+            start = match.end()
+            if buffer[start] == 0x5b and jsonlib.loads(match.group(1)) == self.key:
+                self._state = _ITEMS
+                self._pos = start + 1
+                return _NOTHING
+            end = _skip(buffer, start)
+            # A value cut after a `}` or `,` in one of its strings
+            # would otherwise look whole.
+            jsonlib.loads(buffer[start:end])
+            self._pos = self._separator(end, b"}")
+            return _NOTHING
+
+        if self._state == _ITEMS:
+            pos = _SPACE.match(buffer, pos).end()
+            if buffer[pos] == 0x5d:
+                self._state = _DONE
+                self._pos = pos + 1
+            else:
+                self._state = _ITEM
+                self._pos = pos
+            return _NOTHING
+
+        pos = _SPACE.match(buffer, pos).end()
+        if buffer[pos] == 0x7b:
+            value, end = _object(buffer, pos)
+        else:
+            end = _skip(buffer, pos)
+            value = jsonlib.loads(buffer[pos:end])
+        self._pos = self._separator(end, b"]")
+        return value
+
+    def _separator(self, end, closer):
+        """ (ArrayParser, int, bytes) -> int
+        Position after the separator following a value, ending the parse after `closer`.
+        """
+        match = _SEPARATOR.match(self._buffer, end)
+        if match is None:
+            raise ValueError(f"Invalid JSON at {end}")
+        if match.group(1) == closer:
+            self._state = _DONE
+        elif match.group(1) != b",":
+            raise ValueError(f"Invalid JSON at {end}")
+        return match.end()
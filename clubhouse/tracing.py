@@ -0,0 +1,312 @@
+#!/usr/bin/python -u
+#-*- coding: utf-8 -*-
+
+"""
+tracing.py
+
+Trace spans of client calls, used by `Clubhouse(tracer=...)`.
+
+Every endpoint call is a span named after the endpoint, with its parameters
+(redacted), the number of attempts, and the time spent waiting in the client
+(`clubhouse.queue_seconds`), on the network (`clubhouse.network_seconds`) and
+backing off between retries (`clubhouse.backoff_seconds`). Each HTTP request
+is a child span.
+
+Tracer has no dependencies, and writes finished spans to its exporters,
+like JSONLinesExporter. OpenTelemetryTracer sends the same spans through
+the OpenTelemetry API instead. (pip install opentelemetry-api)
+"""
+
+import json
+import time
+import random
+import threading
+import contextlib
+import contextvars
+from urllib.parse import parse_qsl
+
+try:
+    from opentelemetry import trace as otel_trace
+except ImportError:
+    otel_trace = None
+
+# Parameters whose name contains one of these are sent as "[REDACTED]",
+# at any depth of the body.
+REDACTED = {"token", "secret", "password", "code", "phone", "email", "contacts", "nonce", "safety_net"}
+
+# Longer strings and lists are cut down in span attributes.
+MAX_ATTRIBUTE_LENGTH = 128
+
+def _secret(key):
+    """ (object) -> bool """
+    key = str(key).lower()
+    return any(word in key for word in REDACTED)
+
+def _redact(value):
+    """ (object) -> object
+    Copy of a parameter with the values under secret keys of its objects redacted.
+    """
+    if isinstance(value, dict):
+        return {key: "[REDACTED]" if _secret(key) else _redact(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_redact(item) for item in value]
+    return value
+
+def _attribute(value):
+    """ (object) -> object
+    Parameter as a span attribute: a str, bool, int, float, or a list of them.
+    """
+    if value is None:
+        return "null"
+    if isinstance(value, (bool, int, float)):
+        return value
+    if isinstance(value, (list, tuple)) and all(isinstance(item, (bool, int, float, str)) for item in value):
+        return list(value[:MAX_ATTRIBUTE_LENGTH])
+    return str(value)[:MAX_ATTRIBUTE_LENGTH]
+
+def call_attributes(endpoint, data=None, query=""):
+    """ (Endpoint, object, str) -> dict
+    Span attributes of a call: the endpoint, and its parameters from the
+    JSON body and the query string, redacted.
+    """
+    ret = {"clubhouse.endpoint": endpoint.name, "http.request.method": endpoint.method}
+    if isinstance(data, dict):
+        params = data.items()
+    elif data is not None and hasattr(data, "__len__"):
+        # An upload; only its size is worth keeping.
+        ret["clubhouse.upload_bytes"] = len(data)
+        params = ()
+    else:
+        params = ()
+    for key, value in list(params) + parse_qsl(query.lstrip("?")):
+        ret[f"clubhouse.param.{key}"] = "[REDACTED]" if _secret(key) else _attribute(_redact(value))
+    return ret
+
+class Span:
+    """
+    Span Class
+
+    A timed operation, in a trace. `totals` are numbers added up with `add()`
+    while the span is open, and set as attributes when it ends.
+    """
+
+    __slots__ = ("tracer", "name", "trace_id", "span_id", "parent", "parent_id",
+                 "start_time", "end_time", "attributes", "totals", "events", "error")
+
+    def __init__(self, tracer, name, trace_id, parent_id=None, parent=None, attributes=None):
+        """ (Span, Tracer, str, int, int, Span, dict) -> NoneType """
+        self.tracer = tracer
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = random.getrandbits(64)
+        self.parent = parent
+        self.parent_id = parent_id
+        self.start_time = time.time_ns()
+        self.end_time = None
+        self.attributes = dict(attributes) if attributes else {}
+        self.totals = {}
+        self.events = []
+        self.error = None
+
+    def set_attribute(self, key, value):
+        """ (Span, str, object) -> NoneType """
+        self.attributes[key] = value
+
+    def add(self, key, amount):
+        """ (Span, str, float) -> NoneType
+        Add to the total `key`, like the seconds spent waiting.
+        """
+        self.totals[key] = self.totals.get(key, 0) + amount
+
+    def record_exception(self, error):
+        """ (Span, Exception) -> NoneType
+        Mark the span as failed with the exception.
+        """
+        self.error = error
+        self.events.append({
+            "name": "exception",
+            "time_unix_nano": time.time_ns(),
+            "attributes": {"exception.type": type(error).__name__, "exception.message": str(error)},
+        })
+
+    def end(self):
+        """ (Span) -> NoneType
+        End the span, and hand it to the tracer's exporters. Only the first call counts.
+        """
+        if self.end_time is not None:
+            return
+        self.end_time = time.time_ns()
+        self.attributes.update(self.totals)
+        self.tracer._export(self)
+
+    @property
+    def traceparent(self):
+        """ (Span) -> str
+        W3C traceparent of the span, to continue the trace elsewhere.
+        """
+        return f"00-{self.trace_id:032x}-{self.span_id:016x}-01"
+
+    def to_dict(self):
+        """ (Span) -> dict
+        The span as JSON, with the field names of OpenTelemetry.
+        """
+        return {
+            "name": self.name,
+            "trace_id": f"{self.trace_id:032x}",
+            "span_id": f"{self.span_id:016x}",
+            "parent_span_id": f"{self.parent_id:016x}" if self.parent_id is not None else None,
+            "start_time_unix_nano": self.start_time,
+            "end_time_unix_nano": self.end_time,
+            "duration_ms": (self.end_time - self.start_time) / 1e6 if self.end_time is not None else None,
+            "attributes": self.attributes,
+            "events": self.events,
+            "status": {"code": "ERROR", "message": str(self.error)} if self.error is not None else {"code": "OK"},
+        }
+
+class Tracer:
+    """
+    Tracer Class
+
+    Creates spans, and hands them to every exporter in `exporters` when they
+    end. An exporter is anything with an `export(span)` method, called in the
+    thread that ended the span; exceptions it raises are ignored.
+
+    Spans nest under the span made current by `span()`, in the same thread or
+    task, or under an explicit `parent`: a Span, or a W3C traceparent string
+    from another process.
+
+    >>> tracer = Tracer(JSONLinesExporter("traces.jsonl"))
+    >>> clubhouse = Clubhouse(user_id, user_token, user_device, tracer=tracer)
+    >>> with tracer.span("refresh feed"):
+    ...     clubhouse.get_feed()
+    ...     clubhouse.get_channels()
+    """
+
+    def __init__(self, *exporters):
+        """ (Tracer, object...) -> NoneType """
+        self.exporters = list(exporters)
+        self.export_errors = 0
+        self._current = contextvars.ContextVar(f"clubhouse_span_{id(self)}", default=None)
+
+    def current(self):
+        """ (Tracer) -> Span
+        Span made current by `span()`, or None.
+        """
+        return self._current.get()
+
+    def start_span(self, name, attributes=None, parent=None):
+        """ (Tracer, str, dict, object) -> Span
+        Start a span under `parent`, or the current span. Call `end()` on it.
+        """
+        if parent is None:
+            parent = self._current.get()
+        if isinstance(parent, str):
+            # 00-<trace id>-<parent id>-<flags>
+            _, trace_id, parent_id, _ = parent.split("-")
+            return Span(self, name, int(trace_id, 16), int(parent_id, 16), None, attributes)
+        if parent is not None:
+            return Span(self, name, parent.trace_id, parent.span_id, parent, attributes)
+        return Span(self, name, random.getrandbits(128), None, None, attributes)
+
+    @contextlib.contextmanager
+    def span(self, name, attributes=None, parent=None):
+        """ (Tracer, str, dict, object) -> context manager
+        Span around the block, current within it, failed if the block raises.
+        """
+        span = self.start_span(name, attributes, parent)
+        token = self._current.set(span)
+        try:
+            yield span
+        except BaseException as error:
+            span.record_exception(error)
+            raise
+        finally:
+            self._current.reset(token)
+            span.end()
+
+    def _export(self, span):
+        """ (Tracer, Span) -> NoneType """
+        for exporter in list(self.exporters):
+            try:
+                exporter.export(span)
+            except Exception: # pylint: disable=broad-except
+                self.export_errors += 1
+
+class JSONLinesExporter:
+    """
+    JSONLinesExporter Class
+
+    Appends every finished span to a file as a line of JSON (see Span.to_dict),
+    to analyse traces offline. Lines are written whole, from any thread.
+
+    >>> import json
+    >>> spans = [json.loads(line) for line in open("traces.jsonl")]
+    """
+
+    def __init__(self, path):
+        """ (JSONLinesExporter, str) -> NoneType """
+        self.path = path
+        # Line buffered, so each span reaches the file when it ends.
+        self._file = open(path, "a", buffering=1)
+        self._lock = threading.Lock()
+
+    def export(self, span):
+        """ (JSONLinesExporter, Span) -> NoneType """
+        line = json.dumps(span.to_dict(), default=str, separators=(",", ":")) + "\n"
+        with self._lock:
+            self._file.write(line)
+
+    def close(self):
+        """ (JSONLinesExporter) -> NoneType """
+        with self._lock:
+            self._file.close()
+
+class _OpenTelemetrySpan:
+    """
+    OpenTelemetry span, with the interface of Span.
+    """
+
+    __slots__ = ("span", "parent", "totals")
+
+    def __init__(self, span, parent=None):
+        self.span = span
+        self.parent = parent
+        self.totals = {}
+
+    def set_attribute(self, key, value):
+        self.span.set_attribute(key, value)
+
+    def add(self, key, amount):
+        self.totals[key] = self.totals.get(key, 0) + amount
+
+    def record_exception(self, error):
+        self.span.record_exception(error)
+        self.span.set_status(otel_trace.Status(otel_trace.StatusCode.ERROR, str(error)))
+
+    def end(self):
+        self.span.set_attributes(self.totals)
+        self.span.end()
+
+class OpenTelemetryTracer:
+    """
+    OpenTelemetryTracer Class
+
+    Sends the client's spans through the OpenTelemetry API, so they nest
+    under the caller's current OpenTelemetry span and go to whatever
+    exporter the application configured. (pip install opentelemetry-api)
+
+    >>> clubhouse = Clubhouse(user_id, user_token, user_device, tracer=OpenTelemetryTracer())
+    """
+
+    def __init__(self, tracer=None):
+        """ (OpenTelemetryTracer, opentelemetry.trace.Tracer) -> NoneType """
+        if otel_trace is None:
+            raise ImportError("OpenTelemetryTracer requires opentelemetry-api. (pip install opentelemetry-api)")
+        self.tracer = tracer or otel_trace.get_tracer("clubhouse")
+
+    def start_span(self, name, attributes=None, parent=None):
+        """ (OpenTelemetryTracer, str, dict, _OpenTelemetrySpan) -> _OpenTelemetrySpan
+        Start a span under `parent`, or OpenTelemetry's current span.
+        """
+        context = otel_trace.set_span_in_context(parent.span) if parent is not None else None
+        return _OpenTelemetrySpan(self.tracer.start_span(name, context=context, attributes=attributes), parent)
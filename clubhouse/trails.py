@@ -0,0 +1,188 @@
+#!/usr/bin/python -u
+#-*- coding: utf-8 -*-
+
+"""
+trails.py
+
+Buffered, batched sending of `record_action_trails` in the background.
+"""
+
+import time
+import atexit
+import threading
+from collections import deque
+
+# What record() does when the queue is full
+DROP = "drop"
+DROP_OLDEST = "drop_oldest"
+BLOCK = "block"
+
+class ActionTrailQueue:
+    """
+    ActionTrailQueue Class
+
+    Action trails are queued by `record()` without waiting on the network,
+    and a background thread sends them with `record_action_trails`,
+    `batch_size` trails at a time, or whatever has been queued once the
+    oldest trail has waited `flush_interval` seconds.
+
+    At most `max_size` trails are held. When the queue is full, `overflow`
+    decides what happens to a new trail:
+        - "drop": it's dropped.
+        - "drop_oldest": the oldest queued trail is dropped to make room.
+        - "block": record() waits up to `timeout` seconds for room
+          (None waits forever), then drops it.
+
+    `close()` sends every queued trail before returning, and is called by
+    `Clubhouse.close()` and at interpreter exit. Batches that fail to send
+    are counted in `stats()` and not retried, beyond the client's retry policy.
+
+    >>> clubhouse = Clubhouse(user_id, user_token, user_device, trails=True)
+    >>> clubhouse.trails.record({"trail_type": "...", "blob_data": {}})
+    True
+    """
+
+    def __init__(self, send=None, batch_size=50, flush_interval=5.0, max_size=10000,
+                 overflow=DROP, timeout=None):
+        """ (ActionTrailQueue, function, int, float, int, str, float) -> NoneType """
+        if overflow not in (DROP, DROP_OLDEST, BLOCK):
+            raise ValueError(f"Unknown overflow policy {overflow} (choose from {DROP}, {DROP_OLDEST}, {BLOCK})")
+        self.send = send
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_size = max_size
+        self.overflow = overflow
+        self.timeout = timeout
+        self._items = deque()
+        self._oldest = 0.0
+        self._closed = False
+        self._thread = None
+        self._cond = threading.Condition()
+        self._counts = {"recorded": 0, "sent": 0, "dropped": 0, "failed": 0, "batches": 0}
+
+    def record(self, *trails):
+        """ (ActionTrailQueue, dict, ...) -> bool
+
+        Queue action trails to be sent in the background.
+        False if any of them was dropped, or the queue is closed.
+        """
+        queued = True
+        with self._cond:
+            if self._closed:
+                self._counts["dropped"] += len(trails)
+                return False
+            self._start()
+            for trail in trails:
+                if len(self._items) >= self.max_size and not self._make_room():
+                    self._counts["dropped"] += 1
+                    queued = False
+                    continue
+                if not self._items:
+                    self._oldest = time.monotonic()
+                self._items.append(trail)
+                self._counts["recorded"] += 1
+            if len(self._items) >= min(self.batch_size, self.max_size):
+                self._cond.notify_all()
+        return queued
+
+    def _make_room(self):
+        """ (ActionTrailQueue) -> bool
+        Apply the overflow policy to a full queue. The lock must be held.
+        """
+        if self.overflow == DROP_OLDEST:
+            self._items.popleft()
+            self._counts["dropped"] += 1
+            return True
+        if self.overflow == BLOCK:
+            self._cond.notify_all()
+            return self._cond.wait_for(lambda: len(self._items) < self.max_size or self._closed,
+                                       self.timeout) and not self._closed
+        return False
+
+    def _start(self):
+        """ (ActionTrailQueue) -> NoneType
+        Start the background thread on first use. The lock must be held.
+        """
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="clubhouse-trails", daemon=True)
+            self._thread.start()
+            atexit.register(self.close)
+
+    def _take(self):
+        """ (ActionTrailQueue) -> list
+        Take the next batch off the queue. The lock must be held.
+        """
+        batch = [self._items.popleft() for _ in range(min(self.batch_size, len(self._items)))]
+        if self._items:
+            self._oldest = time.monotonic()
+        self._cond.notify_all()
+        return batch
+
+    def _run(self):
+        """ (ActionTrailQueue) -> NoneType
+        Send batches until the queue is closed and empty.
+        """
+        while True:
+            with self._cond:
+                # A full queue is sent right away, to make room.
+                while not self._closed and len(self._items) < min(self.batch_size, self.max_size):
+                    if self._items:
+                        wait = self._oldest + self.flush_interval - time.monotonic()
+                        if wait <= 0:
+                            break
+                    else:
+                        wait = None
+                    self._cond.wait(wait)
+                batch = self._take()
+                if not batch and self._closed:
+                    return
+            if batch:
+                self._send(batch)
+
+    def _send(self, batch):
+        """ (ActionTrailQueue, list) -> NoneType
+        Send a batch, counting the outcome.
+        """
+        try:
+            self.send(batch)
+        except Exception: # pylint: disable=broad-except
+            with self._cond:
+                self._counts["failed"] += len(batch)
+            return
+        with self._cond:
+            self._counts["sent"] += len(batch)
+            self._counts["batches"] += 1
+
+    def flush(self):
+        """ (ActionTrailQueue) -> NoneType
+        Send every queued trail now, from the calling thread.
+        """
+        while True:
+            with self._cond:
+                batch = self._take()
+            if not batch:
+                return
+            self._send(batch)
+
+    def close(self):
+        """ (ActionTrailQueue) -> NoneType
+
+        Stop accepting trails, and send the queued ones before returning.
+        """
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+            thread = self._thread
+        if thread is not None:
+            thread.join()
+            atexit.unregister(self.close)
+        self.flush()
+
+    def stats(self):
+        """ (ActionTrailQueue) -> dict
+
+        Trails recorded, sent, dropped and failed so far, batches sent,
+        and trails still queued.
+        """
+        with self._cond:
+            return dict(self._counts, queued=len(self._items))
@@ -0,0 +1,156 @@
+#!/usr/bin/python -u
+#-*- coding: utf-8 -*-
+
+"""
+upload.py
+
+Photo uploads, used by `update_photo`.
+
+MultipartFile streams a file as a multipart/form-data body while it's
+sent, instead of reading it into memory first, and shrink_photo resizes
+and recompresses a photo before the upload. Shrinking needs Pillow.
+(pip install Pillow)
+"""
+
+import io
+import os
+import mmap
+import secrets
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:
+    Image = None
+
+class MultipartFile:
+    """
+    MultipartFile Class
+
+    multipart/form-data body holding a single file, read `CHUNK_SIZE`
+    bytes at a time while it's sent.
+
+    The file is a path, an open binary file, or a buffer like bytes or
+    mmap.mmap. A path is opened here and closed by `close()`. A file
+    object is read from its current position, and is left open; one that
+    can't seek is read into memory.
+
+    Every iteration starts over, so the body can be sent again to retry it.
+    Send it with `headers`, which hold its Content-Type and Content-Length.
+
+    >>> with MultipartFile("photo.jpg") as upload:
+    ...     requests.post(url, data=upload, headers=upload.headers)
+    """
+
+    CHUNK_SIZE = 65536
+
+    def __init__(self, source, field="file", filename="image.jpg", content_type="image/jpeg"):
+        """ (MultipartFile, object, str, str, str) -> NoneType """
+        self.boundary = secrets.token_hex(16)
+        self._head = (
+            f"--{self.boundary}\r\n"
+            f'Content-Disposition: form-data; name="{field}"; filename="{filename}"\r\n'
+            f"Content-Type: {content_type}\r\n\r\n"
+        ).encode()
+        self._tail = f"\r\n--{self.boundary}--\r\n".encode()
+        self._file = None
+        self._buffer = None
+        self._owned = isinstance(source, (str, os.PathLike))
+        if self._owned:
+            source = open(source, "rb")
+        if hasattr(source, "read") and not isinstance(source, mmap.mmap) and not source.seekable():
+            source = source.read()
+        if hasattr(source, "read") and not isinstance(source, mmap.mmap):
+            self._file = source
+            self._start = source.tell()
+            self._size = source.seek(0, io.SEEK_END) - self._start
+            source.seek(self._start)
+        else:
+            self._buffer = memoryview(source).cast("B")
+            self._size = len(self._buffer)
+
+    @property
+    def headers(self):
+        """ (MultipartFile) -> dict
+        Headers to send the body with.
+        """
+        return {
+            "Content-Type": f"multipart/form-data; boundary={self.boundary}",
+            "Content-Length": str(len(self)),
+        }
+
+    def __len__(self):
+        return len(self._head) + self._size + len(self._tail)
+
+    def __iter__(self):
+        yield self._head
+        if self._buffer is not None:
+            for start in range(0, self._size, self.CHUNK_SIZE):
+                yield self._buffer[start:start + self.CHUNK_SIZE].tobytes()
+        else:
+            self._file.seek(self._start)
+            remaining = self._size
+            while remaining > 0:
+                chunk = self._file.read(min(self.CHUNK_SIZE, remaining))
+                if not chunk:
+                    raise ValueError("File is shorter than when the upload started")
+                remaining -= len(chunk)
+                yield chunk
+        yield self._tail
+
+    async def aiter_chunks(self):
+        """ (MultipartFile) -> async generator
+        Same chunks as iterating, for httpx.AsyncClient.
+        """
+        # Reading a local file doesn't wait on the network.
+        for chunk in self:
+            yield chunk
+
+    def close(self):
+        """ (MultipartFile) -> NoneType
+        Close the file, if it was opened from a path.
+        """
+        if self._owned:
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+def photo_source(photo):
+    """ (object) -> object
+    A path as is, or the bytes of a file object or buffer,
+    to send the photo to a worker process.
+    """
+    if isinstance(photo, (str, os.PathLike)):
+        return photo
+    if hasattr(photo, "read"):
+        return photo.read()
+    return bytes(photo)
+
+def shrink_photo(source, size, quality=85):
+    """ (object, tuple, int) -> bytes
+
+    Resize a photo to fit in `size` (width, height), and recompress it as JPEG.
+    `source` is a path or bytes. None if the photo is a JPEG that fits already,
+    or if the result isn't smaller.
+    Meant to run in a worker process.
+    """
+    if Image is None:
+        raise ImportError("Resizing photos requires Pillow. (pip install Pillow)")
+    original = os.path.getsize(source) if isinstance(source, (str, os.PathLike)) else len(source)
+    with Image.open(source if isinstance(source, (str, os.PathLike)) else io.BytesIO(source)) as image:
+        if image.format == "JPEG" and image.width <= size[0] and image.height <= size[1]:
+            return None
+        # Let the JPEG decoder scale down while decoding, which is much faster
+        # than decoding a camera photo in full.
+        image.draft("RGB", size)
+        image = ImageOps.exif_transpose(image)
+        if image.mode != "RGB":
+            image = image.convert("RGB")
+        image.thumbnail(size, Image.LANCZOS)
+        output = io.BytesIO()
+        image.save(output, "JPEG", quality=quality, optimize=True, progressive=True)
+    ret = output.getvalue()
+    return ret if len(ret) < original else None
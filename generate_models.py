@@ -0,0 +1,197 @@
+"""
+generate_models.py
+
+Generate clubhouse/models.py from the response examples in openapi.yaml.
+Requires PyYAML. (pip install pyyaml)
+
+$ python3 generate_models.py
+"""
+
+import textwrap
+from collections import defaultdict
+import yaml
+
+# Model classes, and the response keys holding them
+MODELS = {
+    "User": ("users", "user_profile", "invited_by_user_profile", "hosts", "mutual_follows"),
+    "Channel": ("channels", "channel"),
+    "Club": ("club", "clubs"),
+    "Topic": ("topic", "topics"),
+    "Event": ("events", "event"),
+    "Notification": ("notifications",),
+}
+
+# Fields identifying an object, shown by repr()
+IDENTIFIERS = ("user_id", "username", "channel_id", "channel", "club_id", "event_id",
+               "notification_id", "id", "name", "title")
+
+HEADER = '''#!/usr/bin/python -u
+#-*- coding: utf-8 -*-
+# pylint: disable=line-too-long,too-many-instance-attributes,attribute-defined-outside-init
+# Generated by generate_models.py from openapi.yaml. Do not edit.
+
+"""
+models.py
+
+Compact response models, used by `Clubhouse(typed=True)`.
+
+Each model keeps its fields in `__slots__` instead of a dict.
+Fields missing from a response are None, and fields unknown to openapi.yaml
+are kept in `extra` and can be read as attributes too.
+"""
+
+def _convert(model, value):
+    """ (type, object) -> object
+    Turn a dict, or the dicts of a list, into the given model.
+    """
+    if isinstance(value, dict):
+        return model.from_dict(value)
+    if isinstance(value, list):
+        return [model.from_dict(item) if isinstance(item, dict) else item for item in value]
+    return value
+
+class Model:
+    """
+    Base class of the response models.
+    """
+
+    __slots__ = ("extra",)
+    FIELDS = frozenset()
+    REPR = ()
+
+    def __getattr__(self, name):
+        extra = object.__getattribute__(self, "extra")
+        if extra and name in extra:
+            return extra[name]
+        raise AttributeError(f"{type(self).__name__} has no field {name}")
+
+    def _extra(self, data):
+        """ (Model, dict) -> NoneType
+        Keep the fields that are not in FIELDS.
+        """
+        self.extra = None if self.FIELDS.issuperset(data) else {
+            key: value for key, value in data.items() if key not in self.FIELDS
+        }
+
+    def to_dict(self):
+        """ (Model) -> dict
+        Back to the dict of the response.
+        """
+        ret = {}
+        for name in self.__slots__:
+            value = getattr(self, name)
+            if isinstance(value, Model):
+                value = value.to_dict()
+            elif isinstance(value, list):
+                value = [item.to_dict() if isinstance(item, Model) else item for item in value]
+            ret[name] = value
+        ret.update(self.extra or {})
+        return ret
+
+    def __eq__(self, other):
+        return type(self) is type(other) and self.to_dict() == other.to_dict()
+
+    def __repr__(self):
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.REPR)
+        return f"{type(self).__name__}({fields})"
+'''
+
+FOOTER = '''
+# Response keys holding models
+KEYS = {KEYS}
+
+def convert_field(key, value):
+    """ (str, object) -> object
+    Turn the value of a response key into models, if the key holds models.
+    """
+    model = KEYS.get(key)
+    return _convert(model, value) if model is not None else value
+
+def convert(response):
+    """ (dict) -> dict
+
+    Turn the models of a decoded response into model objects.
+    The response itself stays a dict, for `success`, `next` and other metadata.
+    """
+    if not isinstance(response, dict):
+        return response
+    for key, value in response.items():
+        model = KEYS.get(key)
+        if model is not None:
+            response[key] = _convert(model, value)
+    return response
+'''
+
+def collect(spec):
+    """ (dict) -> dict
+    Fields of every model, from the response examples of the spec.
+    """
+    keys = {key: model for model, model_keys in MODELS.items() for key in model_keys}
+    fields = defaultdict(set)
+
+    def walk(value, key=None):
+        if isinstance(value, dict):
+            if key in keys:
+                fields[keys[key]].update(value)
+            for name, item in value.items():
+                walk(item, name)
+        elif isinstance(value, list):
+            for item in value:
+                walk(item, key)
+
+    for operations in spec["paths"].values():
+        for operation in operations.values():
+            for response in operation.get("responses", {}).values():
+                for content in response.get("content", {}).values():
+                    walk(content.get("example"))
+                    for example in content.get("examples", {}).values():
+                        walk(example.get("value"))
+    return fields
+
+def render(fields):
+    """ (dict) -> str
+    Source of clubhouse/models.py.
+    """
+    keys = {key: model for model, model_keys in MODELS.items() for key in model_keys}
+    out = [HEADER]
+    for model, model_keys in MODELS.items():
+        names = sorted(fields[model])
+        sources = ", ".join(f"`{key}`" for key in model_keys)
+        out.append(f"\nclass {model}(Model):")
+        out.append('    """')
+        out.append(f"    {model} from {sources} of a response.")
+        out.append('    """\n')
+        out.append("    __slots__ = (")
+        out.extend(textwrap.wrap(" ".join(f"{name!r}," for name in names), 88,
+                                 initial_indent=" " * 8, subsequent_indent=" " * 8))
+        out.append("    )")
+        out.append("    FIELDS = frozenset(__slots__)")
+        out.append(f"    REPR = {tuple(name for name in IDENTIFIERS if name in names)!r}\n")
+        out.append("    @classmethod")
+        out.append("    def from_dict(cls, data):")
+        out.append(f'        """ (type, dict) -> {model} """')
+        out.append("        self = object.__new__(cls)")
+        out.append("        get = data.get")
+        for name in names:
+            if name in keys:
+                out.append(f"        self.{name} = _convert({keys[name]}, get({name!r}))")
+            else:
+                out.append(f"        self.{name} = get({name!r})")
+        out.append("        self._extra(data)")
+        out.append("        return self")
+    mapping = "{\n" + "".join(f"    {key!r}: {model},\n" for key, model in keys.items()) + "}"
+    out.append(FOOTER.replace("{KEYS}", mapping))
+    return "\n".join(out)
+
+def main():
+    """
+    Write clubhouse/models.py.
+    """
+    with open("openapi.yaml") as spec_file:
+        spec = yaml.safe_load(spec_file)
+    with open("clubhouse/models.py", "w") as models_file:
+        models_file.write(render(collect(spec)))
+    print("[*] clubhouse/models.py written")
+
+if __name__ == "__main__":
+    main()
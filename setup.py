@@ -34,6 +34,13 @@ setup(
         "clubhouse-lib",
     ],
     install_requires=_requires_from_file("requirements.txt"),
+    extras_require={
+        "async": ["httpx"],
+        "fast": ["orjson"],
+        "http2": ["httpx[http2]"],
+        "photo": ["Pillow"],
+        "otel": ["opentelemetry-api"],
+    },
     classifiers=[
         "Development Status :: 5 - Production/Stable",
         "Intended Audience :: Developers",
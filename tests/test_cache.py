@@ -0,0 +1,53 @@
+#!/usr/bin/python -u
+#-*- coding: utf-8 -*-
+
+"""
+test_cache.py
+
+Only successful responses are cached.
+"""
+
+import pytest
+import requests
+from clubhouse.clubhouse import Clubhouse
+
+def _response(content, status=200):
+    """ (bytes, int) -> requests.Response """
+    response = requests.Response()
+    response.status_code = status
+    response._content = content
+    return response
+
+@pytest.mark.parametrize("content", [
+    b'{"success": false, "error_message": "Try again later"}',
+    b'{"club": {}}',
+])
+def test_failed_calls_are_not_cached(content):
+    sent = []
+    answers = [_response(content), _response(b'{"club": {"club_id": 1}, "success": true}')]
+    def request(method, url, body=None, **kwargs):
+        sent.append(url)
+        return answers[min(len(sent), len(answers)) - 1]
+    client = Clubhouse("1", "token", "device", cache=True)
+    client._request = request
+    try:
+        assert client.get_club(1).get("success") is not True
+        assert client.get_club(1)["success"] is True
+        assert client.get_club(1)["success"] is True
+    finally:
+        client.close()
+    assert len(sent) == 2
+
+def test_lazy_responses_are_cached():
+    sent = []
+    def request(method, url, body=None, **kwargs):
+        sent.append(url)
+        return _response(b'{"club": {"club_id": 1}, "success": true}')
+    client = Clubhouse("1", "token", "device", cache=True, lazy=True)
+    client._request = request
+    try:
+        assert client.get_club(1)["club"]["club_id"] == 1
+        assert client.get_club(1)["club"]["club_id"] == 1
+    finally:
+        client.close()
+    assert len(sent) == 1
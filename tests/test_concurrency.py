@@ -0,0 +1,176 @@
+#!/usr/bin/python -u
+#-*- coding: utf-8 -*-
+
+"""
+test_concurrency.py
+
+One client shared by many threads, or tasks, against a local stand-in
+server checking the headers of every request.
+"""
+
+import time
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+import pytest
+import clubhouse.clubhouse
+from clubhouse.clubhouse import Clubhouse
+
+CALLS = 1000
+CONCURRENCY = 64
+
+# Added by requests or httpx themselves
+TRANSPORT_HEADERS = {"host", "content-length", "accept", "accept-encoding", "connection"}
+
+class CheckingHandler(BaseHTTPRequestHandler):
+    """
+    Answers every request with `{"success": true}`, and records those whose
+    headers differ from the client's `HEADERS` in `server.expected`: a header
+    missing, changed, repeated or unknown, or a Content-Type not matching
+    the body.
+    """
+
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def log_message(self, *args): # pylint: disable=arguments-differ
+        pass
+
+    def do_POST(self): # pylint: disable=invalid-name
+        self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        names = [name.lower() for name in self.headers.keys()]
+        headers = {name.lower(): value for name, value in self.headers.items()}
+        expected = self.server.expected
+        errors = []
+        if len(names) != len(set(names)):
+            errors.append("repeated headers")
+        for name, value in expected.items():
+            if name != "content-type" and headers.get(name) != value:
+                errors.append(f"{name}: {headers.get(name)!r}")
+        stray = set(names) - set(expected) - TRANSPORT_HEADERS
+        if stray:
+            errors.append(f"unknown headers: {sorted(stray)}")
+        content_type = headers.get("content-type", "")
+        if self.path.split("?")[0].endswith("/update_photo"):
+            if not content_type.startswith("multipart/form-data; boundary="):
+                errors.append(f"content-type: {content_type!r}")
+        elif content_type != expected["content-type"]:
+            errors.append(f"content-type: {content_type!r}")
+        with self.server.lock:
+            self.server.requests += 1
+            if errors:
+                self.server.bad.append((self.command, self.path, errors))
+        body = b'{"success": true}'
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    do_GET = do_POST
+
+class StandIn(ThreadingHTTPServer):
+    """ ThreadingHTTPServer for CheckingHandler. """
+
+    daemon_threads = True
+    request_queue_size = 1024
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), CheckingHandler)
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.bad = []
+        self.expected = {}
+
+@pytest.fixture(name="server")
+def fixture_server():
+    server = StandIn()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+@pytest.fixture(name="photo")
+def fixture_photo(tmp_path):
+    path = tmp_path / "photo.jpg"
+    path.write_bytes(b"\xff\xd8" + b"\0" * 5000 + b"\xff\xd9")
+    return str(path)
+
+def _client(cls, server):
+    """ (type, StandIn) -> Clubhouse
+    Client of the stand-in, sending every call as a request of its own.
+    """
+    client = cls("1", "token", "device", pool_maxsize=CONCURRENCY, retry=False, coalesce=False)
+    url = "http://127.0.0.1:%d/api" % server.server_address[1]
+    client._urls = {name: url + path[len(client.API_URL):] for name, path in client._urls.items()}
+    server.expected = {key.lower(): value for key, value in client.HEADERS.items()}
+    return client
+
+def _call(client, photo, i):
+    """ (Clubhouse, str, int) -> dict
+    One call of a mix of reads, writes and uploads.
+    """
+    kind = i % 10
+    if kind < 2:
+        return client.update_photo(photo)
+    if kind < 5:
+        return client.get_club(club_id=i)
+    if kind < 7:
+        return client.get_events(page_size=i % 50 + 1)
+    if kind < 9:
+        return client.follow(user_id=i)
+    return client.get_profile(user_id=i)
+
+def test_threads(server, photo):
+    client = _client(Clubhouse, server)
+    try:
+        with ThreadPoolExecutor(CONCURRENCY) as executor:
+            results = list(executor.map(lambda i: _call(client, photo, i), range(CALLS)))
+    finally:
+        client.close()
+    assert all(result["success"] for result in results)
+    assert server.bad == []
+    assert server.requests == CALLS
+
+def test_tasks(server, photo):
+    pytest.importorskip("httpx")
+    from clubhouse.aio import AsyncClubhouse
+
+    async def fan_out():
+        client = _client(AsyncClubhouse, server)
+        semaphore = asyncio.Semaphore(CONCURRENCY)
+        async def call(i):
+            async with semaphore:
+                return await _call(client, photo, i)
+        try:
+            return await asyncio.gather(*(call(i) for i in range(CALLS // 2)))
+        finally:
+            await client.close()
+    assert all(result["success"] for result in asyncio.run(fan_out()))
+    assert server.bad == []
+    assert server.requests == CALLS // 2
+
+def test_one_executor(monkeypatch):
+    created = []
+    class SlowExecutor(clubhouse.clubhouse.ThreadPoolExecutor):
+        """ Widens the window between checking for the pool and setting it. """
+        def __init__(self, *args, **kwargs):
+            time.sleep(0.01)
+            super().__init__(*args, **kwargs)
+            created.append(self)
+    monkeypatch.setattr(clubhouse.clubhouse, "ThreadPoolExecutor", SlowExecutor)
+    client = Clubhouse()
+    barrier = threading.Barrier(8)
+    def submit():
+        barrier.wait()
+        return client._submit(lambda: None).result()
+    try:
+        threads = [threading.Thread(target=submit) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        client.close()
+    assert len(created) == 1
@@ -0,0 +1,39 @@
+#!/usr/bin/python -u
+#-*- coding: utf-8 -*-
+
+"""
+test_exposition.py
+
+Metrics of clients in the OpenMetrics format.
+"""
+
+import requests
+from requests.adapters import BaseAdapter
+from clubhouse.clubhouse import Clubhouse
+from clubhouse.exposition import OpenMetricsExporter, ThreadHealth
+
+class CannedAdapter(BaseAdapter):
+    """ Answers every request with the same body, without a pool. """
+
+    def send(self, request, **kwargs):
+        response = requests.Response()
+        response.status_code = 200
+        response._content = b'{"success": true}'
+        response.request = request
+        response.url = request.url
+        return response
+
+    def close(self):
+        pass
+
+def test_custom_adapter():
+    client = Clubhouse("1", "token", "device")
+    client.session.mount("https://", CannedAdapter())
+    try:
+        assert client.get_club(1) == {"success": True}
+        assert client.pool_stats() == {}
+        text = OpenMetricsExporter(client, threads=ThreadHealth()).render()
+    finally:
+        client.close()
+    assert 'clubhouse_calls_total{client="0",endpoint="get_club"} 1' in text
+    assert text.endswith("# EOF\n")
@@ -0,0 +1,105 @@
+#!/usr/bin/python -u
+#-*- coding: utf-8 -*-
+
+"""
+test_lazy.py
+
+Lazy views over response bytes, and the scanner they share with
+`clubhouse.stream`.
+"""
+
+import json
+import pytest
+from clubhouse.lazy import LazyObject, LazyList, _close, _object, _skip
+
+DOCUMENT = {
+    "success": True,
+    "topic": "a} b, c] d \"{[",
+    "escaped": "\\\\\"}",
+    "count": -1.5e3,
+    "club": None,
+    "tags": ["x}", "y]", [1, "z, }"], {}, []],
+    "channel": {"title": "}, {", "users": [{"user_id": 0, "bio": "]["}], "empty": {}},
+    "users": [{"user_id": i, "name": f"user{i}}}", "photo": None} for i in range(20)],
+    "after": "é",
+}
+
+BODIES = [
+    json.dumps(DOCUMENT).encode(),
+    json.dumps(DOCUMENT, indent=2).encode(),
+    json.dumps(DOCUMENT, ensure_ascii=False).encode(),
+]
+
+@pytest.mark.parametrize("body", BODIES)
+def test_close_matches_every_value(body):
+    view = LazyObject(body)
+    for key, value in DOCUMENT.items():
+        if not isinstance(value, (dict, list)):
+            continue
+        view._scan(key)
+        start = view._spans[key][0]
+        end = _close(body, start)
+        assert json.loads(body[start:end]) == value
+        assert _skip(body, start) == end
+        if isinstance(value, dict):
+            assert _object(body, start) == (value, end)
+
+@pytest.mark.parametrize("body", BODIES)
+def test_close_of_cut_value(body):
+    start = body.index(b"{", body.index(b'"channel"'))
+    end = _close(body, start)
+    for cut in range(start + 1, end):
+        try:
+            found = _close(body[:cut], start)
+        except ValueError:
+            continue
+        # Only a string cut after a bracket may end early; decoding tells.
+        with pytest.raises(ValueError):
+            json.loads(body[start:found])
+
+@pytest.mark.parametrize("body", BODIES)
+def test_object(body):
+    view = LazyObject(body)
+    assert dict(view) == DOCUMENT
+    assert view.to_dict() == DOCUMENT
+    assert list(view) == list(DOCUMENT)
+    assert len(view) == len(DOCUMENT)
+    for key, value in DOCUMENT.items():
+        assert view[key] == value
+        assert json.loads(view.raw(key)) == value
+
+@pytest.mark.parametrize("body", BODIES)
+def test_skipped_values_stay_undecoded(body):
+    view = LazyObject(body)
+    assert view["after"] == "é"
+    # Only the key read is decoded; the values before it are spans.
+    assert list(view._values) == ["after"]
+    assert view["channel"] == DOCUMENT["channel"]
+
+@pytest.mark.parametrize("body", BODIES)
+def test_list(body):
+    users = LazyObject(body)["users"]
+    assert isinstance(users, LazyList)
+    assert list(users) == DOCUMENT["users"]
+    assert users[:3] == DOCUMENT["users"][:3]
+    assert users[5] == DOCUMENT["users"][5]
+    assert users[-1] == DOCUMENT["users"][-1]
+    assert len(users) == 20
+    assert users.to_list() == DOCUMENT["users"]
+    tags = LazyObject(body)["tags"]
+    assert list(tags) == DOCUMENT["tags"]
+    assert not LazyObject(body)["tags"][4]
+
+def test_convert():
+    view = LazyObject(BODIES[0], lambda key, value: (key, value))
+    assert view["count"] == ("count", -1.5e3)
+    assert next(iter(view["users"])) == ("users", DOCUMENT["users"][0])
+
+@pytest.mark.parametrize("body", [b"", b"[1]", b"<html>", b"  "])
+def test_not_an_object(body):
+    with pytest.raises(ValueError):
+        LazyObject(body)
+
+def test_deep_nesting():
+    body = b'{"a": ' + b'[{"b": ' * 200 + b'"}]"' + b'}]' * 200 + b', "c": 1}'
+    assert LazyObject(body)["c"] == 1
@@ -0,0 +1,94 @@
+#!/usr/bin/python -u
+#-*- coding: utf-8 -*-
+
+"""
+test_stream.py
+
+ArrayParser must give the same elements wherever the body is split,
+and failed streamed calls must raise.
+"""
+
+import json
+import asyncio
+import pytest
+import requests
+from clubhouse.clubhouse import Clubhouse
+from clubhouse.exceptions import NotFoundError, ResponseError
+from clubhouse.stream import ArrayParser
+
+BODY = json.dumps({
+    "success": True,
+    "topic": "a} b, c] d",
+    "count": 12345,
+    "private": False,
+    "club": None,
+    "tags": ["x}", "y]", [1, "z, }"]],
+    "channel": {"title": "}, {", "users": [{"user_id": 0}]},
+    "users": [
+        {"user_id": 1, "name": "a}b", "bio": "\"}, ]"},
+        {"user_id": 2, "name": "été"},
+        3,
+        "four]",
+    ],
+    "after": "ignored",
+}).encode()
+
+USERS = json.loads(BODY)["users"]
+
+def _parse(*chunks):
+    """ (bytes...) -> list """
+    parser = ArrayParser("users")
+    items = []
+    for chunk in chunks:
+        items += parser.feed(chunk)
+    parser.close()
+    return items
+
+@pytest.mark.parametrize("cut", range(len(BODY) + 1))
+def test_split_once(cut):
+    assert _parse(BODY[:cut], BODY[cut:]) == USERS
+
+def test_byte_by_byte():
+    assert _parse(*(BODY[i:i + 1] for i in range(len(BODY)))) == USERS
+
+def test_missing_array():
+    assert _parse(b'{"success": true, "topic": "users"}') == []
+
+def test_truncated():
+    parser = ArrayParser("users")
+    parser.feed(BODY[:BODY.index(b'"user_id": 2')])
+    with pytest.raises(ValueError):
+        parser.close()
+
+@pytest.mark.parametrize("status, body, error, message", [
+    (400, b'{"success": false, "error_message": "Channel closed"}', ResponseError, "Channel closed"),
+    (404, b'{"detail": "Not found."}', NotFoundError, "Not found."),
+    (302, b'', ResponseError, "HTTP 302"),
+])
+def test_failed_stream_raises(status, body, error, message):
+    response = requests.Response()
+    response.status_code = status
+    response._content = body
+    client = Clubhouse("1", "token", "device", retry=False)
+    client._request = lambda method, url, body=None, **kwargs: response
+    try:
+        with pytest.raises(error, match=message):
+            list(client.iter_channel_users("channel"))
+    finally:
+        client.close()
+
+def test_failed_async_stream_raises():
+    httpx = pytest.importorskip("httpx")
+    from clubhouse.aio import AsyncClubhouse
+
+    async def stream():
+        client = AsyncClubhouse("1", "token", "device", retry=False)
+        async def request(method, url, body=None, **kwargs):
+            return httpx.Response(400, content=b'{"success": false, "error_message": "Channel closed"}')
+        client._request = request
+        try:
+            return [user async for user in client.iter_channel_users("channel")]
+        finally:
+            await client.close()
+    with pytest.raises(ResponseError, match="Channel closed"):
+        asyncio.run(stream())
@@ -0,0 +1,41 @@
+#!/usr/bin/python -u
+#-*- coding: utf-8 -*-
+
+"""
+test_timeout.py
+
+Request timeouts within the deadline of a call.
+"""
+
+import pytest
+from clubhouse.clubhouse import Clubhouse
+from clubhouse.deadline import Deadline
+from clubhouse.endpoints import ENDPOINTS
+
+ENDPOINT = ENDPOINTS["get_club"]
+
+@pytest.mark.parametrize("timeout", [None, (5, None), (None, 30), (None, None)])
+def test_unbounded_timeout_with_deadline(timeout):
+    client = Clubhouse(timeout=timeout)
+    try:
+        connect, read = client._timeout(ENDPOINT, Deadline(2))
+    finally:
+        client.close()
+    assert 0 < connect <= 2 and 0 < read <= 2
+    if timeout is not None and timeout[0] is not None:
+        assert connect <= timeout[0]
+
+def test_unbounded_timeout_without_deadline():
+    client = Clubhouse(timeout=(5, None))
+    try:
+        assert client._timeout(ENDPOINT, None) == (5, None)
+    finally:
+        client.close()
+
+def test_deadline_bounds_timeout():
+    client = Clubhouse(timeout=(5, 30))
+    try:
+        connect, read = client._timeout(ENDPOINT, Deadline(1))
+    finally:
+        client.close()
+    assert connect <= 1 and read <= 1
@@ -0,0 +1,63 @@
+#!/usr/bin/python -u
+#-*- coding: utf-8 -*-
+
+"""
+test_tracing.py
+
+Spans of client calls, and the redaction of their parameters.
+"""
+
+import json
+from urllib.parse import urlsplit, parse_qs
+import requests
+from clubhouse.clubhouse import Clubhouse
+from clubhouse.endpoints import ENDPOINTS
+from clubhouse.tracing import Tracer, call_attributes
+
+class ListExporter:
+    """ Keeps the finished spans. """
+
+    def __init__(self):
+        self.spans = []
+
+    def export(self, span):
+        self.spans.append(span)
+
+def _response(body):
+    """ (dict) -> requests.Response """
+    response = requests.Response()
+    response.status_code = 200
+    response._content = json.dumps(body).encode()
+    return response
+
+def _pages(method, url, body=None, **kwargs):
+    """ Three pages of get_events. """
+    page = int(parse_qs(urlsplit(url).query)["page"][0])
+    return _response({"success": True, "events": [page], "next": page + 1 if page < 3 else None})
+
+def test_prefetched_pages_nest_under_the_caller_span():
+    exporter = ListExporter()
+    tracer = Tracer(exporter)
+    client = Clubhouse("1", "token", "device", tracer=tracer)
+    client._request = _pages
+    try:
+        with tracer.span("read events") as parent:
+            assert list(client.iter_events()) == [1, 2, 3]
+    finally:
+        client.close()
+    calls = [span for span in exporter.spans if span.name == "get_events"]
+    assert len(calls) == 3
+    assert [span.parent_id for span in calls] == [parent.span_id] * 3
+    assert all(span.trace_id == parent.trace_id for span in calls)
+
+def test_redacts_nested_parameters():
+    attributes = call_attributes(ENDPOINTS["get_suggested_invites"], {
+        "upload_contacts": True,
+        "contacts": [{"phone_number": "+15555550100"}],
+        "club": {"name": "club", "owner": {"email": "a@example.com"}},
+    }, "?auth_token=secret&page=2")
+    assert attributes["clubhouse.param.contacts"] == "[REDACTED]"
+    assert "a@example.com" not in attributes["clubhouse.param.club"]
+    assert "'name': 'club'" in attributes["clubhouse.param.club"]
+    assert attributes["clubhouse.param.auth_token"] == "[REDACTED]"
+    assert attributes["clubhouse.param.page"] == "2"
@@ -0,0 +1,58 @@
+#!/usr/bin/python -u
+#-*- coding: utf-8 -*-
+
+"""
+test_warmup.py
+
+warmup opens pooled connections, with urllib3 2 and with urllib3 1.26,
+whose connections have no `is_closed`.
+"""
+
+import socket
+import pytest
+from clubhouse.clubhouse import Clubhouse
+
+@pytest.fixture(name="listener")
+def fixture_listener():
+    listener = socket.socket()
+    listener.bind(("127.0.0.1", 0))
+    listener.listen(16)
+    yield listener
+    listener.close()
+
+def _accept(listener, accepted):
+    """ (socket.socket, list) -> int
+    Accept the connections waiting, keeping them open, and count them.
+    """
+    listener.settimeout(0.5)
+    count = 0
+    try:
+        while True:
+            accepted.append(listener.accept()[0])
+            count += 1
+    except socket.timeout:
+        return count
+
+@pytest.mark.parametrize("legacy", [False, True])
+def test_warmup(listener, legacy):
+    client = Clubhouse(pool_maxsize=4)
+    client.API_URL = "http://127.0.0.1:%d/api" % listener.getsockname()[1]
+    pool = client._connection_pool(client.API_URL)
+    if legacy:
+        class Connection(pool.ConnectionCls):
+            """ A connection without `is_closed`, as in urllib3 1.26. """
+            @property
+            def is_closed(self):
+                raise AttributeError("is_closed")
+        pool.ConnectionCls = Connection
+    accepted = []
+    try:
+        assert client.warmup(3) == 3
+        assert _accept(listener, accepted) == 3
+        # Warm connections aren't opened again.
+        assert client.warmup(3) == 3
+        assert _accept(listener, accepted) == 0
+    finally:
+        client.close()
+        for conn in accepted:
+            conn.close()